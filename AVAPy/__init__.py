@@ -2,11 +2,46 @@
 # flake8: noqa
 """
 AVA Python Library for Automatic Visual Analyze
+
+Names are imported on first access, so that importing the package does not
+import pandas, numpy or altair until they are needed.
 """
 
-from AVAPy.data_wizard.analyzer.fieldinfo import FieldInfo
-from AVAPy.data_wizard.utils import *
+import importlib
+
+from AVAPy.data_wizard.utils import __all__ as _UTILS
+
+_SUBMODULES = {
+    "AVAPy.data_wizard.analyzer.fieldinfo": ("FieldInfo", ),
+    "AVAPy.data_wizard.analyzer.accumulator": ("FieldInfoAccumulator", ),
+    "AVAPy.data_wizard.analyzer.dfinfo": ("DataFrameInfo", "profile",
+                                          "profile_chunks"),
+    "AVAPy.data_wizard.reader.cache": ("DatasetCache", ),
+    "AVAPy.data_wizard.utils": tuple(_UTILS),
+    "AVAPy.chart_advisor.aux.scatterplot": ("get_scatter_xy",
+                                            "get_scatter_json"),
+    "AVAPy.chart_advisor.aux.line": ("get_line_xy", "get_line_json"),
+    "AVAPy.chart_advisor.aux.bar": ("get_bar_xy", "get_bar_json"),
+    "AVAPy.chart_advisor.aux.batch": ("get_line_batch", "get_bar_batch",
+                                      "get_scatter_batch"),
+    "AVAPy.aio": ("AsyncRunner", ),
+}
+
+_LAZY_NAMES = {
+    name: module
+    for module, names in _SUBMODULES.items() for name in names
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
 
-from AVAPy.chart_advisor.aux.scatterplot import get_scatter_xy, get_scatter_json
-from AVAPy.chart_advisor.aux.line import get_line_xy, get_line_json
-from AVAPy.chart_advisor.aux.bar import get_bar_xy, get_bar_json
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
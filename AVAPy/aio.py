@@ -0,0 +1,193 @@
+"""
+Asyncio entry points for reading, profiling and chart generation.
+
+The functions of the library are blocking and CPU-bound. Their async
+variants run them on an executor, so that the event loop stays responsive,
+with a limit on the number of calls running at once and an optional
+timeout.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+
+from AVAPy.data_wizard.analyzer.dfinfo import EXECUTORS, field_info, profile
+from AVAPy.data_wizard.reader.parser import json2df
+from AVAPy.chart_advisor.aux.bar import get_bar_json
+from AVAPy.chart_advisor.aux.line import get_line_json
+from AVAPy.chart_advisor.aux.scatterplot import get_scatter_json
+
+
+class AsyncRunner:
+    """
+    Run blocking functions from coroutines on an executor.
+
+    Calls past `max_concurrency` wait for a slot before being submitted, so
+    a few large requests can not occupy every worker. A slot is only freed
+    when the call really ends: a call that is cancelled or times out while
+    it runs keeps its slot until the worker finishes, since a running thread
+    or process can not be interrupted. A call cancelled before it starts is
+    never run.
+
+    Parameters
+    ----------
+    executor : {"thread", "process"} or concurrent.futures.Executor
+        Executor to create, or an executor to use, which is then not shut
+        down by the runner. Arguments and results must be picklable with
+        processes.
+    max_workers : int, optional
+        Number of workers of a created executor.
+    max_concurrency : int, optional
+        Maximum number of calls running at once, defaults to `max_workers`,
+        or no limit.
+    timeout : float, optional
+        Default timeout of a call in seconds, None for no timeout.
+
+    Examples
+    --------
+    >>> async def main():
+    ...     async with AsyncRunner(max_concurrency=2) as runner:
+    ...         return await runner.run(sum, [1, 2, 3])
+    >>> asyncio.run(main())
+    6
+    """
+
+    def __init__(self,
+                 executor="thread",
+                 max_workers=None,
+                 max_concurrency=None,
+                 timeout=None):
+        if not isinstance(executor, Executor) and executor not in EXECUTORS:
+            raise ValueError(f"Argument executor must be one of {EXECUTORS} "
+                             "or a concurrent.futures.Executor.")
+        if max_concurrency is None:
+            max_concurrency = max_workers
+        if max_concurrency is not None and (not isinstance(
+                max_concurrency, int) or max_concurrency <= 0):
+            raise ValueError(
+                "Argument max_concurrency must be a positive integer.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Argument timeout must be positive.")
+
+        if isinstance(executor, Executor):
+            self.executor = executor
+            self.__owned = False
+        else:
+            pool_class = ThreadPoolExecutor if executor == "thread" \
+                else ProcessPoolExecutor
+            self.executor = pool_class(max_workers=max_workers)
+            self.__owned = True
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.__semaphores = {}
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Run `func(*args, **kwargs)` on the executor and return its result.
+
+        Parameters
+        ----------
+        func : callable
+            Blocking function, picklable with processes.
+        timeout : float, optional
+            Timeout in seconds, instead of the default one of the runner.
+            The time waiting for a slot counts.
+
+        Raises
+        ------
+        TimeoutError
+            If the call did not complete in time.
+        """
+
+        timeout = timeout or self.timeout
+        if timeout is None:
+            return await self.__run(func, args, kwargs)
+        return await asyncio.wait_for(self.__run(func, args, kwargs), timeout)
+
+    async def __run(self, func, args, kwargs):
+        loop = asyncio.get_running_loop()
+        semaphore = self.__semaphore(loop)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            future = self.executor.submit(functools.partial(func, *args,
+                                                            **kwargs))
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        if semaphore is not None:
+            future.add_done_callback(
+                lambda _: self.__release(loop, semaphore))
+        return await asyncio.wrap_future(future)
+
+    def __semaphore(self, loop):
+        if self.max_concurrency is None:
+            return None
+        if loop not in self.__semaphores:
+            self.__semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self.__semaphores[loop]
+
+    @staticmethod
+    def __release(loop, semaphore):
+        # Done callbacks run in the worker thread.
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(semaphore.release)
+
+    def close(self, wait=True):
+        """
+        Shut down the executor, if it was created by the runner.
+        """
+
+        if self.__owned:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close(wait=False)
+
+    async def json2df(self, json, timeout=None):
+        """
+        Async `json2df`.
+        """
+
+        return await self.run(json2df, json, timeout=timeout)
+
+    async def field_info(self, field, timeout=None):
+        """
+        Return the info of a field, as given by ``FieldInfo``.
+        """
+
+        return await self.run(field_info, field, timeout=timeout)
+
+    async def profile(self, df, timeout=None):
+        """
+        Async `profile`, with the columns analyzed on one worker thread.
+        """
+
+        return await self.run(profile, df, max_workers=1, timeout=timeout)
+
+    async def get_bar_json(self, json_data, timeout=None):
+        """
+        Async `get_bar_json`.
+        """
+
+        return await self.run(get_bar_json, json_data, timeout=timeout)
+
+    async def get_line_json(self, json_data, timeout=None):
+        """
+        Async `get_line_json`.
+        """
+
+        return await self.run(get_line_json, json_data, timeout=timeout)
+
+    async def get_scatter_json(self, json_data, timeout=None):
+        """
+        Async `get_scatter_json`.
+        """
+
+        return await self.run(get_scatter_json, json_data, timeout=timeout)
@@ -3,47 +3,108 @@ Util functions for adding auxiliaries to chart.
 """
 
 import numpy as np
+import pandas as pd
 
+from AVAPy.data_wizard.analyzer import arrow
+from . import spec
+from .trend import polynomial_trends, trend_values
 
-def add_trend_line(data, deg=5):
+
+def as_frame(data):
     """
-    Add new created columns `trend_line` and `trend_line_col` to data.
+    Return the data of a chart as a DataFrame owned by the chart builder,
+    to which auxiliary columns can be added without changing `data`.
 
-      * The `trend_line` describe a polynomial trend on `x`.
-      * The `trend_line_col` is the column name "trend_line".
+    A DataFrame is copied without copying its values. Only the first two
+    columns of a ``pyarrow.Table``, which are charted, are converted.
+    """
+
+    if arrow.is_arrow_table(data):
+        return arrow.table_to_frame(data, data.column_names[:2])
+    return data.copy(deep=False)
+
+
+def trend_inputs(data, positions=False):
+    """
+    Return the float `x` and `y` that a trend of the first two columns of
+    data is fitted on.
+
+    Dates are fitted on their timestamps. If `positions`, an `x` which is
+    not int or float is replaced by the row positions.
     """
 
     colnames = list(data.columns)
     x = data[colnames[0]]
-    y = data[colnames[1]]
+    if positions and x.dtype not in (int, float):
+        x = np.arange(len(data), dtype=float)
+    elif pd.api.types.is_datetime64_any_dtype(x):
+        x = x.astype("int64").to_numpy(dtype=float)
+    else:
+        x = x.to_numpy(dtype=float, na_value=np.nan)
+    return x, data[colnames[1]].to_numpy(dtype=float, na_value=np.nan)
+
+
+def add_trend_line(data, deg=5, trend=None, method="poly", **options):
+    """
+    Add new created columns `trend_line` and `trend_line_col` to data.
+
+      * The `trend_line` describe a trend on `x`, polynomial by default.
+      * The `trend_line_col` is the column name "trend_line".
+
+    `trend` are the values of the trend, fitted if not given by `method`
+    with `options`, see `trend.trend_values`.
+    """
 
-    parameter = np.polyfit(x, y, deg)
-    f = np.poly1d(parameter)
+    if trend is None:
+        x, y = trend_inputs(data)
+        trend = trend_values(x, y, method, deg=deg, **options)
 
-    data["trend_line"] = f(x)
+    data["trend_line"] = trend
     data["trend_line_col"] = "trend_line"
 
 
-def add_trend_line_nonnum(data, deg=5):
+def add_trend_line_nonnum(data, deg=5, trend=None, method="poly", **options):
     """
     Add new created columns `trend_line` and `trend_line_col` to data,
     while `x` is not numbers.
 
-      * The `trend_line` describe a polynomial trend on `x`.
+      * The `trend_line` describe a trend on the row positions.
       * The `trend_line_col` is the column name "trend_line".
-    """
 
-    colnames = list(data.columns)
-    y = data[colnames[1]]
-    x = list(range(len(y)))
+    `trend` are the values of the trend, fitted if not given.
+    """
 
-    parameter = np.polyfit(x, y, deg)
-    f = np.poly1d(parameter)
+    if trend is None:
+        colnames = list(data.columns)
+        y = data[colnames[1]].to_numpy(dtype=float, na_value=np.nan)
+        x = np.arange(len(y), dtype=float)
+        trend = trend_values(x, y, method, deg=deg, **options)
 
-    data["trend_line"] = f(x)
+    data["trend_line"] = trend
     data["trend_line_col"] = "trend_line"
 
 
+def batch_trends(x, ys, deg=5):
+    """
+    Return the polynomial trends of several series sharing `x`, given as the
+    rows of `ys`, with a single least-squares fit.
+
+    Values are those of `add_trend_line` up to rounding.
+    """
+
+    return polynomial_trends(x, ys, deg)
+
+
+def batch_marks(ys):
+    """
+    Return mean, Q3, Q1 of several series, given as the rows of `ys`, as
+    arrays with one value per series, like `get_marks`.
+    """
+
+    q75, q25 = np.percentile(ys, [75, 25], axis=1)
+    return np.mean(ys, axis=1), q75, q25
+
+
 def get_marks(data):
     """
     Return mean, Q3, Q1 of data.
@@ -57,30 +118,32 @@ def get_marks(data):
     return mean, q75, q25
 
 
-def add_quant_line(chart, data, mks=1):
+def quant_line_layer(data, x, mks=1, marks=None):
     """
-    Add auxiliary lines for mean, (Q1, Q3) of data to the chart.
+    Add columns for mean, (Q1, Q3) of data and return the Vega-Lite layer of
+    their auxiliary lines along `x`.
+
+    `marks` are the mean, Q3 and Q1 given by `get_marks`, computed from data
+    if not given, e.g. from the full series of downsampled data.
     """
-    mean, q75, q25 = get_marks(data)
+    mean, q75, q25 = get_marks(data) if marks is None else marks
 
     data['mark_line_avg'] = mean
     data['mark_line_25'] = q25
     data['mark_line_75'] = q75
 
-    quant_line = chart.mark_line(color='gray',
-                                 opacity=0.5).encode(y='mark_line_avg')
-
+    fields = ['mark_line_avg']
     if mks == 2:
-        if abs(mean - q25) > abs(mean - q75):
-            quant_line = quant_line + chart.mark_line(
-                color='gray', opacity=0.5).encode(y='mark_line_q25')
-        else:
-            quant_line = quant_line + chart.mark_line(
-                color='gray', opacity=0.5).encode(y='mark_line_q75')
+        fields.append('mark_line_25' if abs(mean - q25) > abs(mean -
+                                                             q75) else
+                      'mark_line_75')
     elif mks == 3:
-        quant_line = quant_line + chart.mark_line(
-            color='gray', opacity=0.5).encode(y='mark_line_q25')
-        quant_line = quant_line + chart.mark_line(
-            color='gray', opacity=0.5).encode(y='mark_line_q75')
-
-    return quant_line
+        fields.extend(['mark_line_25', 'mark_line_75'])
+
+    layers = [
+        spec.layer(data, 'line', {
+            'x': x,
+            'y': field
+        }, color='gray', opacity=0.5) for field in fields
+    ]
+    return layers[0] if len(layers) == 1 else {'layer': layers}
@@ -10,41 +10,73 @@ Data format:
     *x.dtype == Number or String
 """
 
+import io
+
 import pandas as pd
-import altair as alt
 
 from . import auxiliary as auxutil
-
-
-def get_bar(df, mks=1, deg=3):
+from . import spec
+
+
+def get_bar(df,
+            mks=1,
+            deg=3,
+            validate=False,
+            sink=None,
+            trend=None,
+            marks=None,
+            trend_method="poly",
+            trend_options=None,
+            compact=False):
     """
     Generate bar chart with auxiliaries by given DataFrame.
 
-    The return is JSON in vega-lite schema.
+    The return is JSON in vega-lite schema. The input data is not modified,
+    and nothing else is written, so charts can be generated concurrently.
 
     Parameters
     ----------
-    df : DataFrame
+    df : DataFrame or pyarrow.Table
         Given data.
     mks : int
         Expect number of auxiliary lines.
     deg : int
         Degree of the fitting polynomial.
+    validate : bool
+        Whether to validate the specification, which requires altair.
+    sink : callable or file object, optional
+        Also write the specification to this sink, see `spec.emit`.
+    trend : numpy.ndarray, optional
+        Values of the trend line, fitted if not given.
+    marks : tuple, optional
+        Mean, Q3 and Q1 of `y`, computed if not given.
+    trend_method : {"poly", "loess", "moving_average"}
+        Trend fitting method, see `trend.trend_values`.
+    trend_options : dict, optional
+        Options of the trend, e.g. `bins`, `frac` or `window`.
+    compact : bool
+        Whether to write the JSON without indentation, see `spec.to_json`.
     """
 
+    df = auxutil.as_frame(df)
     colnames = list(df.columns)
 
-    chart = alt.Chart(df).mark_bar().encode(x=colnames[0], y=colnames[1])
-
-    auxutil.add_trend_line(df, deg)
-
-    quant_line = auxutil.add_quant_line(chart, df, mks)
+    auxutil.add_trend_line(df, deg, trend, trend_method,
+                           **(trend_options or {}))
 
-    trend_line = chart.mark_line(color="red",
-                                 opacity=0.75).encode(y="trend_line")
+    x = colnames[0]
+    chart = spec.layer(df, "bar", {"x": x, "y": colnames[1]})
+    trend_line = spec.layer(df,
+                            "line", {
+                                "x": x,
+                                "y": "trend_line"
+                            },
+                            color="red",
+                            opacity=0.75)
+    quant_line = auxutil.quant_line_layer(df, x, mks, marks)
 
-    (chart + trend_line + quant_line).save("/tmp/bar.html")
-    return (chart + trend_line + quant_line).to_json()
+    chart_spec = spec.layered_spec(df, [chart, trend_line, quant_line])
+    return spec.emit(spec.to_json(chart_spec, validate, compact), sink)
 
 
 def get_bar_xy(x, y):
@@ -65,5 +97,5 @@ def get_bar_json(json_data):
     The return is JSON in vega-lite schema.
     """
 
-    df = pd.read_json(json_data, orient="records")
+    df = pd.read_json(io.StringIO(json_data), orient="records")
     return get_bar(df)
@@ -0,0 +1,365 @@
+"""
+Batch generation of many charts with auxiliaries.
+
+Series are processed in chunks on a pool of workers. In each chunk, the
+polynomial trend and quantile lines of the numeric series sharing the same
+`x` are computed together, with one least-squares fit and one quantile
+computation for all of them. The specifications of these series are then
+written from the computed arrays, without adding the auxiliary columns to
+a DataFrame one chart at a time. Specifications are written as compact
+JSON and yielded in input order, as soon as the chunk holding them is done.
+"""
+
+import os
+import itertools
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from AVAPy.data_wizard.analyzer.dfinfo import EXECUTORS
+
+from . import auxiliary as auxutil
+from . import spec
+from .bar import get_bar
+from .line import get_line
+from .scatterplot import get_scatter
+
+
+def get_line_batch(series,
+                   mks=1,
+                   deg=3,
+                   max_points=None,
+                   method="lttb",
+                   validate=False,
+                   trend_method="poly",
+                   trend_options=None,
+                   executor="process",
+                   max_workers=None,
+                   chunksize=64):
+    """
+    Generate line charts with auxiliaries for many series.
+
+    Each specification is the one of `get_line` for the same series,
+    written without indentation, except that trend values may differ in the
+    last digits when the trends are fitted together.
+
+    Parameters
+    ----------
+    series : iterable
+        Series given as ``(x, y)`` pairs, DataFrames or pyarrow Tables. It
+        is consumed lazily, a few chunks ahead of the output.
+    mks, deg, max_points, method, validate, trend_method, trend_options
+        Options of `get_line`, the same for every series.
+    executor : {"thread", "process"}, concurrent.futures.Executor or None
+        Pool to create, or an executor to use, which is then not shut down.
+        None runs the chunks in the calling thread.
+    max_workers : int, optional
+        Number of workers of a created pool.
+    chunksize : int
+        Number of series sent to a worker at once.
+
+    Returns
+    -------
+    iterator of str
+        JSON specifications in vega-lite schema, in input order.
+
+    Examples
+    --------
+    >>> metrics = [([1, 2, 3, 4], [3, 1, 4, 1]), ([1, 2, 3, 4], [5, 9, 2, 6])]
+    >>> specs = list(get_line_batch(metrics, deg=1, executor=None))
+    """
+
+    options = {
+        "mks": mks,
+        "deg": deg,
+        "max_points": max_points,
+        "method": method,
+        "validate": validate,
+        "trend_method": trend_method,
+        "trend_options": trend_options,
+        "compact": True
+    }
+    return _charts("line", series, options, executor, max_workers, chunksize)
+
+
+def get_bar_batch(series,
+                  mks=1,
+                  deg=3,
+                  validate=False,
+                  trend_method="poly",
+                  trend_options=None,
+                  executor="process",
+                  max_workers=None,
+                  chunksize=64):
+    """
+    Generate bar charts with auxiliaries for many series.
+
+    Options are those of `get_bar`, and the others are described in
+    `get_line_batch`.
+
+    Returns
+    -------
+    iterator of str
+        JSON specifications in vega-lite schema, in input order.
+    """
+
+    options = {
+        "mks": mks,
+        "deg": deg,
+        "validate": validate,
+        "trend_method": trend_method,
+        "trend_options": trend_options,
+        "compact": True
+    }
+    return _charts("bar", series, options, executor, max_workers, chunksize)
+
+
+def get_scatter_batch(series,
+                      deg=3,
+                      method="zscore",
+                      validate=False,
+                      trend_method="poly",
+                      trend_options=None,
+                      executor="process",
+                      max_workers=None,
+                      chunksize=64):
+    """
+    Generate scatterplots with auxiliaries for many series.
+
+    Options are those of `get_scatter`, with a `method` picklable with
+    processes, and the others are described in `get_line_batch`.
+
+    Returns
+    -------
+    iterator of str
+        JSON specifications in vega-lite schema, in input order.
+    """
+
+    options = {
+        "deg": deg,
+        "method": method,
+        "validate": validate,
+        "trend_method": trend_method,
+        "trend_options": trend_options,
+        "compact": True
+    }
+    return _charts("scatter", series, options, executor, max_workers,
+                   chunksize)
+
+
+def chart_chunk(kind, items, options):
+    """
+    Return the specifications of the charts of `kind` for a list of series.
+
+    Parameters
+    ----------
+    kind : {"line", "bar", "scatter"}
+        Kind of chart.
+    items : list
+        Series, see `get_line_batch`.
+    options : dict
+        Options of the chart function.
+    """
+
+    frames = [_series_frame(item) for item in items]
+    if kind == "scatter":
+        return [get_scatter(frame, **options) for frame in frames]
+
+    build = get_line if kind == "line" else get_bar
+    if options.get("trend_method", "poly") != "poly" or options.get(
+            "trend_options"):
+        return [build(frame, **options) for frame in frames]
+    auxiliaries = shared_auxiliaries(frames,
+                                     options.get("deg", 3),
+                                     positions=kind == "line")
+    max_points = options.get("max_points")
+    specs = []
+    for frame, computed in zip(frames, auxiliaries):
+        if computed is None:
+            specs.append(build(frame, **options))
+        elif max_points is not None and len(frame) > max_points:
+            trend, marks = computed
+            specs.append(build(frame, trend=trend, marks=marks, **options))
+        else:
+            specs.append(shared_spec(kind, frame, *computed, options))
+    return specs
+
+
+def shared_spec(kind, frame, trend, marks, options):
+    """
+    Return the specification of a line or bar chart of `frame` with the
+    given auxiliaries, as `get_line` or `get_bar` would write it.
+
+    The records of the chart are those of `frame`, to which the trend and
+    mark values are added, instead of columns added to a copy of `frame`.
+
+    Parameters
+    ----------
+    kind : {"line", "bar"}
+        Kind of chart.
+    frame : DataFrame
+        Series with `x` and `y` as the first two columns, which is not
+        downsampled.
+    trend : numpy.ndarray
+        Values of the trend line.
+    marks : tuple
+        Mean, Q3 and Q1 of `y`.
+    options : dict
+        Options of the chart function.
+    """
+
+    colnames = list(frame.columns)
+    x = colnames[0]
+    mean, q75, q25 = (np.float64(mark) for mark in marks)
+    columns = {name: frame[name] for name in colnames}
+    columns["trend_line"] = np.asarray(trend, dtype=float)
+
+    chart = spec.layer(columns, kind, {"x": x, "y": colnames[1]})
+    trend_line = spec.layer(columns,
+                            "line", {
+                                "x": x,
+                                "y": "trend_line"
+                            },
+                            color="red",
+                            opacity=0.75)
+    quant_line = auxutil.quant_line_layer(columns, x, options.get("mks", 1),
+                                          (mean, q75, q25))
+
+    avg, low, high = spec.float_values(np.array([mean, q25, q75]))
+    added = {
+        "trend_line_col": "trend_line",
+        "mark_line_avg": avg,
+        "mark_line_25": low,
+        "mark_line_75": high
+    }
+    values = spec.dataset_values(frame)
+    for record, value in zip(values,
+                             spec.float_values(columns["trend_line"])):
+        record["trend_line"] = value
+        record.update(added)
+
+    chart_spec = spec.layered_spec(values, [chart, trend_line, quant_line])
+    return spec.to_json(chart_spec, options.get("validate", False),
+                        options.get("compact", False))
+
+
+def shared_auxiliaries(frames, deg, positions):
+    """
+    Compute together the trend and marks of the series sharing their `x`.
+
+    Parameters
+    ----------
+    frames : list of DataFrame
+        Series with `x` and `y` as the first two columns.
+    deg : int
+        Degree of the fitting polynomial.
+    positions : bool
+        Whether a non-numeric `x` is fitted on the row positions, like line
+        charts do.
+
+    Returns
+    -------
+    list
+        For each frame, its ``(trend, marks)``, or None when they are left
+        to the chart function: non-numeric or missing values, or no other
+        series with the same `x`.
+    """
+
+    groups = {}
+    for idx, frame in enumerate(frames):
+        inputs = _fit_inputs(frame, positions)
+        if inputs is not None:
+            x, y = inputs
+            groups.setdefault((len(x), x.tobytes()), []).append((idx, x, y))
+
+    auxiliaries = [None] * len(frames)
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        ys = np.vstack([y for _, _, y in members])
+        trends = auxutil.batch_trends(members[0][1], ys, deg)
+        means, q75s, q25s = auxutil.batch_marks(ys)
+        for row, (idx, _, _) in enumerate(members):
+            auxiliaries[idx] = (trends[row], (means[row], q75s[row],
+                                              q25s[row]))
+    return auxiliaries
+
+
+def _fit_inputs(frame, positions):
+    """
+    Return the float `x` and `y` a trend of `frame` is fitted on, or None.
+    """
+
+    colnames = list(frame.columns)
+    if len(colnames) < 2 or len(frame) == 0:
+        return None
+    x, y = frame[colnames[0]], frame[colnames[1]]
+    if y.dtype.kind not in "iuf":
+        return None
+    if x.dtype in (int, float):
+        x = x.to_numpy(dtype=float)
+    elif positions:
+        x = np.arange(len(frame), dtype=float)
+    else:
+        return None
+    y = y.to_numpy(dtype=float)
+    if np.isnan(x).any() or np.isnan(y).any():
+        return None
+    return x, y
+
+
+def _series_frame(item):
+    if isinstance(item, (tuple, list)):
+        if len(item) != 2:
+            raise ValueError("Series must be (x, y) pairs, DataFrames or "
+                             "pyarrow Tables.")
+        return pd.DataFrame({"x": item[0], "y": item[1]})
+    return auxutil.as_frame(item)
+
+
+def _charts(kind, series, options, executor, max_workers, chunksize):
+    if executor is not None and not isinstance(
+            executor, Executor) and executor not in EXECUTORS:
+        raise ValueError(f"Argument executor must be one of {EXECUTORS}, "
+                         "a concurrent.futures.Executor or None.")
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError("Argument chunksize must be a positive integer.")
+    if max_workers is not None and (not isinstance(max_workers, int)
+                                    or max_workers <= 0):
+        raise ValueError("Argument max_workers must be a positive integer.")
+    return _stream(kind, iter(series), options, executor, max_workers,
+                   chunksize)
+
+
+def _stream(kind, series, options, executor, max_workers, chunksize):
+    chunks = iter(lambda: list(itertools.islice(series, chunksize)), [])
+    if executor is None:
+        for chunk in chunks:
+            yield from chart_chunk(kind, chunk, options)
+        return
+
+    if isinstance(executor, Executor):
+        pool, owned = executor, False
+    else:
+        pool_class = ThreadPoolExecutor if executor == "thread" \
+            else ProcessPoolExecutor
+        pool, owned = pool_class(max_workers=max_workers), True
+
+    # Bounds the series held in memory, while keeping every worker busy.
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(chart_chunk, kind, chunk, options))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True, cancel_futures=True)
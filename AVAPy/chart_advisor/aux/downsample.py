@@ -0,0 +1,166 @@
+"""
+Downsampling of large series before they are inlined into a chart.
+
+Both methods select rows of the series, so that the selected points keep
+their exact values:
+
+  * LTTB (Largest-Triangle-Three-Buckets) keeps the points that best
+    preserve the visual shape of the line.
+  * M4 keeps the first, last, minimum and maximum points of each bucket of
+    the `x` range, i.e. of each pixel column when the budget is 4 points
+    per pixel.
+"""
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "m4")
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Return the sorted positions of the `n_out` points selected by LTTB.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray
+        Float coordinates of the points, in drawing order, without NaN.
+    n_out : int
+        Number of points to keep. Below 3, only the first and last points
+        are kept, up to `n_out`.
+    """
+
+    length = len(x)
+    if n_out >= length:
+        return np.arange(length)
+    if n_out < 3:
+        return _endpoints(length, n_out)
+
+    # Buckets of the points between the first and the last one.
+    edges = np.linspace(1, length - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = length - 1
+
+    prev = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < n_out - 1 else length
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Twice the area of the triangles (prev, point, average).
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) -
+                      (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[bucket + 1] = prev
+    return selected
+
+
+def m4_indices(x, y, n_out):
+    """
+    Return the sorted positions of the points selected by M4, at most
+    `n_out` of them.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray
+        Float coordinates of the points, without NaN.
+    n_out : int
+        Number of points to keep. Below 4, only the first and last points
+        are kept, up to `n_out`.
+    """
+
+    length = len(x)
+    buckets = n_out // 4
+    if n_out >= length:
+        return np.arange(length)
+    if buckets < 1:
+        return _endpoints(length, n_out)
+
+    low, high = x.min(), x.max()
+    if high > low:
+        bucket = ((x - low) / (high - low) * buckets).astype(np.int64)
+        np.minimum(bucket, buckets - 1, out=bucket)
+    else:
+        bucket = np.zeros(length, dtype=np.int64)
+
+    selected = []
+    for key in (x, y):
+        order = np.lexsort((key, bucket))
+        ordered = bucket[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        ends = np.r_[starts[1:], length] - 1
+        selected.extend([order[starts], order[ends]])
+    return np.unique(np.concatenate(selected))
+
+
+def _endpoints(length, n_out):
+    """
+    Return the positions of the first and last of `length` points, up to
+    `n_out` of them.
+    """
+
+    return np.array([0, length - 1][:max(n_out, 0)], dtype=np.int64)
+
+
+def downsample(df, max_points, method="lttb"):
+    """
+    Return at most `max_points` rows of `df`, selected from the series given
+    by its first two columns, see `downsample_indices`.
+
+    Returns
+    -------
+    DataFrame
+        Selected rows, in their original order.
+    """
+
+    rows = downsample_indices(df, max_points, method)
+    return df if rows is None else df.iloc[rows]
+
+
+def downsample_indices(df, max_points, method="lttb"):
+    """
+    Return the positions of at most `max_points` rows of `df`, selected
+    from the series given by its first two columns.
+
+    Rows with a missing `y` are dropped. A non-numeric `x` is replaced by
+    the row position, and dates by their timestamps.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Series to downsample, with `x` and `y` as the first two columns.
+    max_points : int
+        Point budget of the chart.
+    method : {"lttb", "m4"}
+        Downsampling method.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Sorted positions of the selected rows, or None if `df` has at most
+        `max_points` rows.
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"Argument method must be one of {METHODS}.")
+    if not isinstance(max_points, int) or max_points <= 0:
+        raise ValueError("Argument max_points must be a positive integer.")
+    if len(df) <= max_points:
+        return None
+
+    colnames = list(df.columns)
+    x = df[colnames[0]]
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x = x.astype("int64").to_numpy(dtype=float)
+    elif pd.api.types.is_numeric_dtype(x):
+        x = x.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        x = np.arange(len(df), dtype=float)
+    y = df[colnames[1]].to_numpy(dtype=float, na_value=np.nan)
+
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    select = lttb_indices if method == "lttb" else m4_indices
+    return valid[select(x[valid], y[valid], max_points)]
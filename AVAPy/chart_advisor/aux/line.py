@@ -10,54 +10,111 @@ Data format:
     *x.dtype == Number or String
 """
 
+import io
+
+import numpy as np
 import pandas as pd
-import altair as alt
 
 from . import auxiliary as auxutil
-
-
-def get_line(df, mks=1, deg=3):
+from . import spec
+from .downsample import downsample_indices
+from .trend import trend_values
+
+
+def get_line(df,
+             mks=1,
+             deg=3,
+             max_points=None,
+             method="lttb",
+             validate=False,
+             sink=None,
+             trend=None,
+             marks=None,
+             trend_method="poly",
+             trend_options=None,
+             compact=False):
     """
     Generate line chart with auxiliaries by given DataFrame.
 
-    The return is JSON in vega-lite schema.
+    The return is JSON in vega-lite schema. The input data is not modified,
+    and nothing else is written, so charts can be generated concurrently.
 
     Parameters
     ----------
-    df : DataFrame
+    df : DataFrame or pyarrow.Table
         Given data.
     mks : int
         Expect number of auxiliary lines.
     deg : int
         Degree of the fitting polynomial.
+    max_points : int, optional
+        Point budget of the chart. Longer series are downsampled by
+        `method` before being inlined into the specification. The trend and
+        quantile lines are computed on all the points, and the trend is
+        only evaluated at the rendered ones.
+    method : {"lttb", "m4"}
+        Downsampling method, see `downsample`.
+    validate : bool
+        Whether to validate the specification, which requires altair.
+    sink : callable or file object, optional
+        Also write the specification to this sink, see `spec.emit`.
+    trend : numpy.ndarray, optional
+        Values of the trend line, fitted if not given.
+    marks : tuple, optional
+        Mean, Q3 and Q1 of `y`, computed if not given.
+    trend_method : {"poly", "loess", "moving_average"}
+        Trend fitting method, see `trend.trend_values`.
+    trend_options : dict, optional
+        Options of the trend, e.g. `bins`, `frac` or `window`.
+    compact : bool
+        Whether to write the JSON without indentation, see `spec.to_json`.
     """
 
+    df = auxutil.as_frame(df)
     colnames = list(df.columns)
 
-    chart = alt.Chart(df).mark_line().encode(x=colnames[0], y=colnames[1])
-
-    if df[colnames[0]].dtype in (int, float):
-        auxutil.add_trend_line(df, deg)
-    else:
-        auxutil.add_trend_line_nonnum(df, deg)
-
-    quant_line = auxutil.add_quant_line(chart, df, mks)
-
-    trend_line = chart.mark_line(color='red',
-                                 opacity=0.75).encode(y='trend_line')
-
-    return (chart + trend_line + quant_line).to_json()
-
-
-def get_line_xy(x, y):
+    if marks is None:
+        marks = auxutil.get_marks(df)
+    rows = None
+    if max_points is not None:
+        rows = downsample_indices(df, max_points, method)
+
+    if trend is None:
+        # A non-numeric `x` is fitted on the row positions.
+        x, y = auxutil.trend_inputs(df, positions=True)
+        trend = trend_values(x, y, trend_method, rows, deg=deg,
+                             **(trend_options or {}))
+    elif rows is not None:
+        trend = np.asarray(trend)[rows]
+    if rows is not None:
+        df = df.iloc[rows].copy()
+    auxutil.add_trend_line(df, deg, trend)
+
+    x = colnames[0]
+    chart = spec.layer(df, 'line', {'x': x, 'y': colnames[1]})
+    trend_line = spec.layer(df,
+                            'line', {
+                                'x': x,
+                                'y': 'trend_line'
+                            },
+                            color='red',
+                            opacity=0.75)
+    quant_line = auxutil.quant_line_layer(df, x, mks, marks)
+
+    chart_spec = spec.layered_spec(df, [chart, trend_line, quant_line])
+    return spec.emit(spec.to_json(chart_spec, validate, compact), sink)
+
+
+def get_line_xy(x, y, max_points=None, method="lttb"):
     """
     Generate line chart with auxiliaries by given columns `x` and `y`.
 
-    The return is JSON in vega-lite schema.
+    The return is JSON in vega-lite schema. Long series can be downsampled,
+    see `get_line`.
     """
 
     df = pd.DataFrame({"x": x, "y": y})
-    return get_line(df)
+    return get_line(df, max_points=max_points, method=method)
 
 
 def get_line_json(json_data):
@@ -67,5 +124,5 @@ def get_line_json(json_data):
     The return is JSON in vega-lite schema.
     """
 
-    df = pd.read_json(json_data, orient='records')
+    df = pd.read_json(io.StringIO(json_data), orient='records')
     return get_line(df)
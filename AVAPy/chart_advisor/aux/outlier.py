@@ -0,0 +1,142 @@
+"""
+Vectorized detection of outliers in the points of a scatterplot.
+
+Each method takes the `x` and `y` coordinates as float arrays and returns a
+boolean mask of the outliers. Missing coordinates are ignored by the
+statistics and are never outliers. Methods are registered by name in
+`METHODS`, and more can be added with `register_method`.
+"""
+
+import numpy as np
+import pandas as pd
+
+METHODS = {}
+
+
+def register_method(name, method=None):
+    """
+    Register an outlier detection method under `name`.
+
+    `method(x, y, **kwargs)` must return a boolean mask of the outliers.
+    Can be used as a decorator.
+
+    Examples
+    --------
+    >>> @register_method("far")
+    ... def far_mask(x, y, radius=10):
+    ...     return np.hypot(x, y) > radius
+    """
+
+    if method is None:
+        return lambda func: register_method(name, func)
+    if not callable(method):
+        raise TypeError("Argument method must be callable.")
+    METHODS[name] = method
+    return method
+
+
+@register_method("zscore")
+def zscore_mask(x, y, threshold=3):
+    """
+    Points whose z-scores (population standard deviation) on both axes are
+    at least `threshold` in absolute value.
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_x = (x - np.nanmean(x)) / np.nanstd(x)
+        z_y = (y - np.nanmean(y)) / np.nanstd(y)
+    return (np.abs(z_x) >= threshold) & (np.abs(z_y) >= threshold)
+
+
+@register_method("gaussian")
+def gaussian_mask(x, y, scale=1.5):
+    """
+    Points beyond `scale` standard deviations from the mean on both axes,
+    in the same direction.
+    """
+
+    limit_x = np.nanstd(x) * scale
+    limit_y = np.nanstd(y) * scale
+    mean_x, mean_y = np.nanmean(x), np.nanmean(y)
+    above = (x > mean_x + limit_x) & (y > mean_y + limit_y)
+    below = (x < mean_x - limit_x) & (y < mean_y - limit_y)
+    return above | below
+
+
+@register_method("iqr")
+def iqr_mask(x, y, scale=1.5):
+    """
+    Points beyond `scale` interquartile ranges from the quartiles on either
+    axis.
+    """
+
+    mask = np.zeros(len(x), dtype=bool)
+    for values in (x, y):
+        q1, q3 = np.nanquantile(values, [0.25, 0.75])
+        iqr = q3 - q1
+        mask |= (values < q1 - scale * iqr) | (values > q3 + scale * iqr)
+    return mask
+
+
+@register_method("mad")
+def mad_mask(x, y, threshold=3.5):
+    """
+    Points whose modified z-scores, based on the median absolute deviation,
+    are at least `threshold` in absolute value on both axes.
+    """
+
+    mask = np.ones(len(x), dtype=bool)
+    for values in (x, y):
+        median = np.nanmedian(values)
+        mad = np.nanmedian(np.abs(values - median))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = 0.6745 * (values - median) / mad
+        mask &= np.abs(score) >= threshold
+    return mask
+
+
+def outlier_mask(data, method="zscore", **kwargs):
+    """
+    Return a boolean mask of the outliers among the points given by the
+    first two columns of `data`.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Data with `x` and `y` as the first two columns. `y` must be
+        numeric; a non-numeric `x` is replaced by the row position.
+    method : str or callable
+        Name of a method in `METHODS`, or a method itself.
+    **kwargs
+        Parameters of the method, e.g. `threshold`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array, `True` at the position of each outlier.
+    """
+
+    if not callable(method):
+        if method not in METHODS:
+            raise ValueError(f"Argument method must be one of "
+                             f"{tuple(METHODS)} or a callable.")
+        method = METHODS[method]
+
+    colnames = list(data.columns)
+    if pd.api.types.is_numeric_dtype(data[colnames[0]]):
+        x = data[colnames[0]].to_numpy(dtype=float, na_value=np.nan)
+    else:
+        # Positions, as the trend line of a non-numeric `x`.
+        x = np.arange(len(data), dtype=float)
+    y = data[colnames[1]].to_numpy(dtype=float, na_value=np.nan)
+    if len(x) == 0:
+        return np.zeros(0, dtype=bool)
+    return np.asarray(method(x, y, **kwargs), dtype=bool)
+
+
+def outlier_indices(data, method="zscore", **kwargs):
+    """
+    Return the positions of the outliers, see `outlier_mask`.
+    """
+
+    return np.flatnonzero(outlier_mask(data, method, **kwargs))
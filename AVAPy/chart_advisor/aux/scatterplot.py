@@ -10,20 +10,24 @@ Data format:
     *y.dtype == Number
 """
 
+import io
+
 import numpy as np
 import pandas as pd
-import altair as alt
 
 from . import auxiliary as auxutil
+from . import outlier
+from . import spec
 
 
 def estimate_gaussian(data):
     """
-    Return Gaussian Estimation for data.
+    Return Gaussian Estimation for data, per column for a DataFrame.
     """
 
-    mu = np.mean(data)
-    sigma = np.std(data)
+    data = np.asarray(data, dtype=float)
+    mu = np.nanmean(data, axis=0)
+    sigma = np.nanstd(data, axis=0)
     limit = sigma * 1.5
 
     min_threshold = mu - limit
@@ -32,6 +36,22 @@ def estimate_gaussian(data):
     return mu, sigma, min_threshold, max_threshold
 
 
+def mark_outliers(data, method="zscore", **kwargs):
+    """
+    Set the column `color_outlier` of data to "outlier" for the outliers
+    found by `method`, and "normal" if it is a new column, and return the
+    index of outliers.
+
+    See `outlier.outlier_mask` for the methods.
+    """
+
+    mask = outlier.outlier_mask(data, method, **kwargs)
+    if "color_outlier" not in data.columns:
+        data["color_outlier"] = "normal"
+    data.loc[mask, "color_outlier"] = "outlier"
+    return np.flatnonzero(mask).tolist()
+
+
 def add_outliers_by_zscore(data, threshold=3):
     """
     Add a new created column `color_outlier` to data and
@@ -40,24 +60,7 @@ def add_outliers_by_zscore(data, threshold=3):
     Outliers determined by z-score will be "outlier" in `color_outlier` column.
     """
 
-    colnames = list(data.columns)
-    mean_x = np.mean(data[colnames[0]])
-    std_x = np.std(data[colnames[0]])
-
-    mean_y = np.mean(data[colnames[1]])
-    std_y = np.std(data[colnames[1]])
-
-    outliers = []
-
-    for index in range(len(data[colnames[0]])):
-        x = data[colnames[0]][index]
-        y = data[colnames[1]][index]
-        z_score_y = (y - mean_y) / std_y
-        z_score_x = (x - mean_x) / std_x
-        if np.abs(z_score_x) >= threshold and np.abs(z_score_y) >= threshold:
-            outliers.append(index)
-            data["color_outlier"][index] = "outlier"
-    return outliers
+    return mark_outliers(data, "zscore", threshold=threshold)
 
 
 def add_outliers_by_gaussian(data):
@@ -69,20 +72,7 @@ def add_outliers_by_gaussian(data):
     column.
     """
 
-    colnames = list(data.columns)
-    min_threshold, max_threshold = estimate_gaussian(data)[2:]
-
-    outliers = []
-
-    for index in range(len(data[colnames[0]])):
-        x = data[colnames[0]][index]
-        y = data[colnames[1]][index]
-        if (x > max_threshold[0]
-                and y > max_threshold[1]) or (x < min_threshold[0]
-                                              and y < min_threshold[1]):
-            outliers.append(index)
-            data.loc[index, "color_outlier"] = "outlier"
-    return outliers
+    return mark_outliers(data, "gaussian")
 
 
 def add_outliers_by_iqr(data):
@@ -93,56 +83,87 @@ def add_outliers_by_iqr(data):
     Outliers determined by IQR will be "outlier" in `color_outlier` column.
     """
 
-    colnames = list(data.columns)
-    q1 = data[colnames[1]].quantile(0.25)
-    q3 = data[colnames[1]].quantile(0.75)
-    iqr = q3 - q1
-    lby = q1 - 1.5 * iqr
-    uby = q3 + 1.5 * iqr
+    return mark_outliers(data, "iqr")
+
 
-    q1 = data[colnames[0]].quantile(0.25)
-    q3 = data[colnames[0]].quantile(0.75)
-    iqr = q3 - q1
-    lbx = q1 - 1.5 * iqr
-    ubx = q3 + 1.5 * iqr
+def add_outliers_by_mad(data, threshold=3.5):
+    """
+    Add a new created column `color_outlier` to data and
+    return the index of outliers.
 
-    outliers = []
+    Outliers determined by the median absolute deviation will be "outlier"
+    in `color_outlier` column.
+    """
 
-    for index in range(len(data[colnames[1]])):
-        x = data[colnames[0]][index]
-        y = data[colnames[1]][index]
-        if ((y < lby) or (y > uby) or (x < lbx) or (x > ubx)):
-            outliers.append(index)
-            data["color_outlier"][index] = "outlier"
-    return outliers
+    return mark_outliers(data, "mad", threshold=threshold)
 
 
-def get_scatter(df, deg=3):
+def get_scatter(df,
+                deg=3,
+                method="zscore",
+                validate=False,
+                sink=None,
+                trend_method="poly",
+                trend_options=None,
+                compact=False):
     """
     Generate scatterplot with auxiliaries by given DataFrame.
 
-    The return is JSON in vega-lite schema.
+    The return is JSON in vega-lite schema. The input data is not modified,
+    and nothing else is written, so charts can be generated concurrently.
+
+    Parameters
+    ----------
+    df : DataFrame or pyarrow.Table
+        Given data.
+    deg : int
+        Degree of the fitting polynomial.
+    method : str or callable
+        Outlier detection method, see `outlier.outlier_mask`.
+    validate : bool
+        Whether to validate the specification, which requires altair.
+    sink : callable or file object, optional
+        Also write the specification to this sink, see `spec.emit`.
+    trend_method : {"poly", "loess", "moving_average"}
+        Trend fitting method, see `trend.trend_values`.
+    trend_options : dict, optional
+        Options of the trend, e.g. `bins`, `frac` or `window`.
+    compact : bool
+        Whether to write the JSON without indentation, see `spec.to_json`.
     """
 
+    df = auxutil.as_frame(df)
     df["color_outlier"] = "normal"
     colnames = list(df.columns)
 
-    add_outliers_by_zscore(df)
-
-    chart = alt.Chart(df).mark_point().encode(x=colnames[0],
-                                              y=colnames[1],
-                                              color="color_outlier")
+    mark_outliers(df, method)
 
+    trend_options = trend_options or {}
     if df[colnames[0]].dtype in (int, float):
-        auxutil.add_trend_line(df, deg)
+        auxutil.add_trend_line(df, deg, method=trend_method, **trend_options)
     else:
-        auxutil.add_trend_line_nonnum(df, deg)
-
-    line = chart.mark_line(color="red",
-                           opacity=0.75).encode(y="trend_line",
-                                                color="trend_line_col")
-
-    return (chart + line).to_json()
+        auxutil.add_trend_line_nonnum(df,
+                                      deg,
+                                      method=trend_method,
+                                      **trend_options)
+
+    x = colnames[0]
+    chart = spec.layer(df, "point", {
+        "x": x,
+        "y": colnames[1],
+        "color": "color_outlier"
+    })
+    line = spec.layer(df,
+                      "line", {
+                          "x": x,
+                          "y": "trend_line",
+                          "color": "trend_line_col"
+                      },
+                      color="red",
+                      opacity=0.75)
+
+    chart_spec = spec.layered_spec(df, [chart, line])
+    return spec.emit(spec.to_json(chart_spec, validate, compact), sink)
 
 
 def get_scatter_xy(x, y):
@@ -163,5 +184,5 @@ def get_scatter_json(json_data):
     The return is JSON in vega-lite schema.
     """
 
-    df = pd.read_json(json_data, orient="records")
+    df = pd.read_json(io.StringIO(json_data), orient="records")
     return get_scatter(df)
@@ -0,0 +1,323 @@
+"""
+Trend lines of large series.
+
+Polynomial trends are fitted by least squares on `x` centered and scaled to
+[-1, 1], so that high degrees stay well conditioned on timestamps or large
+values. A fit only keeps QR sufficient statistics, a triangular matrix of
+size ``deg + 2``, so it can be updated chunk by chunk as data arrives, and
+long series can first be reduced to binned aggregates. LOESS and moving
+averages are also available. Trends are evaluated only at the rows that
+are rendered.
+"""
+
+import numpy as np
+
+METHODS = ("poly", "loess", "moving_average")
+
+# Rows of the design matrix built at once.
+CHUNKSIZE = 1 << 16
+# LOESS fits longer series on this many bins, since each evaluated point
+# weighs every fitted point.
+LOESS_BINS = 1000
+# Default window of moving averages, as a fraction of the rows.
+WINDOW_FRAC = 0.05
+
+
+class PolynomialTrend:
+    """
+    Least-squares polynomial trend, which can be refitted incrementally.
+
+    The polynomial is fitted on ``t = (x - center) / scale``. By default,
+    the first update maps its range of `x` to [-1, 1]; later data outside
+    this range is fitted too, only less well conditioned.
+
+    Parameters
+    ----------
+    deg : int
+        Degree of the polynomial.
+    center, scale : float, optional
+        Affine map of `x`, set by the first update if not given.
+
+    Examples
+    --------
+    >>> trend = PolynomialTrend(deg=1).update([0, 1, 2], [1, 3, 5])
+    >>> trend.update([3], [7])(np.array([4.0, 5.0]))
+    array([ 9., 11.])
+    """
+
+    def __init__(self, deg=5, center=None, scale=None):
+        if not isinstance(deg, (int, np.integer)) or deg < 0:
+            raise ValueError("Argument deg must be a non-negative integer.")
+        if scale is not None and not scale > 0:
+            raise ValueError("Argument scale must be positive.")
+
+        self.deg = int(deg)
+        self.center = center
+        self.scale = scale
+        self.count = 0
+        # R factor of the design matrix augmented with `y`: its last column
+        # holds Q^T y.
+        self.__r = np.zeros((self.deg + 2, self.deg + 2))
+
+    def update(self, x, y, weights=None):
+        """
+        Add points to the fit and return the trend itself. Points with a
+        missing coordinate are ignored.
+
+        Parameters
+        ----------
+        x, y : array-like
+            Coordinates of the points.
+        weights : array-like, optional
+            Non-negative weights of the points, e.g. counts of binned
+            aggregates.
+        """
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape != y.shape:
+            raise ValueError("Arguments x and y must have the same length.")
+        valid = ~(np.isnan(x) | np.isnan(y))
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != x.shape or (weights < 0).any():
+                raise ValueError("Argument weights must be non-negative, "
+                                 "one per point.")
+            weights = weights[valid]
+        x, y = x[valid], y[valid]
+        if len(x) == 0:
+            return self
+
+        center, scale = _affine(x)
+        if self.center is None:
+            self.center = center
+        if self.scale is None:
+            self.scale = scale
+
+        for start in range(0, len(x), CHUNKSIZE):
+            augmented = np.column_stack([
+                self.design(x[start:start + CHUNKSIZE]),
+                y[start:start + CHUNKSIZE]
+            ])
+            if weights is not None:
+                root = np.sqrt(weights[start:start + CHUNKSIZE])
+                augmented *= root[:, np.newaxis]
+            r = np.linalg.qr(augmented, mode="r")
+            self.__r = np.linalg.qr(np.vstack([self.__r, r]), mode="r")
+        self.count += len(x)
+        return self
+
+    def design(self, x):
+        """
+        Return the powers of the scaled `x`, highest first, one row per
+        point.
+        """
+
+        scaled = (np.asarray(x, dtype=float) - self.center) / self.scale
+        return np.vander(scaled, self.deg + 1)
+
+    @property
+    def coefficients(self):
+        """
+        Return the coefficients of the polynomial of the scaled `x`,
+        highest power first.
+        """
+
+        if self.count == 0:
+            raise ValueError("No points were fitted.")
+        return np.linalg.lstsq(self.__r[:-1, :-1],
+                               self.__r[:-1, -1],
+                               rcond=None)[0]
+
+    def __call__(self, x):
+        scaled = (np.asarray(x, dtype=float) - self.center) / self.scale
+        values = np.zeros(scaled.shape)
+        for coef in self.coefficients:
+            values = values * scaled + coef
+        return values
+
+
+def polynomial_trends(x, ys, deg=5):
+    """
+    Return the polynomial trends of several series sharing `x`, given as the
+    rows of `ys`, from a single least-squares solve.
+    """
+
+    x = np.asarray(x, dtype=float)
+    design = PolynomialTrend(deg, *_affine(x)).design(x)
+    coefficients = np.linalg.lstsq(design, np.asarray(ys, dtype=float).T,
+                                   rcond=None)[0]
+    return (design @ coefficients).T
+
+
+def bin_aggregates(x, y, bins):
+    """
+    Return the mean `x`, the mean `y` and the number of points of the
+    non-empty bins among `bins` bins of equal width on `x`. Points with a
+    missing coordinate are ignored.
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if len(x) == 0:
+        return x, y, np.zeros(0)
+
+    low, high = x.min(), x.max()
+    if high > low:
+        bucket = ((x - low) / (high - low) * bins).astype(np.int64)
+        np.minimum(bucket, bins - 1, out=bucket)
+    else:
+        bucket = np.zeros(len(x), dtype=np.int64)
+    count = np.bincount(bucket, minlength=bins).astype(float)
+    sum_x = np.bincount(bucket, weights=x, minlength=bins)
+    sum_y = np.bincount(bucket, weights=y, minlength=bins)
+    keep = count > 0
+    return sum_x[keep] / count[keep], sum_y[keep] / count[keep], count[keep]
+
+
+def loess(x, y, at, frac=0.3, weights=None):
+    """
+    Return the locally weighted linear regression of `y` on `x`, evaluated
+    at `at`.
+
+    Each evaluated point is fitted on its ``frac * len(x)`` nearest points,
+    with tricube weights of their distance, times `weights` if given.
+    Points with a missing coordinate are ignored.
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    at = np.asarray(at, dtype=float)
+    weights = np.ones(len(x)) if weights is None else np.asarray(
+        weights, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y, weights = x[valid], y[valid], weights[valid]
+    if len(x) == 0:
+        return np.full(len(at), np.nan)
+
+    neighbours = min(len(x), max(int(np.ceil(frac * len(x))), 2))
+    values = np.empty(len(at))
+    block = max(1, CHUNKSIZE * 64 // len(x))
+    for start in range(0, len(at), block):
+        point = at[start:start + block, np.newaxis]
+        dist = np.abs(x - point)
+        # Widened a little, so that neighbours tied at the width keep some
+        # weight.
+        width = np.partition(dist, neighbours - 1,
+                             axis=1)[:, neighbours - 1:neighbours] * (1 + 1e-9)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # With a zero width, only the points at `point` are weighted.
+            ratio = np.nan_to_num(dist / width, nan=0.0, posinf=np.inf)
+        weight = np.clip(1 - ratio**3, 0, None)**3 * weights
+
+        total = weight.sum(axis=1)
+        mean_x = (weight @ x) / total
+        mean_y = (weight @ y) / total
+        dx = x - mean_x[:, np.newaxis]
+        var_x = np.einsum("ij,ij->i", weight, dx * dx)
+        cov_xy = np.einsum("ij,ij->i", weight, dx * y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where(var_x > 0, cov_xy / var_x, 0.0)
+        values[start:start + block] = mean_y + slope * (point[:, 0] - mean_x)
+    return values
+
+
+def moving_average(y, rows, window):
+    """
+    Return the centered moving average of `y` over `window` rows, at the
+    positions `rows`. Missing values are ignored.
+    """
+
+    y = np.asarray(y, dtype=float)
+    rows = np.asarray(rows, dtype=np.int64)
+    missing = np.isnan(y)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(missing, 0.0, y))])
+    counts = np.concatenate([[0], np.cumsum(~missing)])
+
+    low = np.clip(rows - (window - 1) // 2, 0, len(y))
+    high = np.clip(rows + window // 2 + 1, 0, len(y))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (sums[high] - sums[low]) / (counts[high] - counts[low])
+
+
+def trend_values(x,
+                 y,
+                 method="poly",
+                 rows=None,
+                 deg=5,
+                 bins=None,
+                 frac=0.3,
+                 window=None):
+    """
+    Return the trend of `y` on `x`, evaluated only at the rows `rows`.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Float coordinates of the series, in drawing order.
+    method : {"poly", "loess", "moving_average"}
+        Polynomial least squares, see `PolynomialTrend`, LOESS, see `loess`,
+        or moving average over rows, see `moving_average`.
+    rows : array-like of int, optional
+        Positions of the rendered points, all of them by default.
+    deg : int
+        Degree of the polynomial.
+    bins : int, optional
+        Fit the polynomial or LOESS on the means of this many bins of
+        equal width on `x`, weighted by their number of points. LOESS uses
+        `LOESS_BINS` bins for longer series by default.
+    frac : float
+        Fraction of the points in each LOESS fit.
+    window : int, optional
+        Rows of the moving average, `WINDOW_FRAC` of them by default.
+
+    Returns
+    -------
+    numpy.ndarray
+        Trend at each of `rows`.
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"Argument method must be one of {METHODS}.")
+    if bins is not None and (not isinstance(bins, int) or bins <= 0):
+        raise ValueError("Argument bins must be a positive integer.")
+    if not 0 < frac <= 1:
+        raise ValueError("Argument frac must be in (0, 1].")
+    if window is not None and (not isinstance(window, int) or window <= 0):
+        raise ValueError("Argument window must be a positive integer.")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rows = np.arange(len(y)) if rows is None else np.asarray(rows,
+                                                             dtype=np.int64)
+
+    if method == "moving_average":
+        if window is None:
+            window = max(int(len(y) * WINDOW_FRAC), 1)
+        return moving_average(y, rows, window)
+
+    at = x[rows]
+    if method == "loess" and bins is None and len(x) > LOESS_BINS:
+        bins = LOESS_BINS
+    weights = None
+    if bins is not None:
+        x, y, weights = bin_aggregates(x, y, bins)
+
+    if method == "loess":
+        return loess(x, y, at, frac, weights)
+    trend = PolynomialTrend(deg).update(x, y, weights)
+    if trend.count == 0:
+        return np.full(len(at), np.nan)
+    return trend(at)
+
+
+def _affine(x):
+    """
+    Return the center and scale mapping the range of `x` to [-1, 1].
+    """
+
+    low, high = x.min(), x.max()
+    half_range = (high - low) / 2
+    return (low + high) / 2, half_range if half_range > 0 else 1.0
@@ -0,0 +1,344 @@
+"""
+Classes for analyzing data fields incrementally.
+"""
+
+import json
+import itertools
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from AVAPy.data_wizard.utils.dateinfer import is_date_array
+from AVAPy.data_wizard.analyzer import arrow, columnar
+from AVAPy.data_wizard.analyzer.fieldinfo import FieldInfo
+
+
+class FieldInfoAccumulator:
+    """
+    Statistics of a field accumulated over chunks of data.
+
+    Feeding the chunks of a field in order with `update()` gives the same
+    `info` as ``FieldInfo`` on the whole field. Accumulators built on
+    separate chunks (e.g. in worker processes) can be combined with
+    `merge()`. Accumulators are picklable.
+
+    Examples
+    --------
+    >>> acc = FieldInfoAccumulator().update([1, 2, None]).update([2, "a"])
+    >>> acc.info == FieldInfo([1, 2, None, 2, "a"]).info
+    True
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.missing = 0
+        self.value_map = {}
+        self.types = []
+
+    def update(self, chunk):
+        """
+        Accumulate a chunk of the field.
+
+        Parameters
+        ----------
+        chunk : list, numpy.ndarray, pandas.Series or pyarrow.Array
+            Next values of the field. Empty chunks are ignored.
+
+        Returns
+        -------
+        FieldInfoAccumulator
+            The accumulator itself.
+        """
+
+        if chunk is None:
+            raise TypeError("Argument chunk can not be None.")
+        if not isinstance(chunk, (list, np.ndarray, pd.Series)) and \
+                not arrow.is_arrow_array(chunk):
+            raise TypeError("Argument chunk must be a list, numpy.ndarray, "
+                            "pandas.Series or pyarrow.Array.")
+        if len(chunk) == 0:
+            return self
+
+        count, missing, value_map, types, _ = FieldInfo.collect(chunk)
+        self.__add(count, missing, value_map, types)
+        return self
+
+    def merge(self, other):
+        """
+        Merge another accumulator into this one.
+
+        The values accumulated by `other` are regarded as following the
+        values accumulated by this one.
+
+        Returns
+        -------
+        FieldInfoAccumulator
+            The accumulator itself.
+        """
+
+        if not isinstance(other, FieldInfoAccumulator):
+            raise TypeError("Argument other must be a FieldInfoAccumulator.")
+
+        self.__add(other.count, other.missing, other.value_map, other.types)
+        return self
+
+    def __add(self, count, missing, value_map, types):
+        self.count += count
+        self.missing += missing
+        for val, cnt in value_map.items():
+            self.value_map[val] = self.value_map.get(val, 0) + cnt
+        for type_str in types:
+            if type_str not in self.types:
+                self.types.append(type_str)
+
+    @property
+    def info(self):
+        """
+        Return all information collected for the field so far.
+        """
+
+        if self.count == 0:
+            raise ValueError("No value has been accumulated.")
+
+        return FieldInfo.summarize(self.count, self.missing,
+                                   dict(self.value_map), list(self.types))
+
+    @property
+    def distinct(self):
+        """
+        Number of kinds of non-empty value accumulated.
+        """
+
+        return len(self.value_map)
+
+    @property
+    def type(self):
+        """
+        Return the 1st level inference for the type of field.
+        """
+
+        return self.info["type"]
+
+    @property
+    def implied(self):
+        """
+        Return the 2nd level inference for the type of field.
+        """
+
+        return self.info["implied"]
+
+    @property
+    def valuemap(self):
+        """
+        Return a dict that records all non-empty values and their counts.
+        """
+
+        return self.value_map
+
+
+class RecordAccumulator:
+    """
+    Statistics of all fields of a dataset, accumulated while it is parsed.
+
+    Values are only counted, grouped by ``(type, value)``, for batches of
+    records as they are decoded or for the columns of parsed chunks.
+    Meta types are inferred once for each distinct value when `info` is
+    requested, vectorized for numbers, and counted as votes. Fields absent
+    from some rows count as missing in them. Lists and dicts (e.g. nested
+    JSON) are counted as their JSON text.
+
+    Examples
+    --------
+    >>> acc = RecordAccumulator().add_records([{"a": 1, "b": "x"},
+    ...                                         {"a": "2.5"}])
+    >>> acc.info["b"]["missing"], acc.info["a"]["votes"]
+    (1, {'integer': 1, 'float': 1})
+    """
+
+    # Python type of the values of numeric arrays, by dtype kind.
+    NUMERIC_TYPES = {"b": bool, "i": int, "u": int, "f": float}
+
+    def __init__(self):
+        self.rows = 0
+        self.counters = {}
+        # Distinct values and counts of numeric columns, by name and kind.
+        self.arrays = {}
+
+    def __counter(self, name):
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = Counter()
+        return counter
+
+    def add_records(self, records):
+        """
+        Count the values of dicts that map field names to values, e.g.
+        decoded JSON records.
+        """
+
+        records = list(records)
+        names = dict.fromkeys(name for record in records for name in record)
+        for name in names:
+            values = [record[name] for record in records if name in record]
+            self.__counter(name).update(self.__count(values))
+        self.rows += len(records)
+        return self
+
+    @staticmethod
+    def __count(values):
+        try:
+            return Counter(zip(map(type, values), values))
+        except TypeError:
+            counts = Counter()
+            for val in values:
+                try:
+                    counts[type(val), val] += 1
+                except TypeError:
+                    counts[str, json.dumps(val, ensure_ascii=False)] += 1
+            return counts
+
+    def add_frame(self, df):
+        """
+        Count the values of each column of a DataFrame or a pyarrow Table.
+        """
+
+        names, column = arrow.frame_columns(df)
+        if len(set(names)) != len(names):
+            raise ValueError("Column names of df must be unique.")
+
+        for name in names:
+            field = column(name)
+            values = arrow.arrow_values(field) if arrow.is_arrow_array(
+                field) else columnar.column_values(field)
+            counter = self.__counter(name)
+            if values.dtype.kind in columnar.NUMERIC_KINDS:
+                self.__add_array(name, values)
+            else:
+                counter.update(self.__count(values[~pd.isna(values)]))
+        self.rows += len(df)
+        return self
+
+    def __add_array(self, name, values, counts=None):
+        """
+        Count the non-NaN values of a numeric array, weighted by `counts`.
+        """
+
+        key = (name, values.dtype.kind)
+        if key in self.arrays:
+            old_values, old_counts = self.arrays[key]
+            if counts is None:
+                counts = np.ones(len(values), dtype=np.int64)
+            values = np.concatenate([old_values, values])
+            counts = np.concatenate([old_counts, counts])
+        codes, uniques = pd.factorize(values)
+        present = codes >= 0
+        counts = np.bincount(codes[present],
+                             weights=None if counts is None else
+                             counts[present],
+                             minlength=len(uniques)).astype(np.int64)
+        self.arrays[key] = (uniques, counts)
+
+    def merge(self, other):
+        """
+        Merge another accumulator, whose rows follow the rows of this one.
+        """
+
+        if not isinstance(other, RecordAccumulator):
+            raise TypeError("Argument other must be a RecordAccumulator.")
+
+        for name, counter in other.counters.items():
+            self.__counter(name).update(counter)
+        for (name, _), (values, counts) in other.arrays.items():
+            self.__add_array(name, values, counts)
+        self.rows += other.rows
+        return self
+
+    @staticmethod
+    def __classify(kind, values):
+        """
+        Return the meta types of distinct values of the same Python type,
+        as given by ``FieldInfo.meta_type``.
+        """
+
+        if kind is float:
+            return ["empty" if val != val else "float" for val in values]
+        if kind is bool:
+            return ["string"] * len(values)
+        if kind is int:
+            try:
+                dates = is_date_array(np.array(values, dtype=np.int64))
+            except OverflowError:
+                pass
+            else:
+                return np.where(dates, "date", "integer").tolist()
+        classify = FieldInfo.classifier()
+        return [classify(val) for val in values]
+
+    @classmethod
+    def __summarize(cls, rows, counter, arrays):
+        """
+        Build the info of a field from its counter and the Python type,
+        distinct values and counts of its numeric arrays.
+        """
+
+        groups = []
+        kinds = {kind for kind, _ in counter}
+        if len(kinds) == 1:
+            groups.append((kinds.pop(), [val for _, val in counter],
+                           list(counter.values())))
+        elif kinds:
+            by_kind = {}
+            for (kind, val), cnt in counter.items():
+                values, counts = by_kind.setdefault(kind, ([], []))
+                values.append(val)
+                counts.append(cnt)
+            groups.extend((kind, values, counts)
+                          for kind, (values, counts) in by_kind.items())
+        groups.extend((kind, values.tolist(), counts)
+                      for kind, values, counts in arrays)
+
+        missing = rows - sum(counter.values()) - sum(
+            int(counts.sum()) for _, _, counts in arrays)
+        value_map = {}
+        votes = {}
+        for kind, values, counts in groups:
+            type_strs = np.array(cls.__classify(kind, values))
+            counts = np.array(counts)
+            for type_str in dict.fromkeys(type_strs.tolist()):
+                total = int(counts[type_strs == type_str].sum())
+                if type_str == "empty":
+                    missing += total
+                else:
+                    votes[type_str] = votes.get(type_str, 0) + total
+
+            kept = (type_strs != "empty").tolist()
+            pairs = zip(itertools.compress(values, kept),
+                        itertools.compress(counts.tolist(), kept))
+            if value_map:
+                for val, cnt in pairs:
+                    value_map[val] = value_map.get(val, 0) + cnt
+            else:
+                value_map = dict(pairs)
+
+        info = FieldInfo.summarize(rows, missing, value_map, list(votes))
+        info["votes"] = votes
+        return info
+
+    @property
+    def info(self):
+        """
+        Return a dict that maps each field name to its `FieldInfo.info`,
+        with the number of non-empty values of each meta type as "votes".
+        """
+
+        if self.rows == 0:
+            raise ValueError("No value has been accumulated.")
+
+        arrays = {name: [] for name in self.counters}
+        for (name, kind), (values, counts) in self.arrays.items():
+            arrays[name].append((self.NUMERIC_TYPES[kind], values, counts))
+        return {
+            name: self.__summarize(self.rows, counter, arrays[name])
+            for name, counter in self.counters.items()
+        }
@@ -0,0 +1,150 @@
+"""
+Arrow compute kernels for analyzing a field stored as an Arrow array.
+
+``pyarrow`` is optional. The kernels are only reached with Arrow arrays or
+tables, which can not exist without it; other entry points call
+`require_arrow` first.
+"""
+
+import numpy as np
+import pandas as pd
+
+import AVAPy.data_wizard.utils as dwutil
+from AVAPy.data_wizard.analyzer import columnar
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+HAS_ARROW = pa is not None
+
+
+def require_arrow(feature):
+    """
+    Raise an ImportError naming `feature` if pyarrow is not installed.
+    """
+
+    if not HAS_ARROW:
+        raise ImportError(f"{feature} requires pyarrow.")
+
+
+def is_arrow_array(obj):
+    """
+    Whether `obj` is a ``pyarrow.Array`` or ``pyarrow.ChunkedArray``.
+    """
+
+    return HAS_ARROW and isinstance(obj, (pa.Array, pa.ChunkedArray))
+
+
+def is_arrow_table(obj):
+    """
+    Whether `obj` is a ``pyarrow.Table``.
+    """
+
+    return HAS_ARROW and isinstance(obj, pa.Table)
+
+
+def arrow_values(array):
+    """
+    Return the values of an Arrow array as a 1-D ``numpy.ndarray``, like
+    ``columnar.column_values``: numbers without nulls keep their dtype, other
+    arrays are object arrays with nulls as None.
+    """
+
+    if array.null_count == 0 and numeric_dtype(array.type) is not None:
+        return np.asarray(array.to_numpy(zero_copy_only=False))
+    return np.array(array.to_pylist(), dtype=object)
+
+
+def table_to_frame(table, columns=None):
+    """
+    Convert the `columns` of an Arrow table, all by default, to a pandas
+    DataFrame. Other columns are not converted.
+    """
+
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def numeric_dtype(arrow_type):
+    """
+    Return the numpy dtype that holds the values of a numeric or boolean
+    Arrow type, or None for other types.
+    """
+
+    if pa.types.is_boolean(arrow_type):
+        return np.bool_
+    if pa.types.is_unsigned_integer(arrow_type):
+        return np.uint64
+    if pa.types.is_integer(arrow_type):
+        return np.int64
+    if pa.types.is_floating(arrow_type):
+        return np.float64
+    return None
+
+
+def analyze_arrow(array, classify):
+    """
+    Analyze an Arrow array with Arrow compute kernels.
+
+    Nulls and NaN are found by ``is_null``, distinct values and their counts
+    by ``value_counts``; only the distinct values are converted to Python
+    objects. Strings regarded as empty by `is_empty_value` are empty, and
+    `classify` runs once for each distinct string until the types are
+    settled, as in ``columnar.analyze``.
+
+    Returns
+    -------
+    tuple
+        Boolean mask of empty values, value map and list of meta types.
+    """
+
+    if pa.types.is_dictionary(array.type):
+        array = array.cast(array.type.value_type)
+
+    empty = pc.is_null(array, nan_is_null=True)
+    counts = pc.value_counts(pc.filter(array, pc.invert(empty)))
+    uniques = counts.field("values").to_pylist()
+    value_map = dict(zip(uniques, counts.field("counts").to_pylist()))
+
+    dtype = numeric_dtype(array.type)
+    if dtype is not None:
+        uniques = np.array(uniques, dtype=dtype)
+        types = columnar.numeric_types(uniques, uniques)
+    else:
+        empties = [val for val in uniques if dwutil.is_empty_value(val)]
+        if empties:
+            empty = pc.or_(
+                empty,
+                pc.is_in(array, value_set=pa.array(empties,
+                                                   type=array.type)))
+            for val in empties:
+                del value_map[val]
+        types = []
+        for val in value_map:
+            if classify is None or columnar.types_settled(types):
+                break
+            type_str = classify(val)
+            if type_str not in types:
+                types.append(type_str)
+
+    empty_mask = np.asarray(empty.to_numpy(zero_copy_only=False), dtype=bool)
+    return empty_mask, value_map, types
+
+
+def frame_columns(data):
+    """
+    Return column names and a function that returns a column by name, for a
+    pandas DataFrame or an Arrow table.
+    """
+
+    if is_arrow_table(data):
+        return data.column_names, data.column
+    if isinstance(data, pd.DataFrame):
+        return list(data.columns), data.__getitem__
+    raise TypeError("Argument df must be a pandas DataFrame or a "
+                    "pyarrow Table.")
@@ -0,0 +1,166 @@
+"""
+Vectorized kernels for analyzing a field stored as a column.
+
+The kernels accept ``numpy.ndarray`` and ``pandas.Series`` and produce the
+same statistics as the row-by-row traversal in ``FieldInfo``.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import AVAPy.data_wizard.utils as dwutil
+from AVAPy.data_wizard.utils.dateinfer import is_date_array
+
+NUMERIC_KINDS = "biuf"
+
+
+def types_settled(types):
+    """
+    Whether the inferred types of a field can no longer change, whatever
+    meta types the remaining values have.
+
+    That is the case once the field is "mixed" and implied as "string".
+    """
+
+    return len(types) > 2 or (len(types) == 2
+                              and set(types) != {"integer", "float"})
+
+
+def column_values(field):
+    """
+    Return the values of a column as a 1-D ``numpy.ndarray``.
+
+    Numeric and boolean columns keep their dtype. Any other column is
+    converted to an object array, with missing markers as None.
+
+    Raises
+    ------
+    ValueError
+      * If `field` is not 1-dimensional.
+    """
+
+    if isinstance(field, pd.Series):
+        if field.dtype.kind in NUMERIC_KINDS and not isinstance(
+                field.dtype, pd.api.extensions.ExtensionDtype):
+            return field.to_numpy()
+        return field.to_numpy(dtype=object, na_value=None)
+
+    if field.ndim != 1:
+        raise ValueError("Argument field must be 1-dimensional.")
+    if field.dtype.kind in NUMERIC_KINDS:
+        return field
+    return field.astype(object)
+
+
+def numeric_types(values, uniques):
+    """
+    Return meta types of the distinct non-empty values in a numeric array.
+    """
+
+    if len(uniques) == 0:
+        return []
+    if values.dtype.kind == "b":
+        return ["string"]
+    if values.dtype.kind == "f":
+        return ["float"]
+
+    dates = is_date_array(uniques)
+    types = []
+    if dates.any():
+        types.append("date")
+    if not dates.all():
+        types.append("integer")
+    return types
+
+
+def analyze_numeric(values):
+    """
+    Analyze a numeric or boolean array.
+
+    Returns
+    -------
+    tuple
+        Boolean mask of empty values, value map and list of meta types.
+    """
+
+    codes, uniques = pd.factorize(values)
+    empty_mask = codes < 0
+    counts = np.bincount(codes[~empty_mask], minlength=len(uniques))
+    value_map = dict(zip(uniques.tolist(), counts.tolist()))
+    return empty_mask, value_map, numeric_types(values, uniques)
+
+
+def analyze_object(values, classify):
+    """
+    Analyze an object array.
+
+    Values are grouped by ``(type, value)`` so that `classify` runs once for
+    each distinct value and type, while keys of the value map still follow
+    the dict semantics of the row-by-row traversal (e.g. ``1 == 1.0``).
+    Classification stops once the types are settled, and is skipped if
+    `classify` is None.
+
+    Returns
+    -------
+    tuple
+        Boolean mask of empty values, value map and list of meta types.
+    """
+
+    empty_mask = pd.isna(values)
+    present = values[~empty_mask] if empty_mask.any() else values
+
+    value_map = {}
+    types = []
+    empty_strs = []
+
+    for (_, val), cnt in Counter(zip(map(type, present), present)).items():
+        if dwutil.is_empty_value(val):
+            empty_strs.append(val)
+            continue
+        value_map[val] = value_map.get(val, 0) + cnt
+        if classify is None or types_settled(types):
+            continue
+        type_str = classify(val)
+        if type_str not in types:
+            types.append(type_str)
+
+    if empty_strs:
+        empty_mask = empty_mask.copy()
+        empty_mask[~empty_mask] = pd.Series(
+            present, dtype=object).isin(empty_strs).to_numpy()
+
+    return empty_mask, value_map, types
+
+
+def analyze(values, classify):
+    """
+    Analyze a column returned by `column_values`.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Values of the field.
+    classify : callable or None
+        Returns the meta type of a non-empty value, used for object arrays.
+
+    Returns
+    -------
+    tuple
+        Boolean mask of empty values, value map and list of meta types.
+    """
+
+    if values.dtype.kind in NUMERIC_KINDS:
+        return analyze_numeric(values)
+    return analyze_object(values, classify)
+
+
+def masked_list(values, empty_mask):
+    """
+    Return `values` as a list, with every masked value replaced by None.
+    """
+
+    data = values.astype(object)
+    data[empty_mask] = None
+    return data.tolist()
@@ -0,0 +1,218 @@
+"""
+Class for analyzing all fields of a dataset.
+"""
+
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from AVAPy.data_wizard.analyzer import arrow, columnar
+from AVAPy.data_wizard.analyzer.accumulator import FieldInfoAccumulator
+from AVAPy.data_wizard.analyzer.fieldinfo import FieldInfo
+
+EXECUTORS = ("thread", "process")
+
+
+def field_info(column):
+    """
+    Return the info of a column, as given by ``FieldInfo``.
+    """
+
+    return FieldInfo(column).info
+
+
+def shared_field_info(name, dtype, length):
+    """
+    Return the info of a numeric column stored in shared memory.
+
+    Runs in a worker process. The block is owned by the parent process,
+    which is responsible for unlinking it.
+    """
+
+    shm = SharedMemory(name=name)
+    column = None
+    try:
+        column = np.ndarray((length, ), dtype=dtype, buffer=shm.buf)
+        return FieldInfo(column).info
+    except BaseException as error:
+        # The frames of a failed analysis hold views of the block too.
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        # Views must be released before the block is closed, or closing it
+        # raises BufferError and hides the original exception.
+        del column
+        shm.close()
+
+
+class DataFrameInfo:
+    """
+    Statistical characteristics and properties of all fields of a dataset.
+
+    Columns are analyzed by ``FieldInfo`` on a pool of threads or processes.
+    With processes, numeric columns are passed to the workers through shared
+    memory instead of being pickled; other columns are pickled as object
+    arrays. Columns of an Arrow table are analyzed with Arrow kernels, and
+    pickled in Arrow format.
+
+    Attributes
+    ----------
+    df : DataFrame or pyarrow.Table
+        Dataset to analyze.
+
+    Examples
+    --------
+    >>> dfi = DataFrameInfo(pd.DataFrame({"a": [1, 2], "b": ["x", None]}))
+    >>> dfi["b"]["missing"]
+    1
+    """
+
+    def __init__(self, df=None, executor="thread", max_workers=None):
+        """
+        Parameters
+        ----------
+        df : DataFrame or pyarrow.Table
+            Dataset to analyze.
+        executor : {"thread", "process"}
+            Kind of pool that analyzes the columns.
+        max_workers : int, optional
+            Size of the pool, defaults to the number of processors.
+        """
+
+        if df is None:
+            raise TypeError("Argument df can not be None.")
+        if not isinstance(df, pd.DataFrame) and not arrow.is_arrow_table(df):
+            raise TypeError("Argument df must be a pandas DataFrame or a "
+                            "pyarrow Table.")
+        if df.shape[0] == 0 or df.shape[1] == 0:
+            raise ValueError("Argument df can not be empty.")
+        names, column = arrow.frame_columns(df)
+        if len(set(names)) != len(names):
+            raise ValueError("Column names of df must be unique.")
+        if executor not in EXECUTORS:
+            raise ValueError(f"Argument executor must be one of {EXECUTORS}.")
+
+        columns = [column(name) for name in names]
+        if executor == "thread":
+            infos = self.__profile_threads(columns, max_workers)
+        else:
+            infos = self.__profile_processes(columns, max_workers)
+
+        self.__info = dict(zip(names, infos))
+
+    @staticmethod
+    def __profile_threads(columns, max_workers):
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(field_info, columns))
+
+    @staticmethod
+    def __profile_processes(columns, max_workers):
+        blocks = []
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = []
+                for col in columns:
+                    if arrow.is_arrow_array(col):
+                        futures.append(pool.submit(field_info, col))
+                        continue
+                    values = columnar.column_values(col)
+                    if values.dtype.kind not in columnar.NUMERIC_KINDS:
+                        futures.append(pool.submit(field_info, values))
+                        continue
+                    shm = SharedMemory(create=True, size=values.nbytes)
+                    blocks.append(shm)
+                    shared = np.ndarray(values.shape,
+                                        dtype=values.dtype,
+                                        buffer=shm.buf)
+                    shared[:] = values
+                    del shared
+                    futures.append(
+                        pool.submit(shared_field_info, shm.name,
+                                    values.dtype.str, len(values)))
+                return [future.result() for future in futures]
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    @property
+    def info(self):
+        """
+        Return a dict that maps each column name to its `FieldInfo.info`.
+        """
+
+        return self.__info
+
+    @property
+    def columns(self):
+        """
+        Return names of the analyzed columns.
+        """
+
+        return list(self.__info)
+
+    def __getitem__(self, column):
+        return self.__info[column]
+
+
+def profile(df, executor="thread", max_workers=None):
+    """
+    Analyze all columns of a DataFrame in parallel.
+
+    Returns
+    -------
+    dict
+        Maps each column name to its `FieldInfo.info`.
+
+    See Also
+    --------
+    DataFrameInfo : Parameters and details of the analysis.
+    """
+
+    return DataFrameInfo(df, executor=executor, max_workers=max_workers).info
+
+
+def profile_chunks(chunks):
+    """
+    Analyze all columns of a dataset given as successive DataFrame chunks,
+    e.g. as read by ``json2chunks``, holding one chunk at a time.
+
+    A column that is absent from some chunks counts as missing in their
+    rows.
+
+    Returns
+    -------
+    dict
+        Maps each column name to its `FieldInfo.info`, in order of first
+        appearance.
+
+    Examples
+    --------
+    >>> chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"b": ["x"]})]
+    >>> profile_chunks(chunks)["a"]["missing"]
+    1
+    """
+
+    accumulators = {}
+    rows = 0
+    for chunk in chunks:
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("Chunks must be pandas DataFrames.")
+        if not chunk.columns.is_unique:
+            raise ValueError("Column names of chunks must be unique.")
+
+        for col in chunk.columns:
+            if col not in accumulators:
+                accumulators[col] = FieldInfoAccumulator()
+                if rows:
+                    accumulators[col].update(np.full(rows, None, dtype=object))
+            accumulators[col].update(chunk[col])
+        for col, acc in accumulators.items():
+            if col not in chunk.columns and len(chunk):
+                acc.update(np.full(len(chunk), None, dtype=object))
+        rows += len(chunk)
+
+    return {col: acc.info for col, acc in accumulators.items()}
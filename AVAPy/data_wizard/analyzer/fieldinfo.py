@@ -2,7 +2,19 @@
 Class for analyzing data field.
 """
 
+from collections import Counter
+from itertools import compress
+from functools import lru_cache, partial
+
+import numpy as np
+import pandas as pd
+
 import AVAPy.data_wizard.utils as dwutil
+from AVAPy.data_wizard.utils.dateinfer import DateDetector
+from AVAPy.data_wizard.analyzer import arrow, columnar
+from AVAPy.data_wizard.analyzer.sketch import HyperLogLog, SpaceSaving, \
+    Reservoir
+from AVAPy.data_wizard.analyzer.stats import StreamingStats, field_stats
 
 
 def infer_type_from_types(types):
@@ -38,7 +50,7 @@ class FieldInfo:
 
     Attributes
     ----------
-    field : list
+    field : list, numpy.ndarray or pandas.Series
         List of data as a column or field.
 
     Methods
@@ -49,82 +61,365 @@ class FieldInfo:
         Return number of empty values.
     """
 
+    __slots__ = ("__field", "__nulls", "__info")
+
     BOOL_SUFFICIENT_LENGTH = 100
+    SKETCH_CHUNK_SIZE = 65536
+    SAMPLE_SEED = 0
+
+    __type_cache = None
 
-    def __init__(self, field=None):
+    def __init__(self,
+                 field=None,
+                 sketch=False,
+                 distinct_error=0.01,
+                 count_error=0.001,
+                 sample_size=None):
         """
         Parameters
         ----------
-        field : list
-            List of data as a column or field.
+        field : list, numpy.ndarray, pandas.Series or pyarrow.Array
+            List of data as a column or field. Arrays and Series are
+            analyzed with vectorized kernels, Arrow arrays (also chunked)
+            with Arrow compute kernels, and give the same result as the list
+            of their values.
+        sketch : bool
+            Whether to analyze the field in bounded memory. `distinct` is
+            then estimated by HyperLogLog and `valuemap` only keeps the most
+            frequent values, with counts estimated by Space-Saving. Both are
+            exact while the field has few distinct values.
+        distinct_error : float
+            Relative standard error of `distinct` in sketch mode.
+        count_error : float
+            Bound of the overestimation of counts in `valuemap`, relative to
+            the number of non-empty values, in sketch mode. `valuemap` keeps
+            at most ``ceil(1 / count_error)`` values.
+        sample_size : int, optional
+            If given, `type` and `implied` are inferred from a random sample
+            of at most `sample_size` non-empty values, while the other
+            statistics still cover the whole field. `confidence` tells how
+            likely the inference matches the whole field.
         """
 
         if field is None:
             raise TypeError("Argument field can not be None.")
-        if not isinstance(field, list):
-            raise TypeError("Argument field must be a list.")
+        if not isinstance(field, (list, np.ndarray, pd.Series)) and \
+                not arrow.is_arrow_array(field):
+            raise TypeError("Argument field must be a list, numpy.ndarray, "
+                            "pandas.Series or pyarrow.Array.")
         if len(field) == 0:
             raise ValueError("Argument field can not be an empty list.")
 
         self.__field = field
 
-        # One-round traversal (for performance)
+        if sample_size is not None and (not isinstance(sample_size, int)
+                                        or sample_size <= 0):
+            raise ValueError("Argument sample_size must be a positive integer.")
+        if sketch and sample_size is not None:
+            raise ValueError("Arguments sketch and sample_size can not be "
+                             "used together.")
 
-        count = 0
-        empty_val_indices = []
-        value_map = {}
-        types = []
+        distinct = None
+        confidence = 1.0
 
-        for idx, val in enumerate(field):
+        stats = None
 
-            count += 1
+        if sketch:
+            count, missing, value_map, types, distinct, empty_mask, stats = \
+                FieldInfo.__sketch(field, distinct_error, count_error)
+        elif sample_size is not None:
+            count, missing, value_map, types, empty_mask, confidence = \
+                FieldInfo.__sample(field, sample_size)
+        else:
+            count, missing, value_map, types, empty_mask = \
+                FieldInfo.collect(field)
+
+        # Packed bitmap of empty values, None if there is none.
+        self.__nulls = np.packbits(empty_mask) if missing else None
+        self.__info = self.summarize(count, missing, value_map, types,
+                                     distinct, confidence, stats)
+
+    @classmethod
+    def summarize(cls,
+                  count,
+                  missing,
+                  value_map,
+                  types,
+                  distinct=None,
+                  confidence=1.0,
+                  stats=None):
+        """
+        Build the `info` dict from statistics collected over a field.
 
-            if dwutil.is_empty_value(val):
-                empty_val_indices.append(idx)
-            else:
-                if val in value_map:
-                    value_map[val] += 1
-                else:
-                    value_map[val] = 1
-
-                type_str = FieldInfo.meta_type(val)
-                if type_str not in types:
-                    types.append(type_str)
+        Parameters
+        ----------
+        count : int
+            Number of values, including empty values.
+        missing : int
+            Number of empty values.
+        value_map : dict
+            Non-empty values and their counts.
+        types : list
+            Meta types of the non-empty values.
+        distinct : int, optional
+            Number of distinct non-empty values, if `value_map` does not
+            hold all of them.
+        confidence : float
+            Confidence of the type inference, if `types` is not collected
+            over all values.
+        stats : StreamingStats, optional
+            Statistics accumulated over the field, if `value_map` does not
+            hold all values. Otherwise they are computed from `value_map`.
+        """
 
         field_type, implied_type = infer_type_from_types(types)
 
-        data_list = list(
-            map(lambda x: None if dwutil.is_empty_value(x) else x, field))
-        self.__data_list = data_list
-
-        distinct = len(value_map)
+        if distinct is None:
+            distinct = len(value_map)
 
         if distinct == 2 and implied_type != "date" and (
-                len(data_list) >= self.BOOL_SUFFICIENT_LENGTH
+                count >= cls.BOOL_SUFFICIENT_LENGTH
                 or dwutil.is_bool_field(list(value_map.keys()))):
             implied_type = "boolean"
 
+        if stats is None:
+            stats = field_stats(value_map, implied_type)
+        else:
+            stats = stats.result(implied_type)
+
         info = {
             "count": count,
             "distinct": distinct,
             "type": field_type,
             "implied": implied_type,
-            "missing": len(empty_val_indices),
-            "valuemap": value_map
+            "missing": missing,
+            "valuemap": value_map,
+            "confidence": confidence,
+            "stats": stats
         }
 
-        self.__info = info
+        return info
+
+    @staticmethod
+    def collect(field):
+        """
+        Collect statistics of a list, numpy.ndarray, pandas.Series or
+        pyarrow.Array.
+
+        Returns
+        -------
+        tuple
+            Count, number of empty values, value map, list of meta types and
+            boolean mask of empty values.
+        """
+
+        if isinstance(field, list):
+            return FieldInfo.__traverse(field, FieldInfo.classifier())
+
+        if arrow.is_arrow_array(field):
+            empty_mask, value_map, types = arrow.analyze_arrow(
+                field, FieldInfo.classifier())
+            return len(field), int(
+                empty_mask.sum()), value_map, types, empty_mask
+
+        values = columnar.column_values(field)
+        empty_mask, value_map, types = columnar.analyze(
+            values, FieldInfo.classifier())
+        return len(values), int(empty_mask.sum()), value_map, types, empty_mask
+
+    @staticmethod
+    def __sketch(field, distinct_error, count_error):
+        """
+        Collect statistics chunk by chunk, summarizing the values of each
+        chunk into a HyperLogLog and a Space-Saving sketch.
+        """
+
+        if isinstance(field, pd.Series):
+            field = columnar.column_values(field)
+
+        distinct = HyperLogLog(distinct_error)
+        frequent = SpaceSaving(count_error)
+        stats = StreamingStats()
+        count = 0
+        missing = 0
+        types = []
+        empty_mask = np.zeros(len(field), dtype=bool)
+
+        for start in range(0, len(field), FieldInfo.SKETCH_CHUNK_SIZE):
+            end = start + FieldInfo.SKETCH_CHUNK_SIZE
+            chunk_count, chunk_missing, value_map, chunk_types, chunk_mask = \
+                FieldInfo.collect(field[start:end])
+
+            count += chunk_count
+            missing += chunk_missing
+            empty_mask[start:end] = chunk_mask
+            for type_str in chunk_types:
+                if type_str not in types:
+                    types.append(type_str)
+            for val in value_map:
+                distinct.add(val)
+            frequent.update(value_map)
+            stats.update(value_map)
+
+        return (count, missing, frequent.top(), types, distinct.estimate(),
+                empty_mask, stats)
+
+    @staticmethod
+    def __sample(field, sample_size):
+        """
+        Collect statistics over the whole field, but infer types from a
+        reservoir sample of the non-empty values only.
+
+        Classification of the sample stops as soon as the types are settled.
+        Otherwise, the confidence is the rule-of-succession probability that
+        one more value has a type already seen in the sample.
+        """
+
+        if isinstance(field, list):
+            count, missing, value_map, _, empty_mask = FieldInfo.__traverse(
+                field, None)
+            nonempty = list(compress(field, np.logical_not(empty_mask)))
+        else:
+            values = arrow.arrow_values(field) if arrow.is_arrow_array(
+                field) else columnar.column_values(field)
+            if values.dtype.kind in columnar.NUMERIC_KINDS:
+                # Classified exactly per distinct value, at no extra cost.
+                return FieldInfo.collect(field) + (1.0, )
+            empty_mask, value_map, _ = columnar.analyze(values, None)
+            count, missing = len(values), int(empty_mask.sum())
+            nonempty = values[~empty_mask]
+
+        sample = Reservoir(sample_size,
+                           seed=FieldInfo.SAMPLE_SEED).extend(nonempty).sample
+
+        types = []
+        classified = set()
+        classify = FieldInfo.classifier()
+        for val in sample:
+            if columnar.types_settled(types):
+                break
+            key = (type(val), val)
+            if key in classified:
+                continue
+            classified.add(key)
+            type_str = classify(val)
+            if type_str not in types:
+                types.append(type_str)
+
+        if columnar.types_settled(types) or len(nonempty) <= sample_size:
+            confidence = 1.0
+        else:
+            confidence = (len(sample) + 1) / (len(sample) + 2)
+
+        return count, missing, value_map, types, empty_mask, confidence
+
+    @staticmethod
+    def __traverse(field, classify):
+        """
+        Analyze a list of values.
+
+        Values are grouped by ``(type, value)`` in one pass, so that
+        emptiness and meta type are checked once for each distinct value,
+        while keys of the value map follow dict semantics (e.g.
+        ``1 == 1.0``). Classification stops once the types are settled, and
+        is skipped if `classify` is None.
+        """
+
+        missing = 0
+        value_map = {}
+        types = []
+        empty_keys = set()
+
+        for key, cnt in Counter(zip(map(type, field), field)).items():
+            val = key[1]
+            if dwutil.is_empty_value(val):
+                missing += cnt
+                empty_keys.add(key)
+                continue
+            value_map[val] = value_map.get(val, 0) + cnt
+            if classify is None or columnar.types_settled(types):
+                continue
+            type_str = classify(val)
+            if type_str not in types:
+                types.append(type_str)
+
+        if missing:
+            empty_mask = np.fromiter(
+                ((type(val), val) in empty_keys for val in field),
+                dtype=bool,
+                count=len(field))
+        else:
+            empty_mask = np.zeros(len(field), dtype=bool)
+
+        return len(field), missing, value_map, types, empty_mask
+
+    @classmethod
+    def enable_type_cache(cls, maxsize=65536):
+        """
+        Share a process-wide LRU cache of `meta_type` results between all
+        fields, so that values repeated across fields are classified once.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of cached values.
+        """
+
+        cls.__type_cache = lru_cache(maxsize=maxsize,
+                                     typed=True)(FieldInfo.meta_type)
+
+    @classmethod
+    def disable_type_cache(cls):
+        """
+        Drop the process-wide cache of `meta_type` results.
+        """
+
+        cls.__type_cache = None
+
+    @classmethod
+    def type_cache_info(cls):
+        """
+        Return the statistics of the process-wide cache, or None if it is
+        disabled.
+        """
+
+        if cls.__type_cache is None:
+            return None
+        return cls.__type_cache.cache_info()
+
+    @classmethod
+    def classifier(cls):
+        """
+        Return a function that gives the meta type of a value of a field.
+
+        It is the process-wide cache if enabled, otherwise `meta_type` with
+        a date detector dedicated to the field.
+        """
+
+        if cls.__type_cache is not None:
+            return cls.__type_cache
+        return partial(cls.meta_type, date_detector=DateDetector())
 
     @staticmethod
-    def meta_type(value):
+    def meta_type(value, date_detector=None):
         """
         Return the 1st level inference for the type of a value.
+
+        Parameters
+        ----------
+        value : str, Number or None
+            Value to classify.
+        date_detector : DateDetector, optional
+            Detector that learns the date formats of the field the value
+            belongs to.
         """
 
         if dwutil.is_empty_value(value):
             return "empty"
 
-        if dwutil.is_date(value):
+        is_date = dwutil.is_date if date_detector is None \
+            else date_detector.is_date
+        if is_date(value):
             return "date"
 
         if isinstance(value, bool):
@@ -162,13 +457,39 @@ class FieldInfo:
 
         return self.__info
 
+    def empty_mask(self):
+        """
+        Return a boolean numpy.ndarray, `True` where the value is empty.
+
+        Empty values are kept as a packed bitmap, this unpacks it.
+        """
+
+        if self.__nulls is None:
+            return np.zeros(self.count, dtype=bool)
+        return np.unpackbits(self.__nulls, count=self.count).astype(bool)
+
     @property
     def data_list(self):
         """
         Return a copy of the field, replace all empty values with None.
+
+        The copy is built on each access from the field and the bitmap of
+        empty values, so prefer `empty_mask()` for repeated use.
         """
 
-        return self.__data_list
+        if isinstance(self.__field, list):
+            if self.__nulls is None:
+                return list(self.__field)
+            return [
+                None if empty else val
+                for val, empty in zip(self.__field, self.empty_mask().tolist())
+            ]
+
+        if arrow.is_arrow_array(self.__field):
+            values = arrow.arrow_values(self.__field)
+        else:
+            values = columnar.column_values(self.__field)
+        return columnar.masked_list(values, self.empty_mask())
 
     @property
     def count(self):
@@ -215,6 +536,27 @@ class FieldInfo:
 
         return self.__info["implied"]
 
+    @property
+    def confidence(self):
+        """
+        Confidence of `type` and `implied`, which is 1.0 unless they are
+        inferred from a sample.
+        """
+
+        return self.__info["confidence"]
+
+    @property
+    def stats(self):
+        """
+        Return statistics of the field according to its implied type.
+
+        Numeric fields have min, max, sum, mean, std, quantiles and a
+        histogram; date fields have min, max and granularity. Other fields
+        have none. In sketch mode, quantiles and histogram are estimated.
+        """
+
+        return self.__info["stats"]
+
     @property
     def missing(self):
         """
@@ -242,6 +584,8 @@ class FieldInfo:
     def valuemap(self):
         """
         Return a dict that records all non-empty values and their counts.
+
+        In sketch mode, only the most frequent values are recorded.
         """
 
         return self.__info["valuemap"]
@@ -251,4 +595,15 @@ class FieldInfo:
         Return the field with all empty-value filtered.
         """
 
-        return list(filter(lambda x: x is not None, self.__data_list))
+        if isinstance(self.__field, list):
+            if self.__nulls is None:
+                return list(self.__field)
+            return list(
+                compress(self.__field,
+                         np.logical_not(self.empty_mask()).tolist()))
+
+        if arrow.is_arrow_array(self.__field):
+            values = arrow.arrow_values(self.__field)
+        else:
+            values = columnar.column_values(self.__field)
+        return values[~self.empty_mask()].tolist()
@@ -0,0 +1,376 @@
+"""
+Bounded-memory sketches for analyzing fields with many distinct values.
+"""
+
+import math
+import heapq
+import random
+import hashlib
+
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+
+
+def value_hash(value):
+    """
+    Return a 64-bit hash of a value, stable across processes.
+
+    Values that are equal as dict keys (e.g. ``1``, ``1.0`` and ``True``)
+    get the same hash.
+    """
+
+    if isinstance(value, str):
+        digest = hashlib.blake2b(value.encode("utf-8", "surrogatepass"),
+                                 digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    # splitmix64 finalizer, spreads the bits of the builtin hash
+    x = (hash(value) + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog estimator for the number of distinct values.
+
+    Small cardinalities are counted exactly: hashes are kept in a set until
+    it reaches a quarter of the number of registers.
+
+    Parameters
+    ----------
+    error : float
+        Expected relative standard error of the estimate.
+    """
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 18
+
+    def __init__(self, error=0.01):
+        if not 0 < error < 1:
+            raise ValueError("Argument error must be in (0, 1).")
+
+        precision = math.ceil(math.log2((1.04 / error)**2))
+        self.precision = min(max(precision, self.MIN_PRECISION),
+                             self.MAX_PRECISION)
+        self.size = 1 << self.precision
+        self.sparse = set()
+        self.registers = None
+
+    def add(self, value):
+        """
+        Add a value to the sketch.
+        """
+
+        self.add_hash(value_hash(value))
+
+    def add_hash(self, hashed):
+        """
+        Add a value by its `value_hash`.
+        """
+
+        if self.registers is None:
+            self.sparse.add(hashed)
+            if len(self.sparse) > self.size // 4:
+                self.__densify()
+            return
+
+        width = 64 - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def __densify(self):
+        self.registers = bytearray(self.size)
+        sparse, self.sparse = self.sparse, set()
+        for hashed in sparse:
+            self.add_hash(hashed)
+
+    def merge(self, other):
+        """
+        Merge another sketch of the same precision into this one.
+        """
+
+        if other.precision != self.precision:
+            raise ValueError("Sketches must have the same precision.")
+
+        if other.registers is None:
+            for hashed in other.sparse:
+                self.add_hash(hashed)
+            return self
+
+        if self.registers is None:
+            self.__densify()
+        self.registers = bytearray(
+            map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self):
+        """
+        Return the estimated number of distinct values.
+        """
+
+        if self.registers is None:
+            return len(self.sparse)
+
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent values.
+
+    Keeps at most ``ceil(1 / error)`` counters. The count of a kept value is
+    overestimated by at most ``error`` times the total count, and every
+    value whose frequency is above that bound is kept.
+
+    Parameters
+    ----------
+    error : float
+        Bound of the count error, relative to the total count.
+    """
+
+    def __init__(self, error=0.001):
+        if not 0 < error < 1:
+            raise ValueError("Argument error must be in (0, 1).")
+
+        self.capacity = math.ceil(1 / error)
+        self.counts = {}
+        self.total = 0
+
+    def __floor(self):
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def __combine(self, counts, floor, total):
+        """
+        Combine with a summary whose unkept values count at most `floor`.
+        """
+
+        own_floor = self.__floor()
+        combined = {}
+        for val, cnt in self.counts.items():
+            combined[val] = cnt + counts.get(val, floor)
+        for val, cnt in counts.items():
+            if val not in combined:
+                combined[val] = cnt + own_floor
+
+        if len(combined) > self.capacity:
+            combined = dict(
+                heapq.nlargest(self.capacity,
+                               combined.items(),
+                               key=lambda item: item[1]))
+        self.counts = combined
+        self.total += total
+        return self
+
+    def update(self, value_map):
+        """
+        Add values with their counts, given as a dict.
+        """
+
+        return self.__combine(value_map, 0, sum(value_map.values()))
+
+    def merge(self, other):
+        """
+        Merge another summary into this one.
+        """
+
+        return self.__combine(other.counts, other.__floor(), other.total)
+
+    def top(self, k=None):
+        """
+        Return a dict of the `k` most frequent values and their estimated
+        counts, in descending order of count.
+        """
+
+        items = sorted(self.counts.items(),
+                       key=lambda item: item[1],
+                       reverse=True)
+        return dict(items[:k])
+
+
+class Reservoir:
+    """
+    Uniform random sample of fixed size over a stream of sequences.
+
+    Uses Algorithm L, which jumps directly to the next sampled position, so
+    the cost grows with the sample size rather than with the stream length.
+
+    Parameters
+    ----------
+    size : int
+        Size of the sample.
+    seed : int, optional
+        Seed of the random generator, for a reproducible sample.
+    """
+
+    def __init__(self, size, seed=None):
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("Argument size must be a positive integer.")
+
+        self.size = size
+        self.sample = []
+        self.seen = 0
+        self.__rng = random.Random(seed)
+        self.__weight = 1.0
+        self.__skip = 0
+
+    def __uniform(self):
+        value = self.__rng.random()
+        while value == 0.0:
+            value = self.__rng.random()
+        return value
+
+    def __next_skip(self):
+        self.__weight *= math.exp(math.log(self.__uniform()) / self.size)
+        self.__skip = int(
+            math.log(self.__uniform()) / math.log(1 - self.__weight))
+
+    def extend(self, values):
+        """
+        Offer the values of a sequence to the sample.
+        """
+
+        length = len(values)
+        pos = 0
+
+        if len(self.sample) < self.size:
+            pos = min(self.size - len(self.sample), length)
+            self.sample.extend(values[:pos])
+            if len(self.sample) < self.size:
+                self.seen += length
+                return self
+            self.__next_skip()
+
+        pos += self.__skip
+        while pos < length:
+            self.sample[self.__rng.randrange(self.size)] = values[pos]
+            self.__next_skip()
+            pos += self.__skip + 1
+
+        self.__skip = pos - length
+        self.seen += length
+        return self
+
+
+class KLL:
+    """
+    KLL sketch of the distribution of numbers, for streaming quantiles.
+
+    Items of level ``h`` stand for ``2 ** h`` values. A level that exceeds
+    its capacity is sorted and every other item is promoted to the next
+    level, starting at a random offset. The rank error is about
+    ``1.7 / k`` with high probability.
+
+    Parameters
+    ----------
+    k : int
+        Capacity of the top level, trading memory for accuracy.
+    seed : int, optional
+        Seed of the random generator, for reproducible compactions.
+    """
+
+    def __init__(self, k=200, seed=None):
+        if not isinstance(k, int) or k < 8:
+            raise ValueError("Argument k must be an integer of at least 8.")
+
+        self.k = k
+        self.levels = [[]]
+        self.total = 0
+        self.__rng = random.Random(seed)
+
+    def __capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3)**depth)), 2)
+
+    def update(self, value, weight=1):
+        """
+        Add `value` with an integer `weight`.
+        """
+
+        self.total += weight
+        level = 0
+        while weight:
+            if weight & 1:
+                while len(self.levels) <= level:
+                    self.levels.append([])
+                self.levels[level].append(value)
+            weight >>= 1
+            level += 1
+        self.__compress()
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+        """
+
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.total += other.total
+        self.__compress()
+        return self
+
+    def __compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.__capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                offset = self.__rng.randrange(2)
+                # An odd item out stays at its level.
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = keep
+            level += 1
+
+    def weighted_items(self):
+        """
+        Return sorted values and their weights, as numpy arrays.
+        """
+
+        values = []
+        weights = []
+        for level, items in enumerate(self.levels):
+            values.extend(items)
+            weights.extend([1 << level] * len(items))
+        order = np.argsort(values, kind="stable")
+        return np.asarray(values, dtype=float)[order], np.asarray(
+            weights, dtype=float)[order]
+
+    def quantile(self, q):
+        """
+        Return the estimated `q`-quantile, for `q` in [0, 1].
+        """
+
+        values, weights = self.weighted_items()
+        if len(values) == 0:
+            raise ValueError("The sketch is empty.")
+        cum = np.cumsum(weights)
+        idx = np.searchsorted(cum, q * cum[-1], side="left")
+        return float(values[min(idx, len(values) - 1)])
+
+    def cdf(self, points):
+        """
+        Return the estimated number of values less than or equal to each of
+        `points`.
+        """
+
+        values, weights = self.weighted_items()
+        cum = np.concatenate(([0.0], np.cumsum(weights)))
+        return cum[np.searchsorted(values, points, side="right")]
@@ -0,0 +1,250 @@
+"""
+Statistics of numeric and date fields.
+
+Statistics are computed from the value map of a field, i.e. once for each
+distinct value weighted by its count, so that they come with the traversal
+that builds it instead of another pass over the data.
+"""
+
+import math
+
+import numpy as np
+
+from AVAPy.data_wizard.utils.dateinfer import parse_date
+from AVAPy.data_wizard.analyzer.sketch import KLL
+
+NUMERIC_TYPES = ("integer", "float")
+QUANTILES = (0.25, 0.5, 0.75)
+HISTOGRAM_BINS = 10
+UNITS = ("day", "month", "year")
+
+
+def weighted_quantile(values, cum_counts, q):
+    """
+    Return the `q`-quantile of sorted `values` repeated by their counts,
+    with linear interpolation like ``pandas.Series.quantile``.
+    """
+
+    pos = q * (cum_counts[-1] - 1)
+    low, high = math.floor(pos), math.ceil(pos)
+    value_low = values[np.searchsorted(cum_counts, low, side="right")]
+    value_high = values[np.searchsorted(cum_counts, high, side="right")]
+    return float(value_low + (value_high - value_low) * (pos - low))
+
+
+def numeric_stats(value_map):
+    """
+    Return min, max, sum, mean, std (population), quantiles and a histogram
+    of a numeric field given by its value map.
+
+    Min and max include infinite values; the other statistics are computed
+    over the finite values only, and left out if there are none.
+    """
+
+    values = np.array([float(val) for val in value_map])
+    counts = np.array(list(value_map.values()), dtype=float)
+    valid = ~np.isnan(values)
+    values, counts = values[valid], counts[valid]
+    if len(values) == 0:
+        return {}
+    bounds = {"min": float(values.min()), "max": float(values.max())}
+
+    finite = np.isfinite(values)
+    values, counts = values[finite], counts[finite]
+    if len(values) == 0:
+        return bounds
+    order = np.argsort(values, kind="stable")
+    values, counts = values[order], counts[order]
+
+    total = float(counts.sum())
+    value_sum = float(np.dot(values, counts))
+    mean = value_sum / total
+    std = math.sqrt(float(np.dot((values - mean)**2, counts)) / total)
+    cum_counts = np.cumsum(counts)
+    hist, edges = np.histogram(values, bins=HISTOGRAM_BINS, weights=counts)
+
+    return {
+        **bounds,
+        "sum": value_sum,
+        "mean": mean,
+        "std": std,
+        "quantiles": {
+            q: weighted_quantile(values, cum_counts, q)
+            for q in QUANTILES
+        },
+        "histogram": {
+            "counts": hist.astype(int).tolist(),
+            "edges": edges.tolist()
+        },
+    }
+
+
+def date_stats(value_map):
+    """
+    Return min, max and granularity of a date field given by its value map.
+
+    The granularity is the finest unit ("day", "month" or "year") among the
+    formats of the dates.
+    """
+
+    parsed = [parse_date(val) for val in value_map]
+    parsed = [item for item in parsed if item is not None]
+    if not parsed:
+        return {}
+
+    dates = [date for date, _ in parsed]
+    units = {unit for _, unit in parsed}
+    return {
+        "min": min(dates),
+        "max": max(dates),
+        "granularity": next(unit for unit in UNITS if unit in units),
+    }
+
+
+def field_stats(value_map, implied_type):
+    """
+    Return the statistics of a field according to its implied type.
+    """
+
+    if not value_map:
+        return {}
+    if implied_type in NUMERIC_TYPES:
+        return numeric_stats(value_map)
+    if implied_type == "date":
+        return date_stats(value_map)
+    return {}
+
+
+class StreamingStats:
+    """
+    Statistics accumulated from the value maps of successive chunks, in
+    bounded memory.
+
+    Moments are merged exactly; quantiles and the histogram come from a KLL
+    sketch. Numbers and dates are both tracked, since the implied type is
+    only known at the end.
+
+    Parameters
+    ----------
+    k : int
+        Size of the KLL sketch.
+    """
+
+    def __init__(self, k=200):
+        # Statistics of the finite values, and infinities seen.
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.kll = KLL(k, seed=0)
+        self.infinities = set()
+        self.dates = {}
+
+    def update(self, value_map):
+        """
+        Accumulate the value map of a chunk.
+        """
+
+        numbers = []
+        counts = []
+        for val, cnt in value_map.items():
+            if isinstance(val, bool):
+                continue
+            parsed = parse_date(val)
+            if parsed is not None:
+                date, unit = parsed
+                self.__add_date(date, date, unit)
+            try:
+                number = float(val)
+            except (TypeError, ValueError):
+                continue
+            if math.isinf(number):
+                self.infinities.add(number)
+            if not math.isfinite(number):
+                continue
+            numbers.append(number)
+            counts.append(cnt)
+            self.kll.update(number, cnt)
+
+        if numbers:
+            values = np.array(numbers)
+            weights = np.array(counts, dtype=float)
+            total = float(weights.sum())
+            mean = float(np.dot(values, weights)) / total
+            m2 = float(np.dot((values - mean)**2, weights))
+            self.__add_moments(total, mean, m2, float(values.min()),
+                               float(values.max()))
+        return self
+
+    def __add_moments(self, count, mean, m2, low, high):
+        # Chan et al. parallel combination of moments
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.mean += delta * count / total
+        self.sum += mean * count
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def __add_date(self, low, high, unit):
+        if not self.dates:
+            self.dates = {"min": low, "max": high, "granularity": unit}
+            return
+        self.dates["min"] = min(self.dates["min"], low)
+        self.dates["max"] = max(self.dates["max"], high)
+        if UNITS.index(unit) < UNITS.index(self.dates["granularity"]):
+            self.dates["granularity"] = unit
+
+    def merge(self, other):
+        """
+        Merge statistics accumulated by another instance.
+        """
+
+        if other.count:
+            self.__add_moments(other.count, other.mean, other.m2, other.min,
+                               other.max)
+            self.kll.merge(other.kll)
+        self.infinities |= other.infinities
+        if other.dates:
+            self.__add_date(other.dates["min"], other.dates["max"],
+                            other.dates["granularity"])
+        return self
+
+    def result(self, implied_type):
+        """
+        Return the statistics of the field according to its implied type.
+        """
+
+        if implied_type in NUMERIC_TYPES and (self.count or self.infinities):
+            bounds = {
+                "min": min([self.min, *self.infinities]),
+                "max": max([self.max, *self.infinities])
+            }
+            if not self.count:
+                return bounds
+            low, high = self.min, self.max
+            if low == high:
+                # Range of a constant field, as chosen by ``np.histogram``.
+                low, high = low - 0.5, high + 0.5
+            edges = np.linspace(low, high, HISTOGRAM_BINS + 1)
+            cdf = self.kll.cdf(edges)
+            cdf[0] = 0.0
+            cdf[-1] = self.kll.total
+            return {
+                **bounds,
+                "sum": self.sum,
+                "mean": self.mean,
+                "std": math.sqrt(self.m2 / self.count),
+                "quantiles": {q: self.kll.quantile(q)
+                              for q in QUANTILES},
+                "histogram": {
+                    "counts": np.rint(np.diff(cdf)).astype(int).tolist(),
+                    "edges": edges.tolist()
+                },
+            }
+        if implied_type == "date":
+            return dict(self.dates)
+        return {}
@@ -0,0 +1,268 @@
+"""
+Content-addressed cache of parsed datasets and their profiles on disk.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+import pandas as pd
+
+from AVAPy.data_wizard.analyzer import arrow
+from AVAPy.data_wizard.analyzer.dfinfo import profile
+from AVAPy.data_wizard.reader.parser import json2df
+
+# Bumped when the stored entries change, so that old ones are not read.
+CACHE_VERSION = 1
+HASH_BLOCKSIZE = 1 << 20
+
+
+class DatasetCache:
+    """
+    Opt-in cache of the DataFrames read from some input and of their
+    profiles, stored in a local directory.
+
+    Entries are keyed by a BLAKE2 hash of the input bytes, the reader and
+    its options, so that the same content read the same way is parsed and
+    profiled once. DataFrames are stored in Feather format when ``pyarrow``
+    is installed, unless they hold nested values, and pickled otherwise;
+    profiles are pickled. The least recently used entries are removed once
+    the directory grows past `max_bytes`.
+
+    Parameters
+    ----------
+    directory : str or os.PathLike
+        Directory of the cache, created if needed. Only trusted directories
+        should be used, since entries are unpickled.
+    max_bytes : int
+        Maximum total size of the entries.
+
+    Examples
+    --------
+    >>> cache = DatasetCache("/tmp/avapy-cache")  # doctest: +SKIP
+    >>> df = cache.read('[{"a": 1}, {"a": 2},]')  # doctest: +SKIP
+    >>> infos = cache.profile('[{"a": 1}, {"a": 2},]')  # doctest: +SKIP
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("Argument max_bytes must be a positive integer.")
+
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(data, reader=json2df, **options):
+        """
+        Return the hex digest of the input `data` read by `reader` with
+        `options`.
+
+        Parameters
+        ----------
+        data : str, bytes or os.PathLike
+            Input given as text or bytes, or as a path whose content is
+            hashed. A str naming an existing file is taken as its path.
+        reader : callable
+            Function that reads `data`, identified by its qualified name.
+        **options
+            Options of `reader`, identified by their JSON representation.
+            Functions are identified by their qualified name.
+
+        Raises
+        ------
+        TypeError
+            If an option is neither JSON-serializable nor a module-level
+            function.
+        """
+
+        digest = hashlib.blake2b(digest_size=20)
+        header = [
+            CACHE_VERSION, reader.__module__, reader.__qualname__,
+            json.dumps(options, sort_keys=True, default=_option_key)
+        ]
+        digest.update(json.dumps(header).encode())
+        if isinstance(data, str) and not os.path.isfile(data):
+            digest.update(data.encode())
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            digest.update(data)
+        elif isinstance(data, (str, os.PathLike)):
+            with open(data, "rb") as file:
+                for block in iter(lambda: file.read(HASH_BLOCKSIZE), b""):
+                    digest.update(block)
+        else:
+            raise TypeError("Argument data must be a str, bytes or "
+                            "os.PathLike.")
+        return digest.hexdigest()
+
+    def read(self, data, reader=json2df, **options):
+        """
+        Return ``reader(data, **options)``, from the cache if the same
+        content was read the same way before.
+
+        Returns
+        -------
+        DataFrame
+        """
+
+        key = self.key(data, reader, **options)
+        df = self.__load_frame(key)
+        if df is None:
+            df = reader(data, **options)
+            self.__store(key, ".frame", df)
+        return df
+
+    def profile(self, data, reader=json2df, **options):
+        """
+        Return the profile of ``reader(data, **options)``, as given by
+        `profile`. On a hit, the data is neither parsed nor profiled.
+
+        Returns
+        -------
+        dict
+            Maps each column name to its `FieldInfo.info`.
+        """
+
+        key = self.key(data, reader, **options)
+        infos = self.__load(key, ".profile")
+        if infos is None:
+            infos = profile(self.read(data, reader, **options))
+            self.__store(key, ".profile", infos)
+        return infos
+
+    @property
+    def size(self):
+        """
+        Return the total size of the entries in bytes.
+        """
+
+        return sum(size for _, size, _ in self.__entries())
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+
+        for path, _, _ in self.__entries():
+            self.__remove(path)
+
+    def __path(self, key, kind):
+        return os.path.join(self.directory, key + kind)
+
+    def __load_frame(self, key):
+        path = self.__path(key, ".frame")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            is_feather = file.read(6) == b"ARROW1"
+        if is_feather:
+            df = pd.read_feather(path)
+            self.__touch(path)
+            return df
+        return self.__load(key, ".frame")
+
+    def __load(self, key, kind):
+        path = self.__path(key, kind)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        self.__touch(path)
+        return value
+
+    def __store(self, key, kind, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                if not self.__write_feather(value, file):
+                    pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.__path(key, kind))
+        except BaseException:
+            self.__remove(tmp)
+            raise
+        self.__evict()
+
+    @staticmethod
+    def __write_feather(value, file):
+        if not arrow.HAS_ARROW or not isinstance(value, pd.DataFrame):
+            return False
+        if _has_nested(value):
+            # Feather would read lists back as arrays, and dicts as dicts
+            # with the keys of all of them.
+            return False
+        try:
+            value.to_feather(file)
+        except (ValueError, TypeError, arrow.pa.ArrowException):
+            # e.g. an index or column names that Feather can not store.
+            file.seek(0)
+            file.truncate()
+            return False
+        return True
+
+    @staticmethod
+    def __touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def __remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __entries(self):
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith((".frame", ".profile")):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append(
+                        (entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def __evict(self):
+        """
+        Remove the least recently used entries until the cache fits in
+        `max_bytes`.
+        """
+
+        entries = sorted(self.__entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self.__remove(path)
+            total -= size
+
+
+def _has_nested(df):
+    """
+    Whether an object column of `df` holds lists, dicts or other
+    containers.
+    """
+
+    return any(
+        df.iloc[:, idx].map(pd.api.types.is_list_like).any()
+        for idx, dtype in enumerate(df.dtypes) if dtype == object)
+
+
+def _option_key(value):
+    """
+    Return a representation of an option that JSON can not serialize,
+    stable between runs.
+    """
+
+    name = getattr(value, "__qualname__", "")
+    if callable(value) and name and "<" not in name:
+        return f"{value.__module__}.{name}"
+    raise TypeError(f"Option {value!r} must be JSON-serializable or a "
+                    "module-level function.")
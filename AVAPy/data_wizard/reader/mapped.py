@@ -0,0 +1,320 @@
+"""
+Readers of large local files through memory maps.
+
+Line boundaries are found in the mapped file, without reading it into
+memory, so that disjoint byte ranges of the same file can be parsed by
+separate workers. Records must not contain line breaks, e.g. in quoted CSV
+fields.
+"""
+
+import io
+import os
+import mmap
+import itertools
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from AVAPy.data_wizard.analyzer.accumulator import RecordAccumulator
+from AVAPy.data_wizard.analyzer.dfinfo import EXECUTORS
+from AVAPy.data_wizard.reader.parser import (DEFAULT_CHUNKSIZE, NA_VALUES,
+                                             iter_json_records,
+                                             mask_empty_strings)
+
+FORMATS = ("csv", "jsonl")
+
+
+@contextmanager
+def open_map(path):
+    """
+    Map a file into memory for reading. An empty file gives empty bytes,
+    since it can not be mapped.
+    """
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+class MappedRange(io.RawIOBase):
+    """
+    Binary stream over a byte range of a memory map, which is read in place
+    instead of being copied as a whole.
+    """
+
+    def __init__(self, mapped, start, end):
+        super().__init__()
+        self.mapped = mapped
+        self.pos = start
+        self.end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = max(min(len(buffer), self.end - self.pos), 0)
+        buffer[:size] = self.mapped[self.pos:self.pos + size]
+        self.pos += size
+        return size
+
+
+def line_ranges(path, parts, skip_header=False):
+    """
+    Split a file into at most `parts` byte ranges of about the same size,
+    each made of whole lines.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File to split.
+    parts : int
+        Number of ranges wanted.
+    skip_header : bool
+        Whether to leave the first line out of the ranges.
+
+    Returns
+    -------
+    list of tuple
+        Start and end offsets of the ranges, in order.
+
+    Examples
+    --------
+    >>> line_ranges("data.csv", 2, skip_header=True)  # doctest: +SKIP
+    [(4, 12), (12, 20)]
+    """
+
+    if not isinstance(parts, int) or parts <= 0:
+        raise ValueError("Argument parts must be a positive integer.")
+
+    with open_map(path) as mapped:
+        size = len(mapped)
+        start = 0
+        if skip_header:
+            start = mapped.find(b"\n") + 1 or size
+
+        bounds = [start]
+        for part in range(1, parts):
+            newline = mapped.find(b"\n",
+                                  start + (size - start) * part // parts)
+            if newline < 0:
+                break
+            if bounds[-1] < newline + 1 < size:
+                bounds.append(newline + 1)
+        if start < size:
+            bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def csv_header(path, **kwargs):
+    """
+    Return the column names of a CSV file.
+    """
+
+    return pd.read_csv(path, nrows=0, **kwargs).columns.tolist()
+
+
+def read_range(path, fmt, start, end, names=None, columns=None, **kwargs):
+    """
+    Read the lines of a byte range of a file as DataFrame chunks.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        CSV or JSON Lines file.
+    fmt : {"csv", "jsonl"}
+        Format of the file.
+    start, end : int
+        Byte range, as given by `line_ranges`.
+    names : list of str, optional
+        Column names of a CSV file, whose header is not in the range.
+    columns : list of str, optional
+        Columns to keep, all by default.
+    **kwargs
+        Other arguments of ``pandas.read_csv``, for CSV.
+
+    Yields
+    ------
+    DataFrame
+        Chunks of at most ``DEFAULT_CHUNKSIZE`` rows.
+    """
+
+    with open_map(path) as mapped:
+        stream = io.BufferedReader(MappedRange(mapped, start, end))
+        if fmt == "csv":
+            with pd.read_csv(stream,
+                             header=None,
+                             names=names,
+                             usecols=columns,
+                             chunksize=DEFAULT_CHUNKSIZE,
+                             na_values=NA_VALUES,
+                             keep_default_na=False,
+                             **kwargs) as reader:
+                yield from reader
+            return
+
+        batch = []
+        for record in iter_json_records(stream, lines=True):
+            batch.append(record)
+            if len(batch) == DEFAULT_CHUNKSIZE:
+                yield mask_empty_strings(pd.DataFrame(batch, columns=columns))
+                batch = []
+        if batch:
+            yield mask_empty_strings(pd.DataFrame(batch, columns=columns))
+
+
+def range2df(path, fmt, start, end, names=None, columns=None, **kwargs):
+    """
+    Read a byte range of a file as a DataFrame, see `read_range`.
+    """
+
+    chunks = list(read_range(path, fmt, start, end, names, columns, **kwargs))
+    if not chunks:
+        return pd.DataFrame(columns=columns or names)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def profile_range(path, fmt, start, end, names=None, columns=None, **kwargs):
+    """
+    Count the values of a byte range of a file, see `read_range`.
+
+    The values are counted as by `profile_csv` and `profile_json`: CSV
+    lines are parsed with nullable dtypes, so that an integer column with
+    missing cells is counted as integers, and JSON records are counted as
+    decoded.
+
+    Returns
+    -------
+    RecordAccumulator
+    """
+
+    acc = RecordAccumulator()
+    if fmt == "jsonl":
+        with open_map(path) as mapped:
+            stream = io.BufferedReader(MappedRange(mapped, start, end))
+            records = iter_json_records(stream, lines=True)
+            while True:
+                batch = list(itertools.islice(records, DEFAULT_CHUNKSIZE))
+                if not batch:
+                    break
+                if columns is not None:
+                    batch = [{
+                        name: record[name]
+                        for name in columns if name in record
+                    } for record in batch]
+                acc.add_records(batch)
+        return acc
+
+    if not {"dtype", "dtype_backend"} & set(kwargs):
+        kwargs["dtype_backend"] = "numpy_nullable"
+    for chunk in read_range(path, fmt, start, end, names, columns, **kwargs):
+        acc.add_frame(chunk)
+    return acc
+
+
+def _map_ranges(func, path, fmt, executor, max_workers, columns, kwargs):
+    if fmt not in FORMATS:
+        raise ValueError(f"Argument fmt must be one of {FORMATS}.")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Argument executor must be one of {EXECUTORS}.")
+
+    names = csv_header(path, **kwargs) if fmt == "csv" else None
+    parts = max_workers or os.cpu_count() or 1
+    ranges = line_ranges(path, parts, skip_header=fmt == "csv")
+
+    pool_class = ThreadPoolExecutor if executor == "thread" \
+        else ProcessPoolExecutor
+    with pool_class(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(func, path, fmt, start, end, names, columns, **kwargs)
+            for start, end in ranges
+        ]
+        return names, [future.result() for future in futures]
+
+
+def mapped2df(path,
+              fmt="csv",
+              executor="process",
+              max_workers=None,
+              columns=None,
+              **kwargs):
+    """
+    Read a CSV or JSON Lines file by parsing disjoint byte ranges of its
+    memory map in parallel.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File to read, with no line break inside records.
+    fmt : {"csv", "jsonl"}
+        Format of the file.
+    executor : {"thread", "process"}
+        Kind of pool that parses the ranges.
+    max_workers : int, optional
+        Size of the pool and number of ranges, defaults to the number of
+        processors.
+    columns : list of str, optional
+        Columns to read, all by default.
+    **kwargs
+        Other arguments of ``pandas.read_csv``, for CSV.
+
+    Returns
+    -------
+    DataFrame
+        Rows in file order. Strings regarded as empty by `is_empty_value`
+        are missing values, as with `csv2df` and `jsonl2df`.
+    """
+
+    names, frames = _map_ranges(range2df, path, fmt, executor, max_workers,
+                                columns, kwargs)
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=columns or names)
+    return pd.concat(frames, ignore_index=True)
+
+
+def profile_mapped(path,
+                   fmt="csv",
+                   executor="process",
+                   max_workers=None,
+                   columns=None,
+                   **kwargs):
+    """
+    Profile the columns of a CSV or JSON Lines file, with disjoint byte
+    ranges of its memory map counted in parallel and merged in order.
+
+    Takes the arguments of `mapped2df`.
+
+    Returns
+    -------
+    dict
+        Maps each column name to its `FieldInfo.info` with meta type votes,
+        as ``RecordAccumulator.info``.
+    """
+
+    _, accs = _map_ranges(profile_range, path, fmt, executor, max_workers,
+                          columns, kwargs)
+    total = RecordAccumulator()
+    for acc in accs:
+        total.merge(acc)
+    return total.info
+
+
+def feather2df(path, columns=None, memory_map=True):
+    """
+    Read an Arrow IPC (Feather) file as a DataFrame.
+
+    Requires ``pyarrow``. With `memory_map`, the file is mapped instead of
+    read, so that only the selected columns are loaded.
+    """
+
+    try:
+        import pyarrow.feather as feather  # pylint: disable=C0415
+    except ImportError as error:
+        raise ImportError("feather2df requires pyarrow.") from error
+
+    table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    return mask_empty_strings(table.to_pandas())
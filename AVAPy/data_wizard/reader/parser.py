@@ -2,8 +2,33 @@
 Dataset parser functions.
 """
 
+import io
+import codecs
+import itertools
+import json as jsonlib
+
+import numpy as np
 import pandas as pd
 import AVAPy.data_wizard.utils as dwutil
+from AVAPy.data_wizard.utils.json import LenientJSONScanner
+from AVAPy.data_wizard.utils.typeinfer import EMPTY_STRINGS
+from AVAPy.data_wizard.analyzer import arrow
+from AVAPy.data_wizard.analyzer.accumulator import RecordAccumulator
+
+JSON_SPACES = " \t\n\r"
+# Decoding errors this close to the end of the text read so far may be due
+# to a record cut by the end of the block, e.g. in "-Infinit".
+JSON_CUT_MARGIN = 16
+
+# Strings regarded as empty by `is_empty_value`, in every letter case.
+NA_VALUES = frozenset([""] + [
+    "".join(chars) for word in EMPTY_STRINGS
+    for chars in itertools.product(*({c.lower(), c.upper()} for c in word))
+])
+
+DEFAULT_CHUNKSIZE = 10000
+
+BACKENDS = ("pandas", "arrow")
 
 
 def json2df(json):
@@ -12,4 +37,644 @@ def json2df(json):
     """
 
     clean_json = dwutil.remove_trailing_commas(json)
-    return pd.read_json(clean_json, orient='records')
+    return pd.read_json(io.StringIO(clean_json), orient='records')
+
+
+def iter_json_records(source, lines=None, blocksize=1 << 20):
+    """
+    Yield the records of a JSON document one by one, reading it in blocks.
+
+    Trailing commas are removed while the blocks are read, so memory is
+    bounded by the block size and the largest record instead of the size
+    of the document.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or binary file object
+        Path of the document, or a stream opened in binary mode. The text
+        is decoded as UTF-8, with an optional BOM.
+    lines : bool, optional
+        Whether the document is JSON Lines (one object per line) rather
+        than an array of objects. Detected from the first character if
+        None.
+    blocksize : int
+        Number of bytes read at a time.
+
+    Raises
+    ------
+    ValueError
+      * If the document is not valid JSON, or a record is not an object.
+        The error is raised as soon as the invalid record is read, with its
+        position in the document, not counting removed trailing commas.
+    """
+
+    if not isinstance(blocksize, int) or blocksize <= 0:
+        raise ValueError("Argument blocksize must be a positive integer.")
+
+    if hasattr(source, "read"):
+        yield from _stream_records(source, lines, blocksize)
+        return
+    with open(source, "rb") as stream:
+        yield from _stream_records(stream, lines, blocksize)
+
+
+def _stream_records(stream, lines, blocksize):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    remover = LenientJSONScanner()
+    parser = jsonlib.JSONDecoder()
+    buffer = ""
+    pos = 0
+    # Number of characters dropped from the start of the buffer.
+    offset = 0
+    opened = False
+    eof = False
+    size = blocksize
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in JSON_SPACES:
+            pos += 1
+
+        record = None
+        if pos < len(buffer):
+            char = buffer[pos]
+            if lines is None:
+                lines = char != "["
+            if not lines and not opened:
+                if char != "[":
+                    raise ValueError("Invalid JSON: the document is not an "
+                                     "array of records.")
+                opened = True
+                pos += 1
+                continue
+            if not lines and char == ",":
+                pos += 1
+                continue
+            if not lines and char == "]":
+                return
+            try:
+                record, pos = parser.raw_decode(buffer, pos)
+            except jsonlib.JSONDecodeError as error:
+                if eof or not _maybe_cut(error, len(buffer)):
+                    raise ValueError(f"Invalid JSON: {error.msg} at character "
+                                     f"{offset + error.pos}.") from error
+                # Read more at once while a record does not fit, so that
+                # large records are not decoded over and over.
+                size *= 2
+        elif eof:
+            break
+
+        if record is not None:
+            if not isinstance(record, dict):
+                raise ValueError(
+                    "Records of the JSON document must be objects.")
+            size = blocksize
+            yield record
+            continue
+
+        block = stream.read(size)
+        eof = not block
+        text = remover.feed(decoder.decode(block, final=eof))
+        if eof:
+            text += remover.flush()
+        buffer = buffer[pos:] + text
+        offset += pos
+        pos = 0
+
+    if lines is False:
+        raise ValueError("Invalid JSON: the array is not closed.")
+
+
+def _maybe_cut(error, length):
+    """
+    Whether a decoding error may be due to the end of the text, of `length`
+    characters, rather than to invalid JSON.
+    """
+
+    return (error.msg.startswith("Unterminated string")
+            or error.pos >= length - JSON_CUT_MARGIN)
+
+
+def json2chunks(source, chunksize=10000, lines=None, blocksize=1 << 20):
+    """
+    Read a JSON document as DataFrame chunks, without loading it whole.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or binary file object
+        Path of an array of records or of a JSON Lines file, or a stream
+        opened in binary mode.
+    chunksize : int
+        Number of records in each chunk, the last one may be shorter.
+    lines : bool, optional
+        Whether the document is JSON Lines. Detected if None.
+    blocksize : int
+        Number of bytes read at a time.
+
+    Yields
+    ------
+    DataFrame
+        Successive chunks of records. Column dtypes are inferred per chunk.
+
+    See Also
+    --------
+    AVAPy.data_wizard.analyzer.dfinfo.profile_chunks : Profile the chunks.
+
+    Examples
+    --------
+    >>> from io import BytesIO
+    >>> doc = BytesIO(b'[{"a": 1}, {"a": 2}, {"a": 3},]')
+    >>> [len(chunk) for chunk in json2chunks(doc, chunksize=2)]
+    [2, 1]
+    """
+
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError("Argument chunksize must be a positive integer.")
+
+    records = []
+    for record in iter_json_records(source, lines=lines, blocksize=blocksize):
+        records.append(record)
+        if len(records) == chunksize:
+            yield pd.DataFrame(records)
+            records = []
+    if records:
+        yield pd.DataFrame(records)
+
+
+def mask_empty_strings(df):
+    """
+    Replace the strings of `df` that `is_empty_value` regards as empty
+    (e.g. "", "null", "NaN", "-") by missing values, in place for a
+    DataFrame. An Arrow table, which is immutable, is returned as a new
+    table.
+    """
+
+    if arrow.is_arrow_table(df):
+        return _mask_empty_arrow(df)
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.StringDtype):
+            empty = values.isin(NA_VALUES)
+        elif values.dtype == object:
+            empty = values.map(
+                lambda val: isinstance(val, str) and val in NA_VALUES)
+        else:
+            continue
+        if empty.any():
+            df[col] = values.mask(empty)
+    return df
+
+
+def _mask_empty_arrow(table):
+    na_values = arrow.pa.array(sorted(NA_VALUES))
+    for idx, field in enumerate(table.schema):
+        if not arrow.pa.types.is_string(field.type):
+            continue
+        values = table.column(idx)
+        empty = arrow.pc.is_in(values, value_set=na_values)
+        if arrow.pc.any(empty).as_py():
+            table = table.set_column(
+                idx, field, arrow.pc.if_else(empty, None, values))
+    return table
+
+
+def _check_read_options(columns, nrows, sample, chunksize, backend="pandas"):
+    if columns is not None and (isinstance(columns, str)
+                                or not all(isinstance(col, str)
+                                           for col in columns)):
+        raise TypeError("Argument columns must be a list of column names.")
+    if nrows is not None and (not isinstance(nrows, int) or nrows < 0):
+        raise ValueError("Argument nrows must be a non-negative integer.")
+    if sample is not None and not 0 < sample <= 1:
+        raise ValueError("Argument sample must be in (0, 1].")
+    if chunksize is not None and (not isinstance(chunksize, int)
+                                  or chunksize <= 0):
+        raise ValueError("Argument chunksize must be a positive integer.")
+    if backend not in BACKENDS:
+        raise ValueError(f"Argument backend must be one of {BACKENDS}.")
+    if backend == "arrow":
+        arrow.require_arrow("The arrow backend")
+
+
+def _select_rows(chunks, nrows, sample, seed):
+    """
+    Keep each row with probability `sample`, then the first `nrows` rows.
+    """
+
+    rng = np.random.default_rng(seed)
+    remaining = nrows
+    if remaining == 0:
+        return
+    for chunk in chunks:
+        is_table = arrow.is_arrow_table(chunk)
+        if sample is not None:
+            keep = rng.random(len(chunk)) < sample
+            chunk = chunk.filter(keep) if is_table \
+                else chunk[keep].reset_index(drop=True)
+            if len(chunk) == 0:
+                continue
+        if remaining is not None:
+            chunk = chunk.slice(0, remaining) if is_table \
+                else chunk.iloc[:remaining]
+            remaining -= len(chunk)
+        yield chunk
+        if remaining == 0:
+            return
+
+
+def _default_dtypes(df):
+    """
+    Return a DataFrame read with nullable dtypes with the dtypes that
+    ``pandas.read_csv`` gives by default instead.
+    """
+
+    columns = {}
+    for name, column in df.items():
+        dtype = column.dtype
+        if isinstance(dtype, pd.StringDtype):
+            column = column.astype("str")
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype
+                        ) and dtype.kind in "iufb":
+            if column.hasnans:
+                # Missing values make integers float, and booleans objects.
+                column = column.to_numpy(
+                    dtype=object if dtype.kind == "b" else float,
+                    na_value=np.nan)
+            else:
+                column = column.to_numpy(dtype=dtype.numpy_dtype)
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _concat(chunks, columns, backend="pandas"):
+    chunks = list(chunks)
+    if backend == "arrow":
+        if not chunks:
+            return arrow.pa.table(
+                {col: arrow.pa.array([]) for col in columns or []})
+        return arrow.pa.concat_tables(chunks, promote_options="default")
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _rechunk(tables, chunksize):
+    """
+    Cut Arrow tables of any sizes into tables of `chunksize` rows, the last
+    one possibly shorter.
+    """
+
+    pending = []
+    size = 0
+    for table in tables:
+        pending.append(table)
+        size += len(table)
+        while size >= chunksize:
+            merged = arrow.pa.concat_tables(pending)
+            yield merged.slice(0, chunksize)
+            pending = [merged.slice(chunksize)]
+            size -= chunksize
+    if size:
+        yield arrow.pa.concat_tables(pending)
+
+
+def csv2df(source,
+           columns=None,
+           nrows=None,
+           sample=None,
+           seed=None,
+           chunksize=None,
+           backend="pandas",
+           **kwargs):
+    """
+    Read a CSV file as a DataFrame, or as DataFrame chunks.
+
+    Strings regarded as empty by `is_empty_value` (in any letter case) and
+    empty fields are parsed as missing values, instead of the default
+    missing markers of ``pandas.read_csv``.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or file object
+        CSV file to read.
+    columns : list of str, optional
+        Columns to read, all by default.
+    nrows : int, optional
+        Maximum number of rows to return.
+    sample : float, optional
+        Keep each row with this probability, skipping the others while
+        parsing.
+    seed : int, optional
+        Seed of the row sampling.
+    chunksize : int, optional
+        Return an iterator of DataFrames with this number of rows instead of
+        a single DataFrame.
+    backend : {"pandas", "arrow"}
+        Return pandas DataFrames, or ``pyarrow.Table`` objects parsed by
+        ``pyarrow.csv``, which requires ``pyarrow``.
+    **kwargs
+        Other arguments of ``pandas.read_csv``, e.g. `sep`. Only `sep` is
+        supported by the arrow backend.
+
+    Returns
+    -------
+    DataFrame, pyarrow.Table or iterator of them
+    """
+
+    _check_read_options(columns, nrows, sample, chunksize, backend)
+    if backend == "arrow":
+        return _csv2table(source, columns, nrows, sample, seed, chunksize,
+                          **kwargs)
+
+    skiprows = None
+    if sample is not None:
+        rng = np.random.default_rng(seed)
+
+        def skiprows(row):
+            return row > 0 and rng.random() >= sample
+
+    reader = pd.read_csv(source,
+                         usecols=columns,
+                         nrows=nrows,
+                         skiprows=skiprows,
+                         chunksize=chunksize,
+                         na_values=NA_VALUES,
+                         keep_default_na=False,
+                         **kwargs)
+    if chunksize is None:
+        return reader
+    return _iter_reader(reader)
+
+
+def _iter_reader(reader):
+    with reader:
+        yield from reader
+
+
+def _csv2table(source, columns, nrows, sample, seed, chunksize, sep=",",
+               **kwargs):
+    if kwargs:
+        raise TypeError("The arrow backend of csv2df does not support "
+                        f"arguments {sorted(kwargs)}.")
+    import pyarrow.csv as pacsv  # pylint: disable=C0415
+
+    reader = pacsv.open_csv(
+        source,
+        parse_options=pacsv.ParseOptions(delimiter=sep),
+        convert_options=pacsv.ConvertOptions(include_columns=columns,
+                                             null_values=sorted(NA_VALUES),
+                                             strings_can_be_null=True))
+    tables = (arrow.pa.Table.from_batches([batch]) for batch in reader)
+    chunks = _select_rows(_rechunk(tables, chunksize or DEFAULT_CHUNKSIZE),
+                          nrows, sample, seed)
+    if chunksize is None:
+        return _concat(chunks, columns or reader.schema.names, "arrow")
+    return chunks
+
+
+def jsonl2df(source,
+             columns=None,
+             nrows=None,
+             sample=None,
+             seed=None,
+             chunksize=None,
+             blocksize=1 << 20,
+             backend="pandas"):
+    """
+    Read a JSON Lines file as a DataFrame, or as DataFrame chunks.
+
+    Records are read one at a time by `iter_json_records`, so only the
+    selected rows and columns are kept. Strings regarded as empty by
+    `is_empty_value` are replaced by missing values.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or binary file object
+        JSON Lines file to read.
+    columns : list of str, optional
+        Columns to keep, all by default.
+    nrows : int, optional
+        Maximum number of rows to return.
+    sample : float, optional
+        Keep each row with this probability.
+    seed : int, optional
+        Seed of the row sampling.
+    chunksize : int, optional
+        Return an iterator of DataFrames with at most this number of rows
+        instead of a single DataFrame.
+    blocksize : int
+        Number of bytes read at a time.
+    backend : {"pandas", "arrow"}
+        Return pandas DataFrames, or ``pyarrow.Table`` objects built from the
+        records, which requires ``pyarrow``.
+
+    Returns
+    -------
+    DataFrame, pyarrow.Table or iterator of them
+    """
+
+    _check_read_options(columns, nrows, sample, chunksize, backend)
+
+    chunks = _select_rows(
+        _record_chunks(iter_json_records(source,
+                                         lines=True,
+                                         blocksize=blocksize), columns,
+                       chunksize or DEFAULT_CHUNKSIZE, backend), nrows,
+        sample, seed)
+    if chunksize is None:
+        return _concat(chunks, columns, backend)
+    return chunks
+
+
+def _record_chunks(records, columns, chunksize, backend="pandas"):
+    while True:
+        batch = list(itertools.islice(records, chunksize))
+        if not batch:
+            return
+        if backend == "arrow":
+            if columns is None:
+                table = arrow.pa.Table.from_pylist(batch)
+            else:
+                table = arrow.pa.table({
+                    col: [record.get(col) for record in batch]
+                    for col in columns
+                })
+            yield mask_empty_strings(table)
+        else:
+            yield mask_empty_strings(pd.DataFrame(batch, columns=columns))
+
+
+def parquet2df(source,
+               columns=None,
+               nrows=None,
+               sample=None,
+               seed=None,
+               chunksize=None,
+               backend="pandas"):
+    """
+    Read a Parquet file as a DataFrame, or as DataFrame chunks.
+
+    Requires ``pyarrow``. Only the selected columns are read, and reading
+    stops once `nrows` rows are returned. Strings regarded as empty by
+    `is_empty_value` are replaced by missing values.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or file object
+        Parquet file to read.
+    columns : list of str, optional
+        Columns to read, all by default.
+    nrows : int, optional
+        Maximum number of rows to return.
+    sample : float, optional
+        Keep each row with this probability.
+    seed : int, optional
+        Seed of the row sampling.
+    chunksize : int, optional
+        Return an iterator of DataFrames with at most this number of rows
+        instead of a single DataFrame.
+    backend : {"pandas", "arrow"}
+        Return pandas DataFrames, or the ``pyarrow.Table`` objects read from
+        the file without conversion.
+
+    Returns
+    -------
+    DataFrame, pyarrow.Table or iterator of them
+    """
+
+    _check_read_options(columns, nrows, sample, chunksize, backend)
+    try:
+        import pyarrow.parquet as pq  # pylint: disable=C0415
+    except ImportError as error:
+        raise ImportError("parquet2df requires pyarrow.") from error
+
+    parquet = pq.ParquetFile(source)
+    batches = parquet.iter_batches(batch_size=chunksize or DEFAULT_CHUNKSIZE,
+                                   columns=columns)
+    if backend == "arrow":
+        tables = (arrow.pa.Table.from_batches([batch]) for batch in batches)
+    else:
+        tables = (batch.to_pandas() for batch in batches)
+    chunks = _select_rows((mask_empty_strings(table) for table in tables),
+                          nrows, sample, seed)
+    if chunksize is None:
+        return _concat(chunks, columns or parquet.schema_arrow.names,
+                       backend)
+    return chunks
+
+
+def profile_json(source,
+                 lines=None,
+                 with_dataframe=False,
+                 chunksize=DEFAULT_CHUNKSIZE,
+                 blocksize=1 << 20):
+    """
+    Profile the fields of a JSON document in a single pass over its records.
+
+    Records are counted by a ``RecordAccumulator`` in batches as they are
+    decoded, so no DataFrame has to be built to profile the document, and
+    memory is bounded by the batch size and the distinct values of the
+    fields.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or binary file object
+        Array of records or JSON Lines file to profile.
+    lines : bool, optional
+        Whether the document is JSON Lines. Detected if None.
+    with_dataframe : bool
+        Whether to also return the records as a DataFrame, with the strings
+        regarded as empty replaced by missing values.
+    chunksize : int
+        Number of records counted at a time.
+    blocksize : int
+        Number of bytes read at a time.
+
+    Returns
+    -------
+    dict or tuple
+        Maps each field name to its `FieldInfo.info` with meta type votes
+        (see ``RecordAccumulator.info``), preceded by the DataFrame if
+        `with_dataframe`.
+    """
+
+    _check_read_options(None, None, None, chunksize)
+
+    acc = RecordAccumulator()
+    chunks = []
+    records = iter_json_records(source, lines=lines, blocksize=blocksize)
+    while True:
+        batch = list(itertools.islice(records, chunksize))
+        if not batch:
+            break
+        acc.add_records(batch)
+        if with_dataframe:
+            chunks.append(mask_empty_strings(pd.DataFrame(batch)))
+
+    if with_dataframe:
+        return _concat(chunks, None), acc.info
+    return acc.info
+
+
+def profile_csv(source,
+                columns=None,
+                nrows=None,
+                sample=None,
+                seed=None,
+                with_dataframe=False,
+                chunksize=DEFAULT_CHUNKSIZE,
+                **kwargs):
+    """
+    Profile the columns of a CSV file in a single pass over its lines.
+
+    Each chunk parsed by `csv2df` is counted by a ``RecordAccumulator``
+    and, unless `with_dataframe`, dropped, so memory is bounded by the
+    chunk size and the distinct values of the columns.
+
+    Chunks are parsed with nullable dtypes, so that an integer column with
+    missing cells is profiled as integers, as by `profile_json`, instead of
+    floats.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or file object
+        CSV file to profile.
+    columns, nrows, sample, seed, **kwargs
+        Rows and columns to read, as for `csv2df`.
+    with_dataframe : bool
+        Whether to also return the rows as a DataFrame, or as a pyarrow
+        Table with ``backend="arrow"``.
+    chunksize : int
+        Number of lines parsed at a time.
+
+    Returns
+    -------
+    dict or tuple
+        Maps each column name to its `FieldInfo.info` with meta type votes
+        (see ``RecordAccumulator.info``), preceded by the DataFrame if
+        `with_dataframe`.
+    """
+
+    _check_read_options(columns, nrows, sample, chunksize)
+
+    nullable = kwargs.get("backend", "pandas") == "pandas" and not (
+        {"dtype", "dtype_backend"} & set(kwargs))
+    if nullable:
+        kwargs["dtype_backend"] = "numpy_nullable"
+
+    acc = RecordAccumulator()
+    chunks = []
+    for chunk in csv2df(source,
+                        columns=columns,
+                        nrows=nrows,
+                        sample=sample,
+                        seed=seed,
+                        chunksize=chunksize,
+                        **kwargs):
+        acc.add_frame(chunk)
+        if with_dataframe:
+            chunks.append(_default_dtypes(chunk) if nullable else chunk)
+
+    if with_dataframe:
+        return _concat(chunks, columns, kwargs.get("backend",
+                                                   "pandas")), acc.info
+    return acc.info
@@ -2,7 +2,34 @@
 # flake8: noqa
 """
 Util functions for data_wizard
+
+Submodules are imported on first access to one of their names, so that
+e.g. `remove_trailing_commas` can be used without importing pandas.
 """
 
-from AVAPy.data_wizard.utils.json import *
-from AVAPy.data_wizard.utils.typeinfer import *
+import importlib
+
+_SUBMODULES = {
+    "AVAPy.data_wizard.utils.json": ("remove_trailing_commas", ),
+    "AVAPy.data_wizard.utils.typeinfer": ("is_empty_value", "is_date",
+                                          "is_bool_field"),
+}
+
+_LAZY_NAMES = {
+    name: module
+    for module, names in _SUBMODULES.items() for name in names
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
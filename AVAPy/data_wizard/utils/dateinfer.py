@@ -0,0 +1,251 @@
+"""
+Util functions for date detection.
+
+Date strings are matched against precompiled regexes equivalent to the
+ones ``datetime.strptime`` builds for `DATE_FORMATS`, then validated as
+calendar dates, which gives the same answer as trying ``strptime`` with
+every format.
+"""
+
+import re
+from datetime import datetime
+
+DATE_FORMATS = ("%Y年%m月%d日", "%Y年", "%Y年%m月", "%Y-%m-%d", "%Y%m%d",
+                "%Y/%m/%d", "%m/%d/%Y", "%Y/%m", "%Y", "%Y.%m.%d")
+
+INT_DATE_PATTERNS = (r"^(19|20)\d{2}$", r"^\d{4}(0?[1-9]|1[012])$",
+                     r"^\d{4}(0?[1-9]|1[012])(0?[1-9]|[12]\d|3[01])$")
+
+INT_DATE_RE = re.compile("|".join(f"(?:{p})" for p in INT_DATE_PATTERNS))
+
+# `INT_DATE_PATTERNS` with named groups, to parse integer dates.
+INT_DATE_PARSE_RES = (
+    re.compile(r"^(19|20)\d{2}$"),
+    re.compile(r"^\d{4}(?P<m>0?[1-9]|1[012])$"),
+    re.compile(r"^\d{4}(?P<m>0?[1-9]|1[012])(?P<d>0?[1-9]|[12]\d|3[01])$"),
+)
+
+# Same directives as `datetime.strptime`.
+DIRECTIVE_PATTERNS = {
+    "%Y": r"(?P<Y>\d\d\d\d)",
+    "%m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "%d": r"(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+}
+
+# Necessary condition for a string without spaces to match any format.
+DATE_CANDIDATE_RE = re.compile(r"[\d年月日/.\-]{4,11}")
+
+
+def format_pattern(fmt):
+    """
+    Return the regex pattern of a date format made of `DIRECTIVE_PATTERNS`.
+    """
+
+    parts = re.split(r"(%[a-zA-Z])", fmt)
+    return "".join(
+        DIRECTIVE_PATTERNS[part] if part in DIRECTIVE_PATTERNS else re.escape(
+            part) for part in parts)
+
+
+FORMAT_RES = {
+    fmt: re.compile(format_pattern(fmt), re.IGNORECASE)
+    for fmt in DATE_FORMATS
+}
+
+
+def parse_format(string, fmt):
+    """
+    Return `datetime.strptime(string, fmt)`, or None if it fails, for `fmt`
+    in `DATE_FORMATS`.
+    """
+
+    found = FORMAT_RES[fmt].match(string)
+    if found is None or found.end() != len(string):
+        return None
+
+    parts = found.groupdict()
+    try:
+        return datetime(int(parts["Y"]), int(parts.get("m") or 1),
+                        int(parts.get("d") or 1))
+    except ValueError:
+        return None
+
+
+def match_format(string, fmt):
+    """
+    Whether `datetime.strptime(string, fmt)` succeeds, for `fmt` in
+    `DATE_FORMATS`.
+    """
+
+    return parse_format(string, fmt) is not None
+
+
+def format_unit(fmt):
+    """
+    Return the finest time unit of a date format: "day", "month" or "year".
+    """
+
+    if "%d" in fmt:
+        return "day"
+    if "%m" in fmt:
+        return "month"
+    return "year"
+
+
+def parse_date(value):
+    """
+    Parse a value accepted by `is_date`.
+
+    Returns
+    -------
+    tuple or None
+        The date as a ``datetime`` and its unit ("day", "month" or "year"),
+        or None if the value is not a date, or an integer date that does not
+        exist in the calendar (e.g. 20050229).
+
+    Examples
+    --------
+    >>> parse_date("1991年3月")
+    (datetime.datetime(1991, 3, 1, 0, 0), 'month')
+    """
+
+    if isinstance(value, str):
+        string = value.replace(" ", "")
+        if DATE_CANDIDATE_RE.fullmatch(string) is None:
+            return None
+        for fmt in DATE_FORMATS:
+            parsed = parse_format(string, fmt)
+            if parsed is not None:
+                return parsed, format_unit(fmt)
+        return None
+
+    if isinstance(value, int):
+        string = str(value)
+        year = INT_DATE_PARSE_RES[0].match(string)
+        month = INT_DATE_PARSE_RES[1].match(string)
+        day = INT_DATE_PARSE_RES[2].match(string)
+        try:
+            if year:
+                return datetime(int(string), 1, 1), "year"
+            if month:
+                return datetime(int(string[:4]), int(month["m"]), 1), "month"
+            if day:
+                return datetime(int(string[:4]), int(day["m"]),
+                                int(day["d"])), "day"
+        except ValueError:
+            return None
+
+    return None
+
+
+def is_int_date(value):
+    """
+    Whether an int can be interpreted as a date.
+    """
+
+    return INT_DATE_RE.match(str(value)) is not None
+
+
+class DateDetector:
+    """
+    Date detection that learns which formats a column uses.
+
+    Formats are tried in descending order of the number of values they
+    matched so far, so that once a column has shown its format, each value
+    usually needs a single regex match. Results are the same as `is_date`.
+
+    Examples
+    --------
+    >>> detector = DateDetector()
+    >>> detector.is_date("2020.10.01")
+    True
+    >>> detector.format
+    '%Y.%m.%d'
+    """
+
+    def __init__(self, formats=DATE_FORMATS):
+        self.formats = list(formats)
+        self.hits = dict.fromkeys(self.formats, 0)
+
+    def is_date(self, value) -> bool:
+        """
+        Whether a string/int can be interpreted as a date.
+        """
+
+        if isinstance(value, str):
+            string = value.replace(" ", "")
+            if not DATE_CANDIDATE_RE.fullmatch(string):
+                return False
+            for idx, fmt in enumerate(self.formats):
+                if match_format(string, fmt):
+                    self.__learn(idx, fmt)
+                    return True
+            return False
+
+        if isinstance(value, int):
+            return is_int_date(value)
+
+        return False
+
+    def __learn(self, idx, fmt):
+        self.hits[fmt] += 1
+        # Bubble towards the front, keeping formats sorted by hits.
+        while idx > 0 and self.hits[self.formats[idx - 1]] < self.hits[fmt]:
+            self.formats[idx] = self.formats[idx - 1]
+            idx -= 1
+        self.formats[idx] = fmt
+
+    @property
+    def format(self):
+        """
+        Return the format matched by most values so far, or None.
+        """
+
+        fmt = self.formats[0]
+        return fmt if self.hits[fmt] else None
+
+
+def is_date_array(values):
+    """
+    Vectorized `is_date` over an array.
+
+    Parameters
+    ----------
+    values : array_like
+        Values to check, as a ``numpy.ndarray``, ``pandas.Series`` or list.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array, `True` where the value is in a valid date format.
+
+    Examples
+    --------
+    >>> is_date_array(["2020-10-01", "abc", 2002, 1.5])
+    array([ True, False,  True, False])
+    """
+
+    # Imported here, so that the scalar functions do not need pandas.
+    import numpy as np  # pylint: disable=C0415
+    import pandas as pd  # pylint: disable=C0415
+
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    elif not isinstance(values, np.ndarray):
+        values = np.array(values, dtype=object)
+    if values.dtype.kind == "U":
+        values = values.astype(object)
+
+    if values.dtype.kind in "iu":
+        strs = pd.Series(values.astype(str), dtype=object)
+        return strs.str.match(INT_DATE_RE.pattern).to_numpy(dtype=bool)
+    if values.dtype.kind != "O":
+        return np.zeros(len(values), dtype=bool)
+
+    # Each distinct value is checked once, formats in learned order.
+    keys = list(zip(map(type, values), values))
+    detector = DateDetector()
+    checked = {key: detector.is_date(key[1]) for key in dict.fromkeys(keys)}
+    return np.fromiter(map(checked.__getitem__, keys),
+                       dtype=bool,
+                       count=len(keys))
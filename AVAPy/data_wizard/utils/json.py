@@ -5,21 +5,308 @@ Util functions for JSON processing.
 import re
 
 
-def remove_trailing_commas(json_like):
+def remove_trailing_commas(json_like,
+                           comments=False,
+                           nan=False,
+                           single_quotes=False):
     """
     Removes trailing commas from `json_like` and returns the result.
 
+    The text is scanned once by `LenientJSONScanner`, which can also fix
+    other common departures from JSON.
+
+    Parameters
+    ----------
+    json_like : str
+        JSON text, possibly with trailing commas.
+    comments : bool
+        Whether to remove ``//`` and ``/* */`` comments.
+    nan : bool
+        Whether to replace ``NaN``, ``Infinity`` and ``-Infinity`` by
+        ``null``.
+    single_quotes : bool
+        Whether to convert single-quoted strings to double-quoted ones.
+
     Examples
     --------
     >>> remove_trailing_commas('{"foo":"bar","baz":["blah",],}')
     '{"foo":"bar","baz":["blah"]}'
+    >>> remove_trailing_commas("{'a': NaN, /* b */}", comments=True,
+    ...                        nan=True, single_quotes=True)
+    '{"a": null}'
+    """
+
+    scanner = LenientJSONScanner(comments=comments,
+                                 nan=nan,
+                                 single_quotes=single_quotes)
+    return scanner.feed(json_like) + scanner.flush()
+
+
+class LenientJSONScanner:
     """
+    Single-pass scanner that turns lenient JSON text into JSON.
+
+    Trailing commas are always removed. The text can be fed piece by piece:
+    the scanner keeps track of strings and comments across pieces, and holds
+    back the few characters whose meaning depends on the next piece (e.g. a
+    comma that may be trailing), so that a large document can be cleaned
+    while it is read. Text outside of strings is only checked for the
+    characters that may need a fix, which keeps the scan linear.
+
+    Parameters
+    ----------
+    comments : bool
+        Whether to remove ``//`` and ``/* */`` comments.
+    nan : bool
+        Whether to replace ``NaN``, ``Infinity`` and ``-Infinity`` by
+        ``null``.
+    single_quotes : bool
+        Whether to convert single-quoted strings to double-quoted ones.
+
+    Examples
+    --------
+    >>> scanner = LenientJSONScanner()
+    >>> scanner.feed('{"foo":["bar",') + scanner.feed(' ],}') + scanner.flush()
+    '{"foo":["bar"]}'
+    """
+
+    OUTSIDE, STRING, LINE_COMMENT, BLOCK_COMMENT = range(4)
+
+    SPACE_RE = re.compile(r"\s*")
+    # Commas that are trailing unless they are inside a string.
+    COMMA_RE = re.compile(r",\s*(?:[\]}]|\Z)")
+    DOUBLE_STRING_RE = re.compile(r'["\\]')
+    # Longest run of characters that may start a token of the next piece.
+    PARTIAL_RE = re.compile(r"[A-Za-z/-]{1,9}\Z")
+
+    def __init__(self, comments=False, nan=False, single_quotes=False):
+        tokens = ['"', ","]
+        if single_quotes:
+            tokens.append("'")
+        if comments:
+            tokens.extend([r"//", r"/\*", "/"])
+        if nan:
+            tokens.extend(["NaN", "-?Infinity"])
+        self.__outside_re = re.compile("|".join(tokens))
+        self.__string_res = {
+            '"': re.compile(r'["\\]'),
+            "'": re.compile(r"['\"\\]"),
+        }
+        self.__comments = comments
+        self.__partial = comments or nan
+        self.__lenient = comments or nan or single_quotes
+
+        self.mode = self.OUTSIDE
+        self.quote = None
+        self.pending = None
+        self.carry = ""
+
+    def feed(self, text):
+        """
+        Process the next piece of text and return its cleaned part.
+        """
+
+        return self.__scan(text, final=False)
+
+    def flush(self):
+        """
+        Return the text held back at the end of the input.
+        """
+
+        out = self.__scan("", final=True)
+        pending, self.pending = self.pending or "", None
+        return out + pending
+
+    def __scan(self, text, final):
+        # pylint: disable=R0912, R0915
+        if self.carry:
+            text, self.carry = self.carry + text, ""
+        if not self.__lenient:
+            return self.__scan_commas(text, final)
+        out = []
+        pos = 0
+        length = len(text)
+
+        while pos < length:
+            if self.mode == self.STRING:
+                found = self.__string_res[self.quote].search(text, pos)
+                if found is None:
+                    out.append(text[pos:])
+                    break
+                start, end = found.span()
+                char = found.group()
+                if char == self.quote:
+                    out.append(text[pos:start] + '"')
+                    self.mode = self.OUTSIDE
+                elif char == '"':
+                    out.append(text[pos:start] + '\\"')
+                elif end == length and not final:
+                    # Escape sequence split between pieces.
+                    out.append(text[pos:start])
+                    self.carry = text[start:]
+                elif self.quote == "'" and text[end:end + 1] == "'":
+                    out.append(text[pos:start] + "'")
+                    end += 1
+                else:
+                    end += 1
+                    out.append(text[pos:end])
+                pos = end
+                continue
+
+            if self.mode == self.LINE_COMMENT:
+                end = text.find("\n", pos)
+                if end < 0:
+                    break
+                self.mode = self.OUTSIDE
+                pos = end
+                continue
+
+            if self.mode == self.BLOCK_COMMENT:
+                end = text.find("*/", pos)
+                if end < 0:
+                    if text.endswith("*") and not final:
+                        self.carry = "*"
+                    break
+                self.mode = self.OUTSIDE
+                pos = end + 2
+                continue
+
+            if self.pending is not None:
+                end = self.SPACE_RE.match(text, pos).end()
+                self.pending += text[pos:end]
+                pos = end
+                if pos == length:
+                    break
+                if self.__comments and text[pos:pos + 2] in ("//", "/*"):
+                    # A comment between a comma and a closing bracket.
+                    pos = self.__comment(text, pos, out, final)
+                    continue
+                if (self.__comments and pos == length - 1
+                        and text[pos] == "/" and not final):
+                    self.carry = "/"
+                    break
+                if text[pos] not in "}]":
+                    out.append(self.pending)
+                self.pending = None
+                continue
+
+            found = self.__outside_re.search(text, pos)
+            if found is None:
+                partial = self.PARTIAL_RE.search(text, pos)
+                if self.__partial and partial and not final:
+                    out.append(text[pos:partial.start()])
+                    self.carry = partial.group()
+                else:
+                    out.append(text[pos:])
+                break
+
+            start, end = found.span()
+            token = found.group()
+            out.append(text[pos:start])
+            if token == ",":
+                self.pending = ","
+            elif token in "\"'":
+                self.mode = self.STRING
+                self.quote = token
+                out.append('"')
+            elif token[0] == "/":
+                end = self.__comment(text, start, out, final)
+            else:
+                out.append("null")
+            pos = end
+
+        return "".join(out)
+
+    def __scan_commas(self, text, final):
+        """
+        Remove trailing commas only, jumping from one candidate comma to the
+        next and checking whether it is inside a string by counting quotes.
+        """
+
+        if not final and text.endswith("\\"):
+            # The escaped character is in the next piece.
+            split = len(text.rstrip("\\"))
+            text, self.carry = text[:split], text[split:]
+
+        out = []
+        pos = 0
+        if self.pending is not None:
+            pos = self.SPACE_RE.match(text).end()
+            self.pending += text[:pos]
+            if pos == len(text):
+                return ""
+            if text[pos] not in "}]":
+                out.append(self.pending)
+            self.pending = None
+
+        checked = pos
+        found = self.COMMA_RE.search(text, pos)
+        while found is not None:
+            start = found.start()
+            checked = self.__skip_strings(text, checked, start)
+            if self.mode == self.STRING:
+                found = self.COMMA_RE.search(text, max(checked, start + 1))
+                continue
+            out.append(text[pos:start])
+            if found.end() == len(text) and text[-1] not in "}]":
+                self.pending = found.group()
+                pos = checked = len(text)
+                break
+            pos = checked = found.end() - 1
+            found = self.COMMA_RE.search(text, pos)
+
+        self.__skip_strings(text, checked, len(text))
+        out.append(text[pos:])
+        return "".join(out)
+
+    def __skip_strings(self, text, start, stop):
+        """
+        Update the string state from `start` to `stop` and return the
+        position reached, which is past `stop` if it is an escaped
+        character.
+        """
+
+        if start >= stop:
+            return start
+        if text.find("\\", start, stop) < 0:
+            if text.count('"', start, stop) % 2:
+                self.mode = self.STRING if self.mode == self.OUTSIDE \
+                    else self.OUTSIDE
+            return stop
+
+        pos = start
+        while pos < stop:
+            if self.mode == self.OUTSIDE:
+                pos = text.find('"', pos, stop)
+                if pos < 0:
+                    return stop
+                self.mode = self.STRING
+                pos += 1
+                continue
+            found = self.DOUBLE_STRING_RE.search(text, pos, stop)
+            if found is None:
+                return stop
+            pos = found.end()
+            if found.group() == '"':
+                self.mode = self.OUTSIDE
+            else:
+                pos += 1
+        return pos
+
+    def __comment(self, text, pos, out, final):
+        """
+        Start the comment at `pos` and return the position after its opening.
+        """
 
-    trailing_object_commas_re = re.compile(
-        r'(,)\s*}(?=([^"\\]*(\\.|"([^"\\]*\\.)*[^"\\]*"))*[^"]*$)')
-    trailing_array_commas_re = re.compile(
-        r'(,)\s*\](?=([^"\\]*(\\.|"([^"\\]*\\.)*[^"\\]*"))*[^"]*$)')
-    # Fix objects {} first
-    objects_fixed = trailing_object_commas_re.sub("}", json_like)
-    # Now fix arrays/lists [] and return the result
-    return trailing_array_commas_re.sub("]", objects_fixed)
+        opening = text[pos:pos + 2]
+        if opening == "//":
+            self.mode = self.LINE_COMMENT
+        elif opening == "/*":
+            self.mode = self.BLOCK_COMMENT
+        elif pos + 1 == len(text) and not final:
+            self.carry = "/"
+            return pos + 1
+        else:
+            out.append("/")
+            return pos + 1
+        return pos + 2
@@ -2,10 +2,13 @@
 Util functions for type inference.
 """
 
-import re
 import math
 import numbers
-from datetime import datetime
+
+from AVAPy.data_wizard.utils.dateinfer import DATE_FORMATS, \
+    DATE_CANDIDATE_RE, match_format, is_int_date
+
+EMPTY_STRINGS = ('null', 'none', 'nan', '-')
 
 
 def is_empty_value(value) -> bool:
@@ -43,17 +46,17 @@ def is_empty_value(value) -> bool:
     if not isinstance(value, (type(None), numbers.Number, str)):
         raise TypeError("Argument must be a Number or str or None.")
 
-    empty_strs = ['null', 'none', 'nan', '-']
     return value == '' or value is None or (isinstance(
         value, numbers.Number) and math.isnan(value)) or (isinstance(
-            value, str) and value.lower() in empty_strs)
+            value, str) and value.lower() in EMPTY_STRINGS)
 
 
 def is_date(value) -> bool:
     """
     Whether a string/int can be interpreted as a date.
 
-    Most common date formats can be parsed.
+    Most common date formats can be parsed. Strings are checked against
+    `DATE_FORMATS` with spaces removed.
 
     Parameters
     ----------
@@ -82,31 +85,15 @@ def is_date(value) -> bool:
     >>> False
     """
 
-    int_date_patterns = [
-        r"^(19|20)\d{2}$", r"^\d{4}(0?[1-9]|1[012])$",
-        r"^\d{4}(0?[1-9]|1[012])(0?[1-9]|[12]\d|3[01])$"
-    ]
-
-    fmts = [
-        "%Y年%m月%d日", "%Y年", "%Y年%m月", "%Y-%m-%d", "%Y%m%d", "%Y/%m/%d",
-        "%m/%d/%Y", "%Y/%m", "%Y", "%Y.%m.%d"
-    ]
+    if isinstance(value, str):
+        string = value.replace(" ", "")
+        return DATE_CANDIDATE_RE.fullmatch(string) is not None and any(
+            match_format(string, fmt) for fmt in DATE_FORMATS)
 
-    isdate = False
+    if isinstance(value, int):
+        return is_int_date(value)
 
-    if isinstance(value, str):
-        for fmt in fmts:
-            try:
-                datetime.strptime(value.replace(" ", ""), fmt)
-                isdate = True
-            except ValueError:
-                pass
-    elif isinstance(value, int):
-        for pattern in int_date_patterns:
-            if re.match(pattern, str(value)):
-                isdate = True
-
-    return isdate
+    return False
 
 
 def is_bool_field(ary) -> bool:
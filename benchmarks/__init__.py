@@ -0,0 +1,3 @@
+"""
+Benchmarks for AVAPy, in the style of asv (airspeed velocity).
+"""
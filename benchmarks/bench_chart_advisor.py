@@ -0,0 +1,49 @@
+"""
+Benchmarks of chart_advisor chart generation.
+
+Compares the batch API with a loop of single calls on many short series,
+as a reporting job charting one metric per series would. On a single CPU,
+the process pool only adds its overhead to the serial batch.
+"""
+
+import numpy as np
+
+from AVAPy import get_line_xy, get_bar_xy, get_line_batch, get_bar_batch
+
+LENGTH = 50
+
+
+class ChartBatchSuite:
+    """
+    Line and bar charts of many series sharing their `x`.
+    """
+
+    params = [[100, 1000], [LENGTH]]
+    param_names = ["series", "length"]
+    timeout = 600
+
+    def setup(self, series, length):
+        rng = np.random.default_rng(0)
+        x = list(range(length))
+        self.series = [(x, rng.normal(size=length).cumsum().tolist())
+                       for _ in range(series)]
+
+    def time_line_loop(self, series, length):
+        for x, y in self.series:
+            get_line_xy(x, y)
+
+    def time_line_batch(self, series, length):
+        for _ in get_line_batch(self.series, executor=None):
+            pass
+
+    def time_line_batch_process(self, series, length):
+        for _ in get_line_batch(self.series, executor="process"):
+            pass
+
+    def time_bar_loop(self, series, length):
+        for x, y in self.series:
+            get_bar_xy(x, y)
+
+    def time_bar_batch(self, series, length):
+        for _ in get_bar_batch(self.series, executor=None):
+            pass
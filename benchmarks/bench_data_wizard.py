@@ -0,0 +1,90 @@
+"""
+Benchmarks of data_wizard type inference and profiling.
+
+Suites follow asv conventions: `params`, `param_names`, `setup()`, and
+`time_*`/`peakmem_*` methods. They can run with asv, or with
+``python -m benchmarks.run``, which also reports throughput in rows/s.
+"""
+
+import numpy as np
+
+from AVAPy import FieldInfo, is_empty_value, is_date, is_bool_field
+from AVAPy.data_wizard.utils.dateinfer import is_date_array
+
+from .datagen import KINDS, make_column, as_array
+
+ROWS = [10**3, 10**5, 10**7]
+
+
+class FieldInfoSuite:
+    """
+    FieldInfo on each kind of column, from a list or a numpy array.
+    """
+
+    params = [list(KINDS), ROWS, ["list", "array"]]
+    param_names = ["kind", "rows", "backend"]
+    timeout = 600
+
+    def setup(self, kind, rows, backend):
+        column = make_column(kind,
+                             rows,
+                             null_ratio=0.1,
+                             cardinality=max(rows // 10, 1))
+        self.field = column if backend == "list" else as_array(column, kind)
+
+    def time_fieldinfo(self, kind, rows, backend):
+        FieldInfo(self.field)
+
+    def peakmem_fieldinfo(self, kind, rows, backend):
+        FieldInfo(self.field)
+
+
+class FieldInfoShapeSuite:
+    """
+    FieldInfo on string columns with various null ratios and cardinalities.
+    """
+
+    params = [[0.0, 0.1, 0.5], [10, 10**3, 10**5], [10**5]]
+    param_names = ["null_ratio", "cardinality", "rows"]
+
+    def setup(self, null_ratio, cardinality, rows):
+        self.field = make_column("string",
+                                 rows,
+                                 null_ratio=null_ratio,
+                                 cardinality=cardinality)
+
+    def time_fieldinfo(self, null_ratio, cardinality, rows):
+        FieldInfo(self.field)
+
+    def time_fieldinfo_sketch(self, null_ratio, cardinality, rows):
+        FieldInfo(self.field, sketch=True)
+
+    def time_fieldinfo_sample(self, null_ratio, cardinality, rows):
+        FieldInfo(self.field, sample_size=1000)
+
+
+class TypeInferSuite:
+    """
+    Type inference utils, applied to every value of a column.
+    """
+
+    params = [["date", "string", "mixed"], [10**3, 10**5]]
+    param_names = ["kind", "rows"]
+
+    def setup(self, kind, rows):
+        self.values = make_column(kind, rows, null_ratio=0.1)
+        self.array = np.array(self.values, dtype=object)
+
+    def time_is_empty_value(self, kind, rows):
+        for val in self.values:
+            is_empty_value(val)
+
+    def time_is_date(self, kind, rows):
+        for val in self.values:
+            is_date(val)
+
+    def time_is_date_array(self, kind, rows):
+        is_date_array(self.array)
+
+    def time_is_bool_field(self, kind, rows):
+        is_bool_field(self.values)
@@ -0,0 +1,36 @@
+"""
+Benchmarks of the import time of AVAPy and its submodules.
+
+Each import runs in a fresh interpreter, with the asv ``timeraw_``
+convention, so that modules cached by earlier imports are not free.
+"""
+
+MODULES = [
+    "AVAPy",
+    "AVAPy.data_wizard.utils.json",
+    "AVAPy.data_wizard.utils.typeinfer",
+    "AVAPy.data_wizard.analyzer.fieldinfo",
+    "AVAPy.data_wizard.analyzer.dfinfo",
+    "AVAPy.data_wizard.reader.parser",
+    "AVAPy.chart_advisor.aux.line",
+    "AVAPy.aio",
+]
+
+
+class ImportSuite:
+    """
+    Import of each module, then of the names a light script uses.
+    """
+
+    params = [MODULES]
+    param_names = ["module"]
+
+    def setup(self, module):
+        pass
+
+    def timeraw_import(self, module):
+        return f"import {module}"
+
+    def timeraw_import_utils(self, module):
+        return (f"import {module}\n"
+                "from AVAPy import remove_trailing_commas, is_empty_value")
@@ -0,0 +1,87 @@
+"""
+Synthetic data generator for benchmarks.
+"""
+
+import numpy as np
+
+KINDS = ("integer", "float", "date", "string", "mixed", "boolean")
+
+EMPTY_VALUES = (None, "", "null", "-", float("nan"))
+
+
+def distinct_values(kind, cardinality, rng):
+    """
+    Return up to `cardinality` distinct values of the given kind, as a list.
+    Dates are limited to the days of a century.
+    """
+
+    if kind == "integer":
+        # Too long to be taken as integer dates.
+        return (10**9 + rng.permutation(cardinality) * 7).tolist()
+    if kind == "float":
+        return (rng.rand(cardinality) * 1e6).tolist()
+    if kind == "date":
+        days = rng.permutation(365 * 100)[:cardinality]
+        dates = np.datetime64("1950-01-01") + days.astype("timedelta64[D]")
+        return [str(date) for date in dates]
+    if kind == "string":
+        return [f"value_{idx}_{rng.randint(10**6)}" for idx in range(cardinality)]
+    if kind == "mixed":
+        values = []
+        for kind_idx in range(cardinality):
+            sub_kind = KINDS[kind_idx % 4]
+            values.append(distinct_values(sub_kind, 1, rng)[0])
+        return values
+    if kind == "boolean":
+        return [True, False][:cardinality]
+    raise ValueError(f"Argument kind must be one of {KINDS}.")
+
+
+def make_column(kind, rows, null_ratio=0.0, cardinality=None, seed=0):
+    """
+    Return a synthetic column as a list.
+
+    Parameters
+    ----------
+    kind : str
+        One of `KINDS`.
+    rows : int
+        Number of values.
+    null_ratio : float
+        Fraction of values replaced by empty values of various forms.
+    cardinality : int, optional
+        Number of distinct non-empty values, defaults to `rows` (capped at 2
+        for booleans).
+    seed : int
+        Seed of the random generator.
+    """
+
+    rng = np.random.RandomState(seed)
+    if cardinality is None:
+        cardinality = rows
+    if kind == "boolean":
+        cardinality = min(cardinality, 2)
+
+    pool = distinct_values(kind, cardinality, rng)
+    picks = rng.randint(0, len(pool), rows)
+    column = [pool[idx] for idx in picks]
+
+    if null_ratio:
+        nulls = np.flatnonzero(rng.rand(rows) < null_ratio)
+        for pos, idx in enumerate(nulls.tolist()):
+            column[idx] = EMPTY_VALUES[pos % len(EMPTY_VALUES)]
+    return column
+
+
+def as_array(column, kind):
+    """
+    Return a column from `make_column` as the numpy array it would be read
+    into: numeric dtypes for numbers, object otherwise.
+    """
+
+    if kind == "float":
+        return np.array([np.nan if val in EMPTY_VALUES or val != val else val
+                         for val in column], dtype=float)
+    if kind == "integer" and all(isinstance(val, int) for val in column):
+        return np.array(column, dtype=np.int64)
+    return np.array(column, dtype=object)
@@ -0,0 +1,186 @@
+"""
+Run the benchmark suites without asv.
+
+Reports the best time of each benchmark, the throughput in rows/s and the
+peak memory allocated by Python, and compares them with a saved baseline.
+
+Examples
+--------
+Save a baseline, then compare a later run with it:
+
+    python -m benchmarks.run --max-rows 100000 --save baseline.json
+    python -m benchmarks.run --max-rows 100000 --compare baseline.json
+"""
+
+import re
+import sys
+import json
+import time
+import inspect
+import argparse
+import itertools
+import subprocess
+import tracemalloc
+
+from benchmarks import bench_chart_advisor, bench_data_wizard, bench_import
+
+MODULES = [bench_data_wizard, bench_chart_advisor, bench_import]
+
+
+def suites():
+    """
+    Yield the benchmark suite classes.
+    """
+
+    for module in MODULES:
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__ and hasattr(cls, "params"):
+                yield cls
+
+
+def measure(method, args, repeat):
+    """
+    Return the best time of `method(*args)` in seconds, and its peak memory
+    in bytes.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        method(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def measure_raw(code, repeat):
+    """
+    Return the best time of running `code` in a fresh interpreter, minus the
+    startup time of the interpreter, in seconds, like asv ``timeraw_``.
+    """
+
+    def best_time(source):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", source], check=True)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    return max(best_time(code) - best_time("pass"), 0.0), None
+
+
+def run(pattern=None, max_rows=None, repeat=3):
+    """
+    Run the benchmarks matching `pattern` and return their results by name.
+    """
+
+    results = {}
+    for cls in suites():
+        methods = [
+            name for name in dir(cls)
+            if name.startswith(("time_", "timeraw_", "peakmem_"))
+        ]
+        for args in itertools.product(*cls.params):
+            params = dict(zip(cls.param_names, args))
+            rows = params.get("rows")
+            if max_rows is not None and rows is not None and rows > max_rows:
+                continue
+            names = [
+                f"{cls.__name__}.{method}({', '.join(map(repr, args))})"
+                for method in methods
+            ]
+            if pattern and not any(re.search(pattern, n) for n in names):
+                continue
+
+            suite = cls()
+            suite.setup(*args)
+            for method, name in zip(methods, names):
+                if pattern and not re.search(pattern, name):
+                    continue
+                if method.startswith("timeraw_"):
+                    seconds, peak = measure_raw(
+                        getattr(suite, method)(*args), repeat)
+                else:
+                    seconds, peak = measure(
+                        getattr(suite, method), args,
+                        1 if method.startswith("peakmem_") else repeat)
+                results[name] = {
+                    "seconds": seconds,
+                    "rows_per_s": rows / seconds if rows and seconds else None,
+                    "peak_bytes": peak,
+                }
+                report(name, results[name])
+    return results
+
+
+def report(name, result, baseline=None):
+    """
+    Print one result, with its ratio to the baseline if any.
+    """
+
+    line = f"{name:<70} {result['seconds'] * 1e3:>10.2f} ms"
+    if result["rows_per_s"]:
+        line += f" {result['rows_per_s']:>14,.0f} rows/s"
+    if result["peak_bytes"] is not None:
+        line += f" {result['peak_bytes'] / 2**20:>9.1f} MiB"
+    if baseline:
+        line += f"  x{result['seconds'] / baseline['seconds']:.2f}"
+    print(line, flush=True)
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the results that are slower than the baseline by more than
+    `threshold` times, and return their names.
+    """
+
+    regressions = [
+        name for name, result in results.items() if name in baseline
+        and result["seconds"] > baseline[name]["seconds"] * threshold
+    ]
+    print(f"\n{len(regressions)} regression(s) over x{threshold}:")
+    for name in regressions:
+        report(name, results[name], baseline[name])
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--filter", help="regex on benchmark names")
+    parser.add_argument("--max-rows", type=int, help="skip larger sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write results to a JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare to")
+    parser.add_argument("--threshold",
+                        type=float,
+                        default=1.2,
+                        help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.max_rows, args.repeat)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,8 @@ setup(
     description='AVA Python Library',
     author='AFX',
     license='MIT',
-    install_requires=['pandas', 'altair'],
+    install_requires=['pandas'],
+    extras_require={'altair': ['altair']},
     setup_requires=['pytest-runner'],
     tests_require=['pytest==4.4.1'],
     test_suite='tests',
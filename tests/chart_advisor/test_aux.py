@@ -8,11 +8,19 @@ Data format:
 """
 
 import json
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import numpy as np
+import pandas as pd
 
 from AVAPy import get_scatter_xy
 from AVAPy import get_line_xy
+from AVAPy.chart_advisor.aux.bar import get_bar
+from AVAPy.chart_advisor.aux.line import get_line
+from AVAPy.chart_advisor.aux.scatterplot import get_scatter
+from AVAPy.chart_advisor.aux.spec import to_html
 from AVAPy import get_bar_xy
 
 
@@ -66,3 +74,62 @@ class TestAux:
         assert len(dic["layer"]) == 3
         assert type_layer_number(dic["layer"], "line") == 2
         assert type_layer_number(dic["layer"], "bar") == 1
+
+    @pytest.mark.parametrize(("x", "y"), data_samples)
+    def test_arrow_table(self, x, y):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"x": x, "y": y, "other": y})
+        schema = get_line(table)
+        assert schema == get_line_xy(x, y)
+
+
+class TestSideEffects:
+    """
+    Chart generation should neither modify its input nor write files.
+    """
+
+    rng = np.random.RandomState(2)
+    frames = [
+        pd.DataFrame({
+            "x": rng.rand(60),
+            "y": rng.randn(60)
+        }),
+        pd.DataFrame({
+            "x": [f"c{i}" for i in range(60)],
+            "y": rng.randn(60)
+        }),
+    ]
+
+    # Bar trends are fitted on a numeric `x` only.
+    @pytest.mark.parametrize("chart, df", [(get_line, frames[0]),
+                                           (get_line, frames[1]),
+                                           (get_bar, frames[0]),
+                                           (get_scatter, frames[0]),
+                                           (get_scatter, frames[1])])
+    def test_input_unchanged(self, chart, df):
+        original = df.copy()
+        first = chart(df)
+        assert df.equals(original)
+        assert list(df.columns) == ["x", "y"]
+        assert chart(df) == first
+
+    def test_sink(self):
+        df = self.frames[0]
+        file = StringIO()
+        result = get_line(df, sink=file)
+        assert file.getvalue() == result
+
+        received = []
+        assert get_bar(df, sink=received.append) == received[0]
+        assert '"layer"' in to_html(received[0])
+
+        with pytest.raises(TypeError):
+            get_scatter(df, sink="bar.html")
+
+    def test_threads(self):
+        calls = [(chart, df) for chart in (get_line, get_scatter)
+                 for df in self.frames] * 4
+        expected = [chart(df) for chart, df in calls]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda call: call[0](call[1]), calls))
+        assert results == expected
@@ -0,0 +1,175 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.chart_advisor.aux.batch
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AVAPy import (get_line_xy, get_bar_xy, get_scatter_xy, get_line_batch,
+                   get_bar_batch, get_scatter_batch)
+from AVAPy.chart_advisor.aux.auxiliary import (batch_marks, batch_trends,
+                                               get_marks)
+from AVAPy.chart_advisor.aux.bar import get_bar
+from AVAPy.chart_advisor.aux.batch import shared_auxiliaries, shared_spec
+from AVAPy.chart_advisor.aux.line import get_line
+
+
+def make_series(count, length=20, seed=0):
+    rng = np.random.default_rng(seed)
+    x = list(range(length))
+    return [(x, rng.normal(size=length).tolist()) for _ in range(count)]
+
+
+def assert_same_chart(actual, expected):
+    """
+    Charts are equal, with trend values equal up to rounding.
+    """
+
+    actual, expected = json.loads(actual), json.loads(expected)
+    assert actual["layer"] == expected["layer"]
+    actual_rows = list(actual["datasets"].values())[0]
+    expected_rows = list(expected["datasets"].values())[0]
+    assert len(actual_rows) == len(expected_rows)
+    for actual_row, expected_row in zip(actual_rows, expected_rows):
+        trend = actual_row.pop("trend_line")
+        assert trend == pytest.approx(expected_row.pop("trend_line"),
+                                      abs=1e-9)
+        assert actual_row == expected_row
+
+
+class TestSharedAuxiliaries:
+    def test_batch_trends(self):
+        x = np.arange(30, dtype=float)
+        ys = np.random.default_rng(1).normal(size=(5, 30))
+        trends = batch_trends(x, ys, 3)
+        for y, trend in zip(ys, trends):
+            expected = np.poly1d(np.polyfit(x, y, 3))(x)
+            np.testing.assert_allclose(trend, expected, atol=1e-9)
+
+    def test_batch_marks(self):
+        ys = np.random.default_rng(2).normal(size=(4, 25))
+        means, q75s, q25s = batch_marks(ys)
+        for idx, y in enumerate(ys):
+            marks = get_marks(pd.DataFrame({"x": range(25), "y": y}))
+            assert (means[idx], q75s[idx], q25s[idx]) == marks
+
+    def test_groups(self):
+        frames = [
+            pd.DataFrame({"x": [1, 2, 3, 4], "y": [1.0, 2, 1, 2]}),
+            pd.DataFrame({"x": [1, 2, 3, 5], "y": [1.0, 2, 1, 2]}),
+            pd.DataFrame({"x": [1, 2, 3, 4], "y": [3.0, 2, 1, np.nan]}),
+            pd.DataFrame({"x": [1, 2, 3, 4], "y": [3.0, 2, 1, 0]}),
+            pd.DataFrame({"x": ["a", "b", "c", "d"], "y": [3.0, 2, 1, 0]}),
+        ]
+        auxiliaries = shared_auxiliaries(frames, 1, positions=False)
+        assert [aux is None for aux in auxiliaries] == \
+            [False, True, True, False, True]
+
+    def test_positions(self):
+        frames = [
+            pd.DataFrame({"x": ["a", "b", "c"], "y": [1.0, 2, 1]}),
+            pd.DataFrame({"x": [0, 1, 2], "y": [3.0, 2, 1]}),
+        ]
+        auxiliaries = shared_auxiliaries(frames, 1, positions=True)
+        assert all(aux is not None for aux in auxiliaries)
+
+
+class TestSharedSpec:
+    @pytest.mark.parametrize("mks", [1, 2, 3])
+    @pytest.mark.parametrize("build", [get_line, get_bar])
+    def test_same_spec(self, build, mks):
+        frame = pd.DataFrame({
+            "t": [1.5, 2.5, 3.5, 4.5],
+            "v": [3, 1, 4, 1],
+            "label": ["a", "b", None, "d"]
+        })
+        trend = np.array([2.5, 2.25, np.inf, 1.75])
+        marks = get_marks(frame)
+        kind = "line" if build is get_line else "bar"
+        actual = shared_spec(kind, frame, trend, marks, {"mks": mks})
+        expected = build(frame, mks=mks, trend=trend, marks=marks)
+        assert actual == expected
+        assert list(frame.columns) == ["t", "v", "label"]
+
+
+class TestBatch:
+    def test_line(self):
+        series = make_series(10)
+        specs = list(get_line_batch(series, executor=None, chunksize=3))
+        assert len(specs) == len(series)
+        for spec, (x, y) in zip(specs, series):
+            assert_same_chart(spec, get_line_xy(x, y))
+
+    def test_bar(self):
+        series = make_series(6)
+        specs = list(get_bar_batch(series, executor=None))
+        for spec, (x, y) in zip(specs, series):
+            assert_same_chart(spec, get_bar_xy(x, y))
+
+    def test_scatter(self):
+        series = make_series(4, length=30)
+        specs = list(get_scatter_batch(series, executor=None))
+        assert [json.loads(spec) for spec in specs] == [
+            json.loads(get_scatter_xy(x, y)) for x, y in series
+        ]
+
+    def test_compact(self):
+        for spec in get_line_batch(make_series(3), executor=None):
+            assert "\n" not in spec
+
+    def test_mixed(self):
+        series = make_series(3) + [
+            (["a", "b", "c", "d"], [1, 3, 2, 4]),
+            pd.DataFrame({"t": [0.5, 1.5, 2.5, 3.5], "v": [1, 3, 2, 4]}),
+            ([1, 2, 3, 4], [1, None, 2, 4]),
+        ]
+        specs = list(get_line_batch(series, deg=1, executor=None))
+        assert len(specs) == len(series)
+        assert json.loads(specs[4])["layer"][0]["encoding"]["x"][
+            "field"] == "t"
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_executor(self, executor):
+        series = make_series(9)
+        expected = list(get_line_batch(series, executor=None, chunksize=2))
+        specs = get_line_batch(series,
+                               executor=executor,
+                               max_workers=2,
+                               chunksize=2)
+        assert list(specs) == expected
+
+    def test_given_executor(self):
+        series = make_series(5)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            specs = list(get_bar_batch(series, executor=pool, chunksize=1))
+            assert pool.submit(len, series).result() == 5
+        assert specs == list(
+            get_bar_batch(series, executor=None, chunksize=1))
+
+    def test_lazy(self):
+        consumed = []
+
+        def series():
+            for idx, item in enumerate(make_series(100)):
+                consumed.append(idx)
+                yield item
+
+        specs = get_line_batch(series(), executor=None, chunksize=10)
+        assert not consumed
+        next(specs)
+        assert len(consumed) == 10
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            get_line_batch([], executor="cluster")
+        with pytest.raises(ValueError):
+            get_line_batch([], chunksize=0)
+        with pytest.raises(ValueError):
+            get_bar_batch([], max_workers=0)
+        with pytest.raises(ValueError):
+            list(get_line_batch([([1, 2, 3], )], executor=None))
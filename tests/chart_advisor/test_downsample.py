@@ -0,0 +1,110 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.chart_advisor.aux.downsample
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AVAPy import get_line_xy
+from AVAPy.chart_advisor.aux.downsample import (downsample,
+                                                downsample_indices,
+                                                lttb_indices, m4_indices)
+
+
+def loop_lttb(x, y, n_out):
+    """
+    Reference LTTB, one point at a time.
+    """
+
+    every = (len(x) - 2) / (n_out - 2)
+    selected = [0]
+    prev = 0
+    for bucket in range(n_out - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, len(x))
+        if bucket == n_out - 3:
+            next_end = len(x)
+        avg_x = np.mean(x[end:next_end])
+        avg_y = np.mean(y[end:next_end])
+        best, best_area = start, -1
+        for idx in range(start, end):
+            area = abs((x[prev] - avg_x) * (y[idx] - y[prev]) -
+                       (x[prev] - x[idx]) * (avg_y - y[prev]))
+            if area > best_area:
+                best, best_area = idx, area
+        selected.append(best)
+        prev = best
+    selected.append(len(x) - 1)
+    return selected
+
+
+def series(length=1000):
+    rng = np.random.RandomState(2)
+    x = np.arange(length, dtype=float)
+    y = np.cumsum(rng.randn(length))
+    return x, y
+
+
+class TestDownsample:
+
+    @pytest.mark.parametrize("n_out", [3, 10, 97, 500])
+    def test_lttb(self, n_out):
+        x, y = series()
+        assert lttb_indices(x, y, n_out).tolist() == loop_lttb(x, y, n_out)
+
+    def test_m4(self):
+        x, y = series()
+        rows = m4_indices(x, y, 40)
+        assert len(rows) <= 40
+        assert np.all(np.diff(rows) > 0)
+        bucket = np.minimum((x / x.max() * 10).astype(int), 9)
+        for key in range(10):
+            members = np.flatnonzero(bucket == key)
+            expected = {members[0], members[-1], members[np.argmin(y[members])],
+                        members[np.argmax(y[members])]}
+            assert set(rows[bucket[rows] == key]) == expected
+
+    def test_short(self):
+        x, y = series(10)
+        assert lttb_indices(x, y, 20).tolist() == list(range(10))
+        assert m4_indices(x, y, 20).tolist() == list(range(10))
+        df = pd.DataFrame({"x": x, "y": y})
+        assert downsample(df, 20) is df
+
+    @pytest.mark.parametrize("method", ["lttb", "m4"])
+    def test_small_budget(self, method):
+        x, y = series(100)
+        df = pd.DataFrame({"x": x, "y": y})
+        assert downsample_indices(df, 1, method).tolist() == [0]
+        assert downsample_indices(df, 2, method).tolist() == [0, 99]
+        assert len(downsample(df, 3, method)) <= 3
+
+    def test_frame(self):
+        x, y = series()
+        y[5] = np.nan
+        df = pd.DataFrame({"x": pd.date_range("2020", periods=1000), "y": y})
+        for method in ("lttb", "m4"):
+            sampled = downsample(df, 100, method)
+            assert len(sampled) <= 100
+            assert sampled["y"].notna().all()
+            assert sampled.index.is_monotonic_increasing
+        with pytest.raises(ValueError):
+            downsample(df, 100, "nth")
+        with pytest.raises(ValueError):
+            downsample(df, 0)
+
+    def test_line(self):
+        x, y = series(5000)
+        spec = json.loads(get_line_xy(x, y, max_points=200))
+        rows = next(iter(spec["datasets"].values()))
+        assert len(rows) == 200
+        # Auxiliaries are computed on all the points.
+        assert rows[0]["mark_line_avg"] == pytest.approx(np.mean(y))
+        trend = np.poly1d(np.polyfit(x, y, 3))
+        assert [row["trend_line"] for row in rows] == pytest.approx(
+            trend(np.array([row["x"] for row in rows])))
@@ -0,0 +1,104 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.chart_advisor.aux.outlier
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AVAPy.chart_advisor.aux import outlier
+from AVAPy.chart_advisor.aux.scatterplot import (add_outliers_by_gaussian,
+                                                 add_outliers_by_iqr,
+                                                 add_outliers_by_mad,
+                                                 add_outliers_by_zscore)
+
+
+def loop_zscore(data, threshold=3):
+    x, y = data["x"], data["y"]
+    mean_x, std_x = np.mean(x), np.std(x)
+    mean_y, std_y = np.mean(y), np.std(y)
+    return [
+        index for index in range(len(x))
+        if np.abs((x[index] - mean_x) / std_x) >= threshold
+        and np.abs((y[index] - mean_y) / std_y) >= threshold
+    ]
+
+
+def loop_gaussian(data):
+    mean = data[["x", "y"]].mean()
+    limit = data[["x", "y"]].std(ddof=0) * 1.5
+    low, high = mean - limit, mean + limit
+    return [
+        index for index in range(len(data))
+        if (data["x"][index] > high["x"] and data["y"][index] > high["y"]) or
+        (data["x"][index] < low["x"] and data["y"][index] < low["y"])
+    ]
+
+
+def loop_iqr(data):
+    bounds = {}
+    for col in ("x", "y"):
+        q1, q3 = data[col].quantile(0.25), data[col].quantile(0.75)
+        bounds[col] = (q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    return [
+        index for index in range(len(data))
+        if any(data[col][index] < bounds[col][0]
+               or data[col][index] > bounds[col][1] for col in ("x", "y"))
+    ]
+
+
+def samples():
+    rng = np.random.RandomState(3)
+    normal = rng.randn(500, 2)
+    heavy = rng.standard_t(2, size=(500, 2))
+    heavy[::50] *= 20
+    missing = heavy.copy()
+    missing[::7, 0] = np.nan
+    return [pd.DataFrame(values, columns=["x", "y"])
+            for values in (normal, heavy, missing)]
+
+
+class TestOutlier:
+
+    @pytest.mark.parametrize("data", samples())
+    @pytest.mark.parametrize(("add", "loop"), [
+        (add_outliers_by_zscore, loop_zscore),
+        (add_outliers_by_gaussian, loop_gaussian),
+        (add_outliers_by_iqr, loop_iqr),
+    ])
+    def test_same_as_loop(self, data, add, loop):
+        expected = loop(data)
+        data = data.copy()
+        data["color_outlier"] = "normal"
+        assert add(data) == expected
+        assert data.index[data["color_outlier"] == "outlier"].tolist() == \
+            expected
+
+    def test_zscore_threshold(self):
+        data = samples()[1]
+        assert add_outliers_by_zscore(data.copy(), 1) == loop_zscore(data, 1)
+
+    def test_mad(self):
+        data = pd.DataFrame({"x": [1.0, 2, 3, 4, 100], "y": [2.0, 1, 3, 2, 90]})
+        assert add_outliers_by_mad(data) == [4]
+        assert data["color_outlier"].tolist() == ["normal"] * 4 + ["outlier"]
+
+    def test_pluggable(self):
+        data = pd.DataFrame({"x": [0.0, 3, 20], "y": [0.0, 4, 0]})
+
+        @outlier.register_method("far")
+        def far_mask(x, y, radius=10):
+            return np.hypot(x, y) > radius
+
+        try:
+            assert outlier.outlier_indices(data, "far").tolist() == [2]
+            assert outlier.outlier_indices(data, "far", radius=4).tolist() \
+                == [1, 2]
+            assert outlier.outlier_mask(data, far_mask).tolist() == \
+                [False, False, True]
+        finally:
+            del outlier.METHODS["far"]
+
+        with pytest.raises(ValueError):
+            outlier.outlier_mask(data, "far")
@@ -0,0 +1,91 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.chart_advisor.aux.spec
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AVAPy.chart_advisor.aux import spec
+from AVAPy.chart_advisor.aux.bar import get_bar
+from AVAPy.chart_advisor.aux.line import get_line
+from AVAPy.chart_advisor.aux.scatterplot import get_scatter
+
+
+def frames():
+    rng = np.random.RandomState(4)
+    y = rng.randn(30).cumsum()
+    y[3] = np.nan
+    return [
+        pd.DataFrame({"x": np.arange(30), "y": y}),
+        pd.DataFrame({"x": pd.date_range("2020", periods=30), "y": y}),
+        pd.DataFrame({"x": [f"c{i}" for i in range(30)], "y": y}),
+    ]
+
+
+class TestSpec:
+
+    @pytest.mark.parametrize("df", frames())
+    def test_same_as_altair(self, df):
+        alt = pytest.importorskip("altair")
+        data = df.copy()
+        data["color"] = np.where(df.index % 3, "a", None)
+        data.loc[5, "y"] = np.inf
+        chart = alt.Chart(data).mark_point().encode(x="x",
+                                                    y="y",
+                                                    color="color")
+        line = chart.mark_line(color="red", opacity=0.5).encode(y="y")
+
+        layers = [
+            spec.layer(data, "point", {
+                "x": "x",
+                "y": "y",
+                "color": "color"
+            }),
+            spec.layer(data, "line", {
+                "x": "x",
+                "y": "y",
+                "color": "color"
+            },
+                       color="red",
+                       opacity=0.5),
+        ]
+        assert spec.to_json(spec.layered_spec(data, layers)) == \
+            (chart + line).to_json()
+
+    def test_field_type(self):
+        assert spec.field_type(pd.Series([1, 2])) == "quantitative"
+        assert spec.field_type(pd.Series(["a", None])) == "nominal"
+        assert spec.field_type(pd.Series([True, False])) == "nominal"
+        assert spec.field_type(pd.Series(pd.date_range("2020",
+                                                       periods=2))) == \
+            "temporal"
+        ordered = pd.Series(pd.Categorical(["b", "a"], ["b", "a"],
+                                           ordered=True),
+                            name="c")
+        assert spec.field_def(ordered.to_frame(), "c") == {
+            "field": "c",
+            "type": "ordinal",
+            "sort": ["b", "a"]
+        }
+
+    @pytest.mark.parametrize("mks", [1, 2, 3])
+    @pytest.mark.parametrize("df", frames()[:1])
+    def test_charts_validate(self, df, mks):
+        pytest.importorskip("altair")
+        for chart in (get_line, get_bar):
+            result = json.loads(chart(df.copy(), mks=mks, validate=True))
+            assert len(result["layer"]) == 3
+            quant = result["layer"][2]
+            assert len(quant.get("layer", [quant])) == mks
+        json.loads(get_scatter(df.copy(), validate=True))
+
+    def test_invalid(self):
+        pytest.importorskip("altair")
+        df = frames()[0]
+        layers = [spec.layer(df, "lin", {"x": "x", "y": "y"})]
+        with pytest.raises(ValueError):
+            spec.to_json(spec.layered_spec(df, layers), validate=True)
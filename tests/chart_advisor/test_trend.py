@@ -0,0 +1,165 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.chart_advisor.aux.trend
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AVAPy.chart_advisor.aux.line import get_line
+from AVAPy.chart_advisor.aux.bar import get_bar
+from AVAPy.chart_advisor.aux.scatterplot import get_scatter
+from AVAPy.chart_advisor.aux.trend import (PolynomialTrend, bin_aggregates,
+                                           loess, moving_average,
+                                           polynomial_trends, trend_values)
+
+
+def noisy_series(length=200, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(length, dtype=float)
+    y = np.sin(x / 20) + rng.normal(scale=0.1, size=length)
+    return x, y
+
+
+def chart_rows(schema):
+    return list(json.loads(schema)["datasets"].values())[0]
+
+
+class TestPolynomialTrend:
+    def test_polyfit(self):
+        x, y = noisy_series()
+        expected = np.poly1d(np.polyfit(x, y, 5))(x)
+        trend = PolynomialTrend(5).update(x, y)
+        np.testing.assert_allclose(trend(x), expected, atol=1e-9)
+
+    def test_incremental(self):
+        x, y = noisy_series()
+        whole = PolynomialTrend(3).update(x, y)
+        parts = PolynomialTrend(3)
+        for start in range(0, len(x), 30):
+            parts.update(x[start:start + 30], y[start:start + 30])
+        assert parts.count == len(x)
+        np.testing.assert_allclose(parts(x), whole(x), atol=1e-9)
+
+    def test_weights(self):
+        x, y = noisy_series()
+        weights = np.random.default_rng(1).integers(1, 5, len(x))
+        expected = np.poly1d(np.polyfit(x, y, 3, w=np.sqrt(weights)))(x)
+        trend = PolynomialTrend(3).update(x, y, weights)
+        np.testing.assert_allclose(trend(x), expected, atol=1e-9)
+
+    def test_timestamps(self):
+        x = np.arange(100) * 1e9 + 1.6e18
+        y = ((x - x[0]) / 1e11)**2
+        trend = PolynomialTrend(5).update(x, y)
+        np.testing.assert_allclose(trend(x), y, atol=1e-9)
+
+    def test_missing(self):
+        trend = PolynomialTrend(1).update([0, 1, np.nan, 3], [1, 2, 5, np.nan])
+        assert trend.count == 2
+        np.testing.assert_allclose(trend([2]), [3])
+
+    def test_underdetermined(self):
+        trend = PolynomialTrend(3).update([1, 2], [3, 4])
+        assert np.isfinite(trend([1, 2])).all()
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            PolynomialTrend(-1)
+        with pytest.raises(ValueError):
+            PolynomialTrend(2).update([1, 2], [1])
+        with pytest.raises(ValueError):
+            _ = PolynomialTrend(2).coefficients
+
+    def test_polynomial_trends(self):
+        x, y = noisy_series()
+        ys = np.vstack([y, 2 * y, y[::-1]])
+        trends = polynomial_trends(x, ys, 4)
+        for row, trend in zip(ys, trends):
+            expected = PolynomialTrend(4).update(x, row)(x)
+            np.testing.assert_allclose(trend, expected, atol=1e-9)
+
+
+class TestTrendValues:
+    def test_bin_aggregates(self):
+        mean_x, mean_y, count = bin_aggregates([0, 1, 2, 9, np.nan],
+                                               [1, 3, 5, 7, 1], 3)
+        assert mean_x.tolist() == [1, 9]
+        assert mean_y.tolist() == [3, 7]
+        assert count.tolist() == [3, 1]
+
+    def test_binned(self):
+        x, y = noisy_series(10000)
+        exact = trend_values(x, y, deg=3)
+        binned = trend_values(x, y, deg=3, bins=500)
+        np.testing.assert_allclose(binned, exact, atol=1e-3)
+
+    def test_rows(self):
+        x, y = noisy_series()
+        rows = [0, 10, 199]
+        for method in ("poly", "loess", "moving_average"):
+            assert trend_values(x, y, method, rows).tolist() == pytest.approx(
+                trend_values(x, y, method)[rows].tolist())
+
+    def test_loess(self):
+        x = np.arange(50, dtype=float)
+        y = 2 * x + 1
+        np.testing.assert_allclose(loess(x, y, [0, 24.5, 49]), [1, 50, 99])
+        assert trend_values(x, y, "loess").tolist() == pytest.approx(y)
+
+    def test_loess_smooths(self):
+        x, y = noisy_series()
+        trend = trend_values(x, y, "loess", frac=0.2)
+        assert np.abs(trend - np.sin(x / 20)).mean() < 0.05
+
+    def test_moving_average(self):
+        y = [1, 2, 3, 4, np.nan, 6]
+        assert moving_average(y, [0, 2, 4, 5], 3).tolist() == [1.5, 3, 5, 6]
+        assert trend_values(np.arange(6), y, "moving_average",
+                            window=1)[:4].tolist() == [1, 2, 3, 4]
+
+    def test_invalid(self):
+        x, y = noisy_series()
+        with pytest.raises(ValueError):
+            trend_values(x, y, "spline")
+        with pytest.raises(ValueError):
+            trend_values(x, y, bins=0)
+        with pytest.raises(ValueError):
+            trend_values(x, y, "loess", frac=0)
+        with pytest.raises(ValueError):
+            trend_values(x, y, "moving_average", window=0)
+
+
+class TestCharts:
+    @pytest.mark.parametrize("trend_method",
+                             ["poly", "loess", "moving_average"])
+    def test_line(self, trend_method):
+        x, y = noisy_series(1000)
+        df = pd.DataFrame({"x": x, "y": y})
+        full = get_line(df, trend_method=trend_method)
+        sampled = get_line(df, max_points=100, trend_method=trend_method)
+        trends = {row["x"]: row["trend_line"] for row in chart_rows(full)}
+        rows = chart_rows(sampled)
+        assert len(rows) == 100
+        for row in rows:
+            assert row["trend_line"] == pytest.approx(trends[row["x"]])
+
+    def test_dates(self):
+        df = pd.DataFrame({
+            "t": pd.date_range("2021-01-01", periods=300, freq="h"),
+            "v": noisy_series(300)[1]
+        })
+        rows = chart_rows(get_bar(df, deg=5))
+        assert all(np.isfinite(row["trend_line"]) for row in rows)
+
+    def test_options(self):
+        x, y = noisy_series()
+        df = pd.DataFrame({"x": x, "y": y})
+        rows = chart_rows(
+            get_scatter(df,
+                        trend_method="moving_average",
+                        trend_options={"window": 1}))
+        assert [row["trend_line"] for row in rows] == pytest.approx(y)
@@ -0,0 +1,66 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVA.data_wizard.FieldInfoAccumulator
+"""
+
+import pickle
+import pytest
+import numpy as np
+from AVAPy import FieldInfo, FieldInfoAccumulator
+
+
+class TestClassFieldInfoAccumulator:
+    """
+    Test cases for AVAPy.FieldInfoAccumulator
+    """
+
+    rng = np.random.RandomState(1)
+
+    data_samples = [
+        [1, 2, None, "a", "", 2, 1.0, True, "null", "2020-10-01"],
+        rng.randint(0, 2, 150).tolist(),
+        ["Male", "Female"] * 60,
+        ["true", "false", "true", None],
+        [None, "-", float("NaN")],
+    ]
+
+    @staticmethod
+    def chunks(data, size):
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    @pytest.mark.parametrize("data", data_samples)
+    def test_update(self, data):
+        acc = FieldInfoAccumulator()
+        for chunk in self.chunks(data, 3):
+            acc.update(chunk)
+        expected = FieldInfo(data).info
+        assert acc.info == expected
+        assert list(acc.valuemap) == list(expected["valuemap"])
+
+    @pytest.mark.parametrize("data", data_samples)
+    def test_merge(self, data):
+        parts = [
+            pickle.loads(pickle.dumps(FieldInfoAccumulator().update(chunk)))
+            for chunk in self.chunks(data, 4)
+        ]
+        acc = FieldInfoAccumulator()
+        for part in parts:
+            acc.merge(part)
+        assert acc.info == FieldInfo(data).info
+
+    def test_array_chunks(self):
+        data = self.rng.randint(1990, 2030, 100)
+        acc = FieldInfoAccumulator()
+        acc.update(data[:50]).update(data[50:]).update([])
+        assert acc.info == FieldInfo(data.tolist()).info
+
+    def test_valid_args(self):
+        acc = FieldInfoAccumulator()
+        with pytest.raises(ValueError, match=r".*No value.*"):
+            acc.info  # pylint: disable=W0104
+        with pytest.raises(TypeError, match=r".*not be None.*"):
+            acc.update(None)
+        with pytest.raises(TypeError, match=r".*must be a list.*"):
+            acc.update((1, 2))
+        with pytest.raises(TypeError, match=r".*FieldInfoAccumulator.*"):
+            acc.merge([1, 2])
@@ -0,0 +1,59 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for the Arrow backend of AVAPy.data_wizard
+"""
+
+import pytest
+import pandas as pd
+
+from AVAPy import FieldInfo, DataFrameInfo
+from AVAPy.data_wizard.analyzer.accumulator import FieldInfoAccumulator
+
+pa = pytest.importorskip("pyarrow")
+
+FIELDS = [
+    [1, 2, None, 2, 3],
+    [1.5, None, float("nan"), 2.0, 1.5],
+    ["a", "", "null", "b", None, "a"],
+    ["2020-01-01", "2020-02-01", None, "2020-01-01"],
+    [True, False, None, True],
+]
+
+
+class TestArrowFieldInfo:
+
+    @pytest.mark.parametrize("field", FIELDS)
+    def test_same_as_list(self, field):
+        expected = FieldInfo(field).info
+        assert FieldInfo(pa.array(field)).info == expected
+        chunked = pa.chunked_array([field[:2], field[2:]])
+        assert FieldInfo(chunked).info == expected
+
+    def test_dictionary(self):
+        field = ["a", "b", None, "a"]
+        array = pa.array(field).dictionary_encode()
+        assert FieldInfo(array).info == FieldInfo(field).info
+
+    @pytest.mark.parametrize("field", FIELDS)
+    def test_nonempty_list(self, field):
+        expected = FieldInfo(field).nonempty_list()
+        for array in (pa.array(field),
+                      pa.chunked_array([field[:2], field[2:]]),
+                      pa.array(field).dictionary_encode()):
+            assert FieldInfo(array).nonempty_list() == expected
+
+    def test_accumulator(self):
+        field = FIELDS[2]
+        acc = FieldInfoAccumulator()
+        acc.update(pa.array(field[:3])).update(pa.array(field[3:]))
+        assert acc.info == FieldInfo(field).info
+
+
+class TestArrowDataFrameInfo:
+
+    def test_table(self):
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "y"]})
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for executor in ("thread", "process"):
+            assert DataFrameInfo(table, executor=executor).info == \
+                DataFrameInfo(df, executor=executor).info
@@ -0,0 +1,78 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVA.data_wizard.DataFrameInfo
+"""
+
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+import numpy as np
+import pandas as pd
+from AVAPy import FieldInfo, DataFrameInfo, profile
+from AVAPy.data_wizard.analyzer import dfinfo
+
+
+class TestClassDataFrameInfo:
+    """
+    Test cases for AVAPy.DataFrameInfo
+    """
+
+    rng = np.random.RandomState(1)
+
+    df = pd.DataFrame({
+        "int": rng.randint(0, 50, 200),
+        "float": rng.rand(200),
+        "bool": rng.rand(200) > 0.5,
+        "year": rng.randint(1990, 2020, 200),
+        "str": rng.choice(["a", "b", "null", "2020-10-01"], 200),
+        "obj": pd.Series([1, "a", None, 2.5] * 50, dtype=object),
+    })
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_profile(self, executor):
+        result = profile(self.df, executor=executor, max_workers=2)
+        assert list(result) == list(self.df.columns)
+        for col in self.df.columns:
+            assert result[col] == FieldInfo(self.df[col].tolist()).info
+
+    def test_columns(self):
+        dfi = DataFrameInfo(self.df)
+        assert dfi.columns == list(self.df.columns)
+        assert dfi["int"] == dfi.info["int"]
+
+    def test_valid_args(self):
+        with pytest.raises(TypeError, match=r".*not be None.*"):
+            DataFrameInfo()
+        with pytest.raises(TypeError, match=r".*must be a pandas DataFrame.*"):
+            DataFrameInfo([1, 2])
+        with pytest.raises(ValueError, match=r".*not be empty.*"):
+            DataFrameInfo(pd.DataFrame({"a": []}))
+        with pytest.raises(ValueError, match=r".*executor.*"):
+            DataFrameInfo(self.df, executor="gpu")
+
+    def test_shared_field_info_error(self, monkeypatch):
+        views = []
+
+        class FailingFieldInfo:
+            def __init__(self, column):
+                self.column = column
+                views.append(weakref.ref(column))
+                raise RuntimeError("analysis failed")
+
+        monkeypatch.setattr(dfinfo, "FieldInfo", FailingFieldInfo)
+        values = np.arange(4, dtype=float)
+        shm = SharedMemory(create=True, size=values.nbytes)
+        try:
+            np.ndarray(values.shape, dtype=values.dtype,
+                       buffer=shm.buf)[:] = values
+            with pytest.raises(RuntimeError, match="analysis failed") as info:
+                dfinfo.shared_field_info(shm.name, values.dtype.str,
+                                         len(values))
+            # Even while the exception is alive, the view was released
+            # before the block was closed.
+            assert info.value.__traceback__ is not None
+            assert views[0]() is None
+        finally:
+            shm.close()
+            shm.unlink()
@@ -5,6 +5,8 @@ Test cases for AVA.data_wizard.FieldInfo
 
 import random
 import pytest
+import numpy as np
+import pandas as pd
 from AVAPy import FieldInfo
 
 
@@ -335,3 +337,148 @@ class TestClassFieldInfo:
             assert info["distinct"] == 10
             assert info["type"] == "mixed"
             assert info["implied"] == "string"
+
+
+class TestColumnarFieldInfo:
+    """
+    Test cases for AVAPy.FieldInfo on numpy arrays and pandas Series.
+    """
+
+    rng = np.random.RandomState(1)
+
+    data_samples = [
+        np.arange(10),
+        np.array([1990, 2002, 202012, 7, -3, 2002]),
+        rng.randint(0, 2, 200),
+        np.array([0.1, np.nan, 2.5, 0.1]),
+        np.array([True, False, True]),
+        np.array([np.nan, np.nan]),
+        np.array(["a", "null", "", "2020-10-01", "1.5", "a"]),
+        np.array([1, 1.0, True, "1", None, "-", float("nan")], dtype=object),
+        rng.choice(["Male", "Female", "NaN"], 300),
+    ]
+
+    @pytest.mark.parametrize("data", data_samples)
+    def test_ndarray_matches_list(self, data):
+        expected = FieldInfo(data.tolist())
+        fi = FieldInfo(data)
+        assert fi.info == expected.info
+        assert list(fi.valuemap) == list(expected.valuemap)
+        assert fi.data_list == expected.data_list
+
+    @pytest.mark.parametrize("data", data_samples)
+    def test_series_matches_list(self, data):
+        series = pd.Series(data)
+        fi = FieldInfo(series)
+        assert fi.info == FieldInfo(data.tolist()).info
+
+    def test_string_series(self):
+        series = pd.Series(["x", None, "y", "x"], dtype="string")
+        fi = FieldInfo(series)
+        assert fi.missing == 1
+        assert fi.valuemap == {"x": 2, "y": 1}
+        assert fi.data_list == ["x", None, "y", "x"]
+
+    def test_invalid_array(self):
+        with pytest.raises(ValueError, match=r".*1-dimensional.*"):
+            FieldInfo(np.zeros((2, 2)))
+
+
+class TestSampledFieldInfo:
+    """
+    Test cases for AVAPy.FieldInfo with sampled type inference.
+    """
+
+    def test_exhaustive_sample(self):
+        data = [1, 2, None, "a", 2.5]
+        fi = FieldInfo(data, sample_size=10)
+        assert fi.info == FieldInfo(data).info
+        assert fi.confidence == 1.0
+
+    def test_settled(self):
+        data = ["a", 1, "2020-10-01", None] * 500
+        fi = FieldInfo(data, sample_size=50)
+        assert fi.type == "mixed"
+        assert fi.implied == "string"
+        assert fi.confidence == 1.0
+        assert fi.count == 2000
+        assert fi.missing == 500
+        assert fi.distinct == 3
+
+    def test_partial_sample(self):
+        data = np.array(["x%d" % i for i in range(1000)], dtype=object)
+        fi = FieldInfo(data, sample_size=100)
+        assert fi.type == "string"
+        assert fi.distinct == 1000
+        assert fi.confidence == pytest.approx(101 / 102)
+
+    def test_numeric_array(self):
+        data = np.arange(500)
+        assert FieldInfo(data, sample_size=10).info == FieldInfo(data).info
+
+    def test_valid_args(self):
+        with pytest.raises(ValueError, match=r".*sample_size.*"):
+            FieldInfo([1, 2], sample_size=0)
+        with pytest.raises(ValueError, match=r".*together.*"):
+            FieldInfo([1, 2], sketch=True, sample_size=5)
+
+
+class TestDistinctClassification:
+    """
+    Test cases for classifying each distinct value of AVAPy.FieldInfo once.
+    """
+
+    def test_equal_values_of_different_types(self):
+        fi = FieldInfo([1, 1.0, True, 1])
+        assert fi.valuemap == {1: 4}
+        assert fi.type == "mixed"
+        assert fi.implied == "string"
+
+    def test_nan_objects(self):
+        fi = FieldInfo([float("nan"), 1.5, float("nan"), "NULL"])
+        assert fi.missing == 3
+        assert fi.data_list == [None, 1.5, None, None]
+
+    def test_invalid_values(self):
+        with pytest.raises(TypeError):
+            FieldInfo([1, (1, 2)])
+        with pytest.raises(TypeError):
+            FieldInfo([1, [1, 2]])
+
+    def test_type_cache(self):
+        data = ["1", "2.5", 3, 4.5, None] * 10
+        expected = FieldInfo(data).info
+        FieldInfo.enable_type_cache(maxsize=16)
+        try:
+            assert FieldInfo(data).info == expected
+            assert FieldInfo(data).info == expected
+            cache_info = FieldInfo.type_cache_info()
+            assert cache_info.misses == 4
+            assert cache_info.hits == 4
+        finally:
+            FieldInfo.disable_type_cache()
+        assert FieldInfo.type_cache_info() is None
+
+
+class TestCompactStorage:
+    """
+    Test cases for the storage of AVAPy.FieldInfo.
+    """
+
+    def test_empty_mask(self):
+        fi = FieldInfo([1, None, "a", "-", 2, 3, 4, 5, 6, ""])
+        assert fi.empty_mask().tolist() == [
+            False, True, False, True, False, False, False, False, False, True
+        ]
+        assert FieldInfo([1, 2]).empty_mask().tolist() == [False, False]
+
+    def test_array_lists(self):
+        data = np.array([1.5, np.nan, 2.5])
+        fi = FieldInfo(data)
+        assert fi.data_list == [1.5, None, 2.5]
+        assert fi.nonempty_list() == [1.5, 2.5]
+        assert FieldInfo(np.arange(3)).nonempty_list() == [0, 1, 2]
+
+    def test_slots(self):
+        fi = FieldInfo([1, 2])
+        assert not hasattr(fi, "__dict__")
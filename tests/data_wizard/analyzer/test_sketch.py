@@ -0,0 +1,105 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVA.data_wizard.analyzer.sketch
+"""
+
+import pytest
+import numpy as np
+from AVAPy import FieldInfo
+from AVAPy.data_wizard.analyzer.sketch import HyperLogLog, SpaceSaving, Reservoir
+
+
+class TestSketch:
+    """
+    Test cases for HyperLogLog and SpaceSaving
+    """
+
+    def test_hll_exact_small(self):
+        hll = HyperLogLog(0.05)
+        for val in [1, 1.0, True, "1", "a", "a", 2]:
+            hll.add(val)
+        assert hll.estimate() == 4
+
+    @pytest.mark.parametrize("error", [0.05, 0.01])
+    def test_hll_error(self, error):
+        hll = HyperLogLog(error)
+        for val in range(50000):
+            hll.add(f"id{val}")
+        assert abs(hll.estimate() - 50000) < 50000 * error * 4
+
+    def test_hll_merge(self):
+        left, right, whole = HyperLogLog(0.05), HyperLogLog(0.05), HyperLogLog(
+            0.05)
+        for val in range(3000):
+            (left if val % 2 else right).add(val)
+            whole.add(val)
+        assert left.merge(right).estimate() == whole.estimate()
+
+    def test_space_saving(self):
+        rng = np.random.RandomState(1)
+        values = rng.zipf(1.5, 20000).tolist()
+        summary = SpaceSaving(0.01)
+        for start in range(0, len(values), 1000):
+            chunk = {}
+            for val in values[start:start + 1000]:
+                chunk[val] = chunk.get(val, 0) + 1
+            summary.update(chunk)
+
+        assert len(summary.counts) <= 100
+        exact = {val: values.count(val) for val in set(values)}
+        for val, cnt in exact.items():
+            if cnt > 0.01 * len(values):
+                assert val in summary.counts
+                assert cnt <= summary.counts[val] <= cnt + 0.01 * len(values)
+
+    def test_valid_args(self):
+        with pytest.raises(ValueError, match=r".*error.*"):
+            HyperLogLog(0)
+        with pytest.raises(ValueError, match=r".*error.*"):
+            SpaceSaving(1.5)
+
+
+class TestFieldInfoSketch:
+    """
+    Test cases for AVAPy.FieldInfo in sketch mode
+    """
+
+    def test_low_cardinality(self, monkeypatch):
+        monkeypatch.setattr(FieldInfo, "SKETCH_CHUNK_SIZE", 7)
+        data = ["Male", "Female", None, "Male"] * 30
+        assert FieldInfo(data, sketch=True).info == FieldInfo(data).info
+
+    def test_high_cardinality(self):
+        data = np.arange(100000)
+        fi = FieldInfo(data, sketch=True, distinct_error=0.02, count_error=0.01)
+        assert abs(fi.distinct - 100000) < 100000 * 0.08
+        assert len(fi.valuemap) <= 100
+        assert fi.type == "mixed"
+        assert fi.missing == 0
+
+
+class TestReservoir:
+    """
+    Test cases for Reservoir
+    """
+
+    def test_small_stream(self):
+        reservoir = Reservoir(10).extend([1, 2]).extend([3])
+        assert reservoir.sample == [1, 2, 3]
+        assert reservoir.seen == 3
+
+    def test_uniform(self):
+        hits = np.zeros(100)
+        for seed in range(300):
+            reservoir = Reservoir(10, seed=seed)
+            for start in range(0, 100, 7):
+                reservoir.extend(list(range(start, min(start + 7, 100))))
+            assert len(set(reservoir.sample)) == 10
+            hits[reservoir.sample] += 1
+        # every position is sampled with probability 0.1
+        assert hits.min() > 10
+        assert hits.max() < 60
+
+    def test_valid_args(self):
+        with pytest.raises(ValueError, match=r".*positive integer.*"):
+            Reservoir(0)
@@ -0,0 +1,122 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVA.data_wizard.analyzer.stats
+"""
+
+import datetime
+import warnings
+import pytest
+import numpy as np
+import pandas as pd
+from AVAPy import FieldInfo
+from AVAPy.data_wizard.analyzer.sketch import KLL
+
+
+class TestFieldStats:
+    """
+    Test cases for statistics of AVAPy.FieldInfo
+    """
+
+    rng = np.random.RandomState(1)
+
+    def test_numeric(self):
+        data = self.rng.randint(0, 1000, 500).tolist() + [None, "1.5"]
+        stats = FieldInfo(data).stats
+        series = pd.Series(data[:-2] + [1.5], dtype=float)
+        assert stats["min"] == series.min()
+        assert stats["max"] == series.max()
+        assert stats["sum"] == pytest.approx(series.sum())
+        assert stats["mean"] == pytest.approx(series.mean())
+        assert stats["std"] == pytest.approx(np.std(series))
+        for q, value in stats["quantiles"].items():
+            assert value == pytest.approx(series.quantile(q))
+        counts, edges = np.histogram(series, bins=10)
+        assert stats["histogram"]["counts"] == counts.tolist()
+        assert stats["histogram"]["edges"] == pytest.approx(edges.tolist())
+
+    def test_date(self):
+        stats = FieldInfo(["2020-01-02", "2019/05", "2021年", None]).stats
+        assert stats == {
+            "min": datetime.datetime(2019, 5, 1),
+            "max": datetime.datetime(2021, 1, 1),
+            "granularity": "day"
+        }
+        stats = FieldInfo([2002, 2010, 1995]).stats
+        assert stats["granularity"] == "year"
+
+    def test_other(self):
+        assert FieldInfo(["a", "b"]).stats == {}
+        assert FieldInfo([True, False]).stats == {}
+        assert FieldInfo([None]).stats == {}
+
+    def test_sketch(self, monkeypatch):
+        monkeypatch.setattr(FieldInfo, "SKETCH_CHUNK_SIZE", 1000)
+        data = self.rng.randn(20000)
+        stats = FieldInfo(data, sketch=True).stats
+        exact = FieldInfo(data).stats
+        for key in ("min", "max", "sum", "mean", "std"):
+            assert stats[key] == pytest.approx(exact[key])
+        for q in exact["quantiles"]:
+            assert stats["quantiles"][q] == pytest.approx(
+                exact["quantiles"][q], abs=0.05)
+        assert sum(stats["histogram"]["counts"]) == 20000
+
+    @pytest.mark.parametrize("data", [
+        [1.5, float("inf"), 2.5],
+        ["1e400", "2", "3"],
+        np.array([1.0, 2.0, np.inf]),
+        np.array([-np.inf, 1.0, 2.0, np.nan]),
+    ])
+    @pytest.mark.parametrize("sketch", [False, True])
+    def test_infinite(self, data, sketch):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            stats = FieldInfo(data, sketch=sketch).stats
+        values = pd.Series(data).astype(float)
+        finite = values[np.isfinite(values)]
+        assert stats["min"] == values.min()
+        assert stats["max"] == values.max()
+        assert stats["mean"] == pytest.approx(finite.mean())
+        assert sum(stats["histogram"]["counts"]) == len(finite)
+        assert np.isfinite(stats["histogram"]["edges"]).all()
+
+    def test_only_infinite(self):
+        stats = FieldInfo([float("inf"), float("-inf")]).stats
+        assert stats == {"min": -np.inf, "max": np.inf}
+        assert FieldInfo([float("inf")], sketch=True).stats == {
+            "min": np.inf,
+            "max": np.inf
+        }
+
+    def test_sketch_constant(self):
+        stats = FieldInfo([2.0] * 5, sketch=True).stats
+        assert stats["histogram"]["edges"][0] == 1.5
+        assert stats["histogram"]["edges"][-1] == 2.5
+        assert sum(stats["histogram"]["counts"]) == 5
+
+
+class TestKLL:
+    """
+    Test cases for KLL
+    """
+
+    def test_quantiles(self):
+        sketch = KLL(k=200, seed=1)
+        for val in range(100000):
+            sketch.update(val)
+        assert sum(len(level) for level in sketch.levels) < 1000
+        assert sketch.quantile(0.5) == pytest.approx(50000, abs=1500)
+        assert sketch.cdf([25000])[0] == pytest.approx(25000, abs=1500)
+
+    def test_weights_and_merge(self):
+        left, right = KLL(seed=1), KLL(seed=2)
+        left.update(1.0, 3000)
+        right.update(2.0, 1000)
+        left.merge(right)
+        assert left.total == 4000
+        assert left.quantile(0.5) == 1.0
+        assert left.quantile(0.9) == 2.0
+
+    def test_valid_args(self):
+        with pytest.raises(ValueError, match=r".*at least 8.*"):
+            KLL(k=2)
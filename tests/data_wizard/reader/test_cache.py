@@ -0,0 +1,132 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.data_wizard.reader.cache
+"""
+
+import os
+import json
+from io import StringIO
+
+import pandas as pd
+import pytest
+
+from AVAPy.data_wizard.analyzer.dfinfo import profile
+from AVAPy.data_wizard.reader.cache import DatasetCache
+from AVAPy.data_wizard.reader.parser import csv2df, json2df
+
+DOC = json.dumps([{"a": i, "b": f"x{i % 3}"} for i in range(50)])
+
+
+class CountingReader:
+    """
+    Reader that counts its calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.__module__ = __name__
+        self.__qualname__ = "CountingReader"
+
+    def __call__(self, data, **options):
+        self.calls += 1
+        return json2df(data, **options)
+
+
+class TestDatasetCache:
+
+    def test_read(self, tmp_path):
+        cache = DatasetCache(tmp_path)
+        reader = CountingReader()
+        first = cache.read(DOC, reader)
+        second = cache.read(DOC, reader)
+        assert reader.calls == 1
+        assert first.equals(json2df(DOC))
+        assert second.equals(first)
+
+        cache.read(DOC.replace("x0", "y0"), reader)
+        assert reader.calls == 2
+
+    def test_nested(self, tmp_path):
+        doc = json.dumps([{"a": [1, 2], "b": {"x": 1}, "c": "s"},
+                          {"a": [3], "b": {"y": None}, "c": "t"}])
+        cache = DatasetCache(tmp_path)
+        miss = cache.read(doc)
+        hit = cache.read(doc)
+        assert hit.equals(miss)
+        assert hit["a"].tolist() == [[1, 2], [3]]
+        assert hit["b"].tolist() == [{"x": 1}, {"y": None}]
+
+    def test_profile(self, tmp_path):
+        cache = DatasetCache(tmp_path)
+        reader = CountingReader()
+        infos = cache.profile(DOC, reader)
+        assert reader.calls == 1
+        assert infos == profile(json2df(DOC))
+
+        # A hit neither parses nor profiles.
+        assert DatasetCache(tmp_path).profile(DOC, reader) == infos
+        assert reader.calls == 1
+
+    def test_key(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text("a,b\n1,2\n")
+        key = DatasetCache.key(path, csv2df)
+        assert key == DatasetCache.key(path.read_bytes(), csv2df)
+        assert key != DatasetCache.key(path, csv2df, columns=["a"])
+        assert key != DatasetCache.key(path, json2df)
+        assert DatasetCache.key(DOC) == DatasetCache.key(DOC.encode())
+        with pytest.raises(TypeError):
+            DatasetCache.key(StringIO(DOC))
+
+        df = DatasetCache(tmp_path / "cache").read(path, csv2df)
+        assert df.equals(pd.DataFrame({"a": [1], "b": [2]}))
+
+    def test_str_path(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text("a,b\n1,2\n")
+        cache = DatasetCache(tmp_path / "cache")
+        assert DatasetCache.key(str(path), csv2df) == DatasetCache.key(
+            path, csv2df)
+        assert cache.read(str(path), csv2df)["a"].tolist() == [1]
+
+        path.write_text("a,b\n3,4\n")
+        assert cache.read(str(path), csv2df)["a"].tolist() == [3]
+
+    def test_options(self):
+        key = DatasetCache.key(DOC, converters={"a": str})
+        assert key == DatasetCache.key(DOC, converters={"a": str})
+        assert key != DatasetCache.key(DOC, converters={"a": float})
+        with pytest.raises(TypeError):
+            DatasetCache.key(DOC, converters={"a": lambda value: value})
+        with pytest.raises(TypeError):
+            DatasetCache.key(DOC, marker=object())
+
+    def test_eviction(self, tmp_path):
+        docs = [
+            json.dumps([{"a": i * 100 + j} for j in range(100)])
+            for i in range(4)
+        ]
+        cache = DatasetCache(tmp_path)
+        cache.read(docs[0])
+        entry_size = cache.size
+        cache.max_bytes = entry_size * 2
+
+        cache.read(docs[1])
+        os.utime(tmp_path / (DatasetCache.key(docs[0]) + ".frame"),
+                 ns=(0, 0))
+        os.utime(tmp_path / (DatasetCache.key(docs[1]) + ".frame"),
+                 ns=(1, 1))
+        cache.read(docs[0])
+        cache.read(docs[2])
+        assert cache.size <= cache.max_bytes
+
+        names = set(os.listdir(tmp_path))
+        assert DatasetCache.key(docs[0]) + ".frame" in names
+        assert DatasetCache.key(docs[1]) + ".frame" not in names
+
+        cache.clear()
+        assert cache.size == 0
+
+    def test_invalid(self, tmp_path):
+        with pytest.raises(ValueError):
+            DatasetCache(tmp_path, max_bytes=0)
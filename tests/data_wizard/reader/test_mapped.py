@@ -0,0 +1,127 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.data_wizard.reader.mapped
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from AVAPy.data_wizard.reader.parser import (csv2df, jsonl2df, profile_csv,
+                                             profile_json)
+from AVAPy.data_wizard.reader.mapped import (line_ranges, mapped2df,
+                                             profile_mapped, feather2df)
+
+ROWS = [{
+    "name": f"n{i}",
+    "value": i if i % 9 else None,
+    "note": ["x", "null", "", "中文"][i % 4]
+} for i in range(1000)]
+
+
+@pytest.fixture(name="csv_path")
+def fixture_csv_path(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame(ROWS).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(name="jsonl_path")
+def fixture_jsonl_path(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_text("".join(json.dumps(row) + "\n" for row in ROWS),
+                    encoding="utf-8")
+    return path
+
+
+class TestLineRanges:
+
+    def test_line_ranges(self, csv_path):
+        data = csv_path.read_bytes()
+        header = data.index(b"\n") + 1
+        for parts in (1, 2, 7, 5000):
+            ranges = line_ranges(csv_path, parts, skip_header=True)
+            assert 1 <= len(ranges) <= parts
+            assert ranges[0][0] == header
+            assert ranges[-1][1] == len(data)
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                assert end == start
+                assert data[end - 1:end] == b"\n"
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "empty.csv"
+        path.write_bytes(b"")
+        assert not line_ranges(path, 4)
+        path.write_bytes(b"a,b\n")
+        assert not line_ranges(path, 4, skip_header=True)
+        with pytest.raises(ValueError):
+            line_ranges(path, 0)
+
+
+class TestMapped2Df:
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_csv(self, csv_path, executor):
+        df = mapped2df(csv_path, executor=executor, max_workers=3)
+        assert df.equals(csv2df(csv_path))
+
+        df = mapped2df(csv_path,
+                       executor=executor,
+                       max_workers=3,
+                       columns=["note"])
+        assert df.equals(csv2df(csv_path, columns=["note"]))
+
+    def test_jsonl(self, jsonl_path):
+        df = mapped2df(jsonl_path, fmt="jsonl", executor="thread",
+                       max_workers=4)
+        assert df.equals(jsonl2df(jsonl_path))
+
+    def test_invalid(self, csv_path):
+        with pytest.raises(ValueError):
+            mapped2df(csv_path, fmt="xml")
+        with pytest.raises(ValueError):
+            mapped2df(csv_path, executor="fiber")
+
+
+class TestProfileMapped:
+
+    def test_csv(self, csv_path):
+        infos = profile_mapped(csv_path, max_workers=3)
+        assert infos == profile_csv(csv_path)
+        assert infos["note"]["missing"] == 500
+
+    def test_jsonl(self, jsonl_path):
+        infos = profile_mapped(jsonl_path,
+                               fmt="jsonl",
+                               executor="thread",
+                               max_workers=3)
+        assert infos == profile_json(jsonl_path)
+
+    def test_missing_integers(self, tmp_path):
+        csv_path = tmp_path / "ints.csv"
+        csv_path.write_text("id,count\n" + "".join(
+            f"{i},{i if i % 5 else ''}\n" for i in range(300)))
+        jsonl_path = tmp_path / "ints.jsonl"
+        jsonl_path.write_text("".join(
+            json.dumps({"id": i, "count": i if i % 5 else None}) + "\n"
+            for i in range(300)))
+
+        infos = profile_mapped(csv_path, executor="thread", max_workers=3)
+        assert infos == profile_csv(csv_path)
+        assert infos["count"]["votes"] == {"integer": 240}
+        infos = profile_mapped(jsonl_path,
+                               fmt="jsonl",
+                               executor="thread",
+                               max_workers=3)
+        assert infos == profile_json(jsonl_path)
+        assert infos["count"]["votes"] == {"integer": 240}
+
+
+def test_feather2df(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "data.feather"
+    pd.DataFrame(ROWS).to_feather(path)
+    df = feather2df(path, columns=["note"])
+    assert df.columns.tolist() == ["note"]
+    assert df["note"].isna().sum() == 500
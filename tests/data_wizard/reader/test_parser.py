@@ -3,8 +3,20 @@
 Test cases for AVA.data_wizard.FieldInfo
 """
 
+import csv
+import json
+from io import BytesIO, StringIO
+
 import pandas as pd
-from AVAPy.data_wizard.reader.parser import json2df
+import pytest
+
+from AVAPy.data_wizard.analyzer.dfinfo import profile, profile_chunks
+from AVAPy.data_wizard.analyzer.fieldinfo import FieldInfo
+from AVAPy.data_wizard.analyzer.accumulator import RecordAccumulator
+from AVAPy.data_wizard.reader.parser import (json2df, json2chunks,
+                                             iter_json_records, csv2df,
+                                             jsonl2df, parquet2df,
+                                             profile_json, profile_csv)
 
 
 def test_json2df():
@@ -17,3 +29,305 @@ def test_json2df():
                      '{"name": "c", "value": 120}'
                      ']')
     assert df.equals(result)
+
+
+RECORDS = [{"name": f"n,{i}]", "value": i, "date": f"2020-01-{i % 28 + 1:02d}"}
+           for i in range(50)]
+
+
+class TestJson2Chunks:
+
+    @pytest.mark.parametrize("blocksize", [1, 3, 64, 1 << 20])
+    def test_array(self, blocksize):
+        doc = BytesIO(json.dumps(RECORDS).encode())
+        chunks = list(json2chunks(doc, chunksize=20, blocksize=blocksize))
+        assert [len(chunk) for chunk in chunks] == [20, 20, 10]
+        assert pd.concat(chunks,
+                         ignore_index=True).equals(pd.DataFrame(RECORDS))
+
+    @pytest.mark.parametrize("blocksize", [1, 5, 1 << 20])
+    def test_lines(self, blocksize):
+        text = "\n".join(json.dumps(record) for record in RECORDS) + "\n"
+        doc = BytesIO(text.encode())
+        chunks = list(json2chunks(doc, chunksize=30, blocksize=blocksize))
+        assert [len(chunk) for chunk in chunks] == [30, 20]
+        assert pd.concat(chunks,
+                         ignore_index=True).equals(pd.DataFrame(RECORDS))
+
+    def test_trailing_commas(self):
+        doc = BytesIO('\ufeff[{"a": "x,}", "b": [1, 2, ],},\n'
+                      ' {"a": "中文", },\n]'.encode())
+        records = list(iter_json_records(doc, blocksize=2))
+        assert records == [{"a": "x,}", "b": [1, 2]}, {"a": "中文"}]
+
+    def test_explicit_array(self):
+        doc = BytesIO(json.dumps(RECORDS).encode())
+        assert list(iter_json_records(doc, lines=False,
+                                      blocksize=16)) == RECORDS
+
+    def test_path(self, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_text(json.dumps(RECORDS))
+        assert sum(len(chunk) for chunk in json2chunks(path)) == 50
+
+    def test_empty_array(self):
+        assert not list(json2chunks(BytesIO(b" [ ] ")))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            list(iter_json_records(BytesIO(b'[{"a": 1}, {"a": ')))
+        with pytest.raises(ValueError):
+            list(iter_json_records(BytesIO(b'[{"a": 1}')))
+        with pytest.raises(ValueError):
+            list(iter_json_records(BytesIO(b'[1, 2]')))
+        with pytest.raises(ValueError):
+            list(iter_json_records(BytesIO(b'{"a": 1}'), lines=False))
+        with pytest.raises(ValueError):
+            list(json2chunks(BytesIO(b'[]'), chunksize=0))
+
+    @pytest.mark.parametrize("lines", [True, False])
+    def test_invalid_early(self, lines):
+        records = [json.dumps(record) for record in RECORDS * 2000]
+        records[3] = records[3].replace('"value"', "value")
+        text = "\n".join(records) if lines else "[" + ",\n".join(
+            records) + "]"
+        doc = BytesIO(text.encode())
+        with pytest.raises(ValueError) as info:
+            list(iter_json_records(doc, lines=lines, blocksize=256))
+        assert doc.tell() < 4096
+        position = text.index("value", text.index(records[3]))
+        assert f"at character {position}." in str(info.value)
+
+    def test_long_string(self):
+        record = {"a": "x" * 5000, "b": [1.5, -2]}
+        doc = BytesIO(json.dumps([record, record]).encode())
+        assert list(iter_json_records(doc, blocksize=7)) == [record, record]
+
+    def test_profile_chunks(self):
+        doc = BytesIO(json.dumps(RECORDS).encode())
+        infos = profile_chunks(json2chunks(doc, chunksize=7))
+        assert infos == profile(pd.DataFrame(RECORDS))
+
+    def test_profile_missing_columns(self):
+        doc = BytesIO(b'{"a": 1}\n{"a": 2}\n{"b": "x"}\n{"a": 3}\n')
+        infos = profile_chunks(json2chunks(doc, chunksize=2))
+        assert infos["a"]["count"] == 4
+        assert infos["a"]["missing"] == 1
+        assert infos["b"]["missing"] == 3
+        assert infos["b"]["valuemap"] == {"x": 1}
+
+
+CSV = "name,value,note\n" + "".join(
+    f"n{i},{i},{['x', 'NULL', 'None', '-', '', 'nan', 'NA'][i % 7]}\n"
+    for i in range(100))
+
+
+class TestCsv2Df:
+
+    def test_empty_values(self):
+        df = csv2df(StringIO(CSV))
+        assert df.shape == (100, 3)
+        assert df["note"].isna().sum() == 71
+        assert set(df["note"].dropna()) == {"x", "NA"}
+        assert df["value"].dtype.kind == "i"
+
+    def test_options(self):
+        df = csv2df(StringIO(CSV), columns=["value"], nrows=5)
+        assert df.columns.tolist() == ["value"]
+        assert df["value"].tolist() == [0, 1, 2, 3, 4]
+
+        sampled = csv2df(StringIO(CSV), sample=0.3, seed=1)
+        assert 10 < len(sampled) < 50
+        assert sampled["value"].is_monotonic_increasing
+        assert sampled.equals(csv2df(StringIO(CSV), sample=0.3, seed=1))
+
+    def test_chunks(self):
+        chunks = list(csv2df(StringIO(CSV), chunksize=30))
+        assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+        assert pd.concat(chunks).equals(csv2df(StringIO(CSV)))
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            csv2df(StringIO(CSV), columns="value")
+        with pytest.raises(ValueError):
+            csv2df(StringIO(CSV), sample=0)
+        with pytest.raises(ValueError):
+            csv2df(StringIO(CSV), nrows=-1)
+
+
+JSONL = "".join(
+    json.dumps({
+        "name": f"n{i}",
+        "value": i,
+        "note": ["x", "NULL", "None", "-", "", "nan", "NA"][i % 7]
+    }) + "\n" for i in range(100))
+
+
+class TestJsonl2Df:
+
+    def test_empty_values(self):
+        df = jsonl2df(BytesIO(JSONL.encode()))
+        assert df.equals(csv2df(StringIO(CSV)))
+
+    def test_options(self):
+        df = jsonl2df(BytesIO(JSONL.encode()),
+                      columns=["value", "missing"],
+                      nrows=5)
+        assert df.columns.tolist() == ["value", "missing"]
+        assert df["value"].tolist() == [0, 1, 2, 3, 4]
+        assert df["missing"].isna().all()
+
+        sampled = jsonl2df(BytesIO(JSONL.encode()), sample=0.3, seed=1)
+        assert 10 < len(sampled) < 50
+        assert sampled["value"].is_monotonic_increasing
+
+        assert jsonl2df(BytesIO(JSONL.encode()), nrows=0).empty
+
+    def test_chunks(self):
+        chunks = list(
+            jsonl2df(BytesIO(JSONL.encode()), chunksize=30, nrows=70))
+        assert [len(chunk) for chunk in chunks] == [30, 30, 10]
+
+
+class TestParquet2Df:
+
+    def test_parquet2df(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "data.parquet"
+        pd.DataFrame(json.loads("[" + JSONL.replace("\n", ",")[:-1] +
+                                "]")).to_parquet(path)
+
+        df = parquet2df(path, columns=["note", "value"])
+        assert df.columns.tolist() == ["note", "value"]
+        assert df["note"].isna().sum() == 71
+
+        chunks = list(parquet2df(path, chunksize=40, nrows=90))
+        assert [len(chunk) for chunk in chunks] == [40, 40, 10]
+
+
+class TestArrowBackend:
+
+    def test_csv2df(self):
+        pytest.importorskip("pyarrow")
+        table = csv2df(BytesIO(CSV.encode()), backend="arrow")
+        assert table.num_rows == 100
+        assert table.column("note").null_count == 71
+
+        chunks = list(
+            csv2df(BytesIO(CSV.encode()), chunksize=30, backend="arrow"))
+        assert [chunk.num_rows for chunk in chunks] == [30, 30, 30, 10]
+
+        with pytest.raises(TypeError):
+            csv2df(BytesIO(CSV.encode()), backend="arrow", header=None)
+
+    def test_jsonl2df(self):
+        pytest.importorskip("pyarrow")
+        table = jsonl2df(BytesIO(JSONL.encode()),
+                         columns=["note", "value"],
+                         nrows=90,
+                         backend="arrow")
+        assert table.column_names == ["note", "value"]
+        assert table.num_rows == 90
+        assert table.to_pandas().equals(
+            jsonl2df(BytesIO(JSONL.encode()),
+                     columns=["note", "value"],
+                     nrows=90))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            csv2df(StringIO(CSV), backend="polars")
+
+
+class TestFusedProfile:
+
+    def test_profile_json(self):
+        records = [{
+            "a": i % 3,
+            "b": ["x", "NULL", 2.5, [1, 2]][i % 4],
+            "c": f"2020-01-{i % 28 + 1:02d}"
+        } for i in range(200)]
+        records[7].pop("c")
+        doc = json.dumps(records).encode()
+
+        infos = profile_json(BytesIO(doc))
+        for col in ("a", "b", "c"):
+            votes = infos[col].pop("votes")
+            values = [record.get(col) for record in records]
+            values = [json.dumps(val) if isinstance(val, list) else val
+                      for val in values]
+            assert infos[col] == FieldInfo(values).info
+            assert sum(votes.values()) == 200 - infos[col]["missing"]
+        assert infos["c"]["missing"] == 1
+        assert votes == {"date": 199}
+
+        df, infos = profile_json(BytesIO(doc), with_dataframe=True,
+                                 chunksize=64)
+        assert len(df) == 200
+        assert df["b"].isna().sum() == infos["b"]["missing"] == 50
+
+    def test_profile_csv(self):
+        text = CSV + "n100,100\n"
+        infos = profile_csv(StringIO(text), chunksize=7)
+        expected = profile(csv2df(StringIO(text)))
+        for col in ("name", "value", "note"):
+            votes = infos[col].pop("votes")
+            assert infos[col] == expected[col]
+        assert votes == {"string": 29}
+        assert infos["value"]["implied"] == "integer"
+
+        df, infos = profile_csv(StringIO(CSV),
+                                columns=["value"],
+                                nrows=50,
+                                with_dataframe=True,
+                                chunksize=7)
+        assert df.equals(csv2df(StringIO(CSV), columns=["value"], nrows=50))
+        assert infos["value"]["count"] == 50
+
+    def test_profile_csv_missing_cells(self):
+        text = "a,year,name,ok\n1,2001,x,True\n,2002,,\n3,,z,False\n"
+        records = [
+            {"a": 1, "year": 2001, "name": "x", "ok": True},
+            {"a": None, "year": 2002, "name": None, "ok": None},
+            {"a": 3, "year": None, "name": "z", "ok": False},
+        ]
+        infos = profile_csv(StringIO(text), chunksize=2)
+        expected = profile_json(BytesIO(json.dumps(records).encode()))
+        assert infos == expected
+        assert infos["a"]["type"] == "integer"
+        assert infos["a"]["valuemap"] == {1: 1, 3: 1}
+        assert infos["year"]["type"] == "date"
+
+        df, _ = profile_csv(StringIO(text), with_dataframe=True, chunksize=2)
+        assert df.equals(csv2df(StringIO(text)))
+
+    def test_profile_csv_arrow(self):
+        pytest.importorskip("pyarrow")
+        text = "a,year,name,ok\n1,2001,x,True\n,2002,,\n3,,z,False\n"
+        table, infos = profile_csv(BytesIO(text.encode()),
+                                   with_dataframe=True,
+                                   chunksize=2,
+                                   backend="arrow")
+        assert infos == profile_csv(StringIO(text), chunksize=2)
+        assert table.equals(
+            csv2df(BytesIO(text.encode()), backend="arrow"))
+
+    def test_record_accumulator(self):
+        frames = [
+            pd.DataFrame({"a": [1, 2, None], "b": ["x", "-", None]}),
+            pd.DataFrame({"a": [2019, 2.5, 3], "c": [True, False, True]}),
+        ]
+        acc = RecordAccumulator().add_frame(frames[0])
+        other = RecordAccumulator().add_frame(frames[1])
+        other.add_records([{"a": "2", "b": [1, 2]}])
+        infos = acc.merge(other).info
+
+        assert infos["a"]["votes"] == {"float": 5, "integer": 1}
+        assert infos["a"]["valuemap"] == {1.0: 1, 2.0: 1, 2019.0: 1, 2.5: 1,
+                                          3.0: 1, "2": 1}
+        assert infos["b"]["missing"] == 5
+        assert infos["b"]["valuemap"] == {"x": 1, "[1, 2]": 1}
+        assert infos["c"]["votes"] == {"string": 3}
+        assert infos["c"]["missing"] == 4
+
+        with pytest.raises(ValueError):
+            _ = RecordAccumulator().info
@@ -3,8 +3,79 @@
 Test cases for AVA.data_wizard.utils.utils
 """
 
+import re
+import json
+import time
+import random
+from datetime import datetime
+
 import pytest
+import numpy as np
 from AVAPy import is_empty_value, is_date, is_bool_field
+from AVAPy import remove_trailing_commas
+from AVAPy.data_wizard.utils.dateinfer import (DATE_FORMATS, DateDetector,
+                                               is_date_array, parse_date)
+from AVAPy.data_wizard.utils.json import LenientJSONScanner
+
+
+def strptime_is_date(value):
+    """
+    Reference implementation of is_date, trying every format.
+    """
+
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(value.replace(" ", ""), fmt)
+            return True
+        except ValueError:
+            pass
+    return False
+
+
+def date_like_strings(size, seed=1):
+    rng = random.Random(seed)
+    chars = "0123456789012345678901234567890123456789-/. 年月日a\n２"
+    strings = [
+        "".join(rng.choice(chars) for _ in range(rng.randint(1, 12)))
+        for _ in range(size)
+    ]
+    for _ in range(size):
+        fmt = rng.choice(DATE_FORMATS)
+        strings.append(
+            fmt.replace("%Y", str(rng.randint(0, 2100)).zfill(
+                rng.choice([1, 4]))).replace("%m", str(rng.randint(
+                    0, 14))).replace("%d", str(rng.randint(0, 32))))
+    return strings
+
+
+def regex_remove_trailing_commas(json_like):
+    """
+    Reference implementation of remove_trailing_commas, with lookaheads.
+    """
+
+    lookahead = r'(?=([^"\\]*(\\.|"([^"\\]*\\.)*[^"\\]*"))*[^"]*$)'
+    objects_fixed = re.sub(r"(,)\s*}" + lookahead, "}", json_like)
+    return re.sub(r"(,)\s*\]" + lookahead, "]", objects_fixed)
+
+
+def json_with_trailing_commas(size, seed=1):
+    rng = random.Random(seed)
+
+    def value(depth):
+        draw = rng.random()
+        if depth > 3 or draw < 0.3:
+            return rng.choice([1, 2.5, None, "a,]}", 'q"\\,}', "中文"])
+        if draw < 0.6:
+            return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+        return {f"k{i},]": value(depth + 1) for i in range(rng.randint(0, 3))}
+
+    docs = []
+    for _ in range(size):
+        doc = json.dumps(value(0), indent=rng.choice([None, 1]))
+        docs.append(
+            re.sub(r"[\]}]", lambda m: rng.choice(["", ",", ", "]) + m.group(),
+                   doc))
+    return docs
 
 
 class TestDWUtils:
@@ -73,6 +144,47 @@ class TestDWUtils:
         assert is_date(1234) is False
         # assert is_date(20050229) is False # todolater
 
+    def test_is_date_matches_strptime(self):
+        strings = date_like_strings(3000)
+        expected = [strptime_is_date(val) for val in strings]
+        assert [is_date(val) for val in strings] == expected
+
+        detector = DateDetector()
+        assert [detector.is_date(val) for val in strings] == expected
+        assert is_date_array(np.array(strings)).tolist() == expected
+
+    def test_date_detector(self):
+        detector = DateDetector()
+        assert detector.format is None
+        assert detector.is_date("2020.01.08") is True
+        assert detector.is_date("2020.02.30") is False
+        assert detector.is_date("1991年 3月 25日") is True
+        assert detector.is_date("2020.01.09") is True
+        assert detector.format == "%Y.%m.%d"
+        assert detector.is_date(202012) is True
+        assert detector.is_date(1.5) is False
+
+    def test_is_date_array(self):
+        values = ["2020-10-01", "abc", 2002, 1234, 1.5, None, True, "2020"]
+        assert is_date_array(values).tolist() == [is_date(v) for v in values]
+        assert is_date_array(np.array([2002, 1234, 202012])).tolist() == [
+            True, False, True
+        ]
+        assert is_date_array(np.array([2002.0])).tolist() == [False]
+
+    def test_parse_date(self):
+        assert parse_date("1991年 3月 25日") == (datetime(1991, 3, 25), "day")
+        assert parse_date("2020/02") == (datetime(2020, 2, 1), "month")
+        assert parse_date(2002) == (datetime(2002, 1, 1), "year")
+        assert parse_date(202012) == (datetime(2020, 12, 1), "month")
+        assert parse_date(20050229) is None
+        assert parse_date("abc") is None
+        assert parse_date(1.5) is None
+
+        strings = date_like_strings(500)
+        assert [parse_date(v) is not None for v in strings
+                ] == [is_date(v) for v in strings]
+
     def test_is_bool_field(self):
         # true
         assert is_bool_field([True, False]) is True
@@ -101,3 +213,76 @@ class TestDWUtils:
         # invalid
         with pytest.raises(TypeError, match=r".*must be iterable.*"):
             is_bool_field(1)
+
+    def test_remove_trailing_commas(self):
+        assert remove_trailing_commas('{"foo":"bar","baz":["blah",],}'
+                                      ) == '{"foo":"bar","baz":["blah"]}'
+        assert remove_trailing_commas('["a,]", "b\\",]",\n]'
+                                      ) == '["a,]", "b\\",]"]'
+        assert remove_trailing_commas("[1,,]") == "[1,]"
+
+        for doc in json_with_trailing_commas(500):
+            cleaned = remove_trailing_commas(doc)
+            assert cleaned == regex_remove_trailing_commas(doc)
+            json.loads(cleaned)
+
+    def test_remove_trailing_commas_lenient(self):
+        doc = ("{'a': NaN, 'b': [-Infinity, Infinity,], /* c, */\n"
+               " 'd': 'it\\'s \"q\"', // e\n}")
+        cleaned = remove_trailing_commas(doc,
+                                         comments=True,
+                                         nan=True,
+                                         single_quotes=True)
+        assert json.loads(cleaned) == {
+            "a": None,
+            "b": [None, None],
+            "d": 'it\'s "q"'
+        }
+        # options are off by default
+        assert remove_trailing_commas("['NaN', // x\n]") == "['NaN', // x\n]"
+        assert remove_trailing_commas('["NaN", "//"]', True, True,
+                                      True) == '["NaN", "//"]'
+
+    @pytest.mark.parametrize("options", [{
+        "comments": True
+    }, {
+        "comments": True,
+        "nan": True,
+        "single_quotes": True
+    }])
+    def test_remove_trailing_commas_linear(self, options):
+        record = '{"a": 1, "b": [1, 2, 3,], "c": "x, y",}, /* z */\n'
+
+        def best_time(copies):
+            doc = "[" + record * copies + "]"
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                remove_trailing_commas(doc, **options)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        # Four times the input: about four times the time, against sixteen
+        # times for a quadratic scan.
+        small, large = best_time(2500), best_time(10000)
+        assert large < 8 * small
+
+    @pytest.mark.parametrize("options", [{}, {
+        "comments": True,
+        "nan": True,
+        "single_quotes": True
+    }])
+    def test_lenient_json_scanner_pieces(self, options):
+        rng = random.Random(2)
+        docs = json_with_trailing_commas(100) + [
+            "{'a': NaN, /* x */ 'b': [-Infinity, // y\n], 'c': '\\'',}"
+        ]
+        for doc in docs:
+            cuts = sorted(rng.sample(range(len(doc) + 1), min(6, len(doc))))
+            scanner = LenientJSONScanner(**options)
+            pieces = [
+                scanner.feed(doc[i:j])
+                for i, j in zip([0] + cuts, cuts + [len(doc)])
+            ]
+            assert "".join(pieces) + scanner.flush() == remove_trailing_commas(
+                doc, **options)
@@ -0,0 +1,119 @@
+# pylint: disable=R0201, C0116
+"""
+Test cases for AVAPy.aio
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AVAPy import AsyncRunner, FieldInfo, get_line_json
+
+DATA = json.dumps([{"x": i, "y": float(i % 7)} for i in range(40)])
+
+
+class TestAsyncRunner:
+
+    def test_entry_points(self):
+
+        async def main():
+            async with AsyncRunner(max_concurrency=2) as runner:
+                return await asyncio.gather(
+                    runner.json2df('[{"a": 1}, {"a": 2},]'),
+                    runner.field_info([1, 2, None]),
+                    runner.profile(pd.DataFrame({"a": [1, 2, 3]})),
+                    runner.get_line_json(DATA),
+                    runner.get_bar_json(DATA),
+                    runner.get_scatter_json(DATA),
+                )
+
+        df, info, infos, line, bar, scatter = asyncio.run(main())
+        assert df["a"].tolist() == [1, 2]
+        assert info == FieldInfo([1, 2, None]).info
+        assert infos["a"] == FieldInfo([1, 2, 3]).info
+        assert line == get_line_json(DATA)
+        for spec in (bar, scatter):
+            assert "layer" in json.loads(spec)
+
+    def test_concurrency_limit(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        async def main():
+            runner = AsyncRunner(max_workers=4, max_concurrency=2)
+            await asyncio.gather(*(runner.run(work) for _ in range(8)))
+            runner.close()
+
+        asyncio.run(main())
+        assert len(peak) == 8
+        assert max(peak) == 2
+
+    def test_timeout_keeps_slot(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        async def main():
+            runner = AsyncRunner(max_concurrency=1)
+            with pytest.raises(asyncio.TimeoutError):
+                await runner.run(lambda: (started.set(), release.wait(5)),
+                                 timeout=0.05)
+            assert started.is_set()
+            # The timed out call still runs, so the next one must wait.
+            waiting = asyncio.ensure_future(runner.run(lambda: 1))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            release.set()
+            assert await waiting == 1
+            runner.close()
+
+        asyncio.run(main())
+
+    def test_cancel_before_start(self):
+        calls = []
+
+        async def main():
+            runner = AsyncRunner(max_concurrency=1)
+            release = threading.Event()
+            first = asyncio.ensure_future(runner.run(release.wait, 5))
+            second = asyncio.ensure_future(runner.run(calls.append, 1))
+            await asyncio.sleep(0.02)
+            second.cancel()
+            release.set()
+            await first
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            runner.close()
+
+        asyncio.run(main())
+        assert not calls
+
+    def test_process_executor(self):
+
+        async def main():
+            async with AsyncRunner("process", max_workers=1) as runner:
+                return await runner.run(np.sum, [1, 2, 3])
+
+        assert asyncio.run(main()) == 6
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            AsyncRunner("fiber")
+        with pytest.raises(ValueError):
+            AsyncRunner(max_concurrency=0)
+        with pytest.raises(ValueError):
+            AsyncRunner(timeout=-1)
+
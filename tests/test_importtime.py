@@ -0,0 +1,105 @@
+# pylint: disable=R0201, C0116
+"""
+Import time regression tests for AVAPy.
+
+Imports run in a fresh interpreter with ``python -X importtime``, whose
+report gives the modules each statement imports and their cumulative cost.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import AVAPy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("numpy", "pandas", "altair", "pyarrow")
+SUBMODULES = [
+    "AVAPy.data_wizard.utils.json",
+    "AVAPy.data_wizard.utils.dateinfer",
+    "AVAPy.data_wizard.utils.typeinfer",
+    "AVAPy.data_wizard.analyzer.fieldinfo",
+    "AVAPy.data_wizard.analyzer.dfinfo",
+    "AVAPy.data_wizard.reader.parser",
+    "AVAPy.chart_advisor.aux.line",
+    "AVAPy.chart_advisor.aux.bar",
+    "AVAPy.chart_advisor.aux.scatterplot",
+    "AVAPy.aio",
+]
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_costs(code):
+    """
+    Return the cumulative import time in microseconds of each module
+    imported by running `code` in a fresh interpreter.
+    """
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True,
+                            text=True,
+                            check=True,
+                            env=env)
+    costs = {}
+    for line in result.stderr.splitlines():
+        found = LINE_RE.match(line)
+        if found:
+            costs[found.group(4)] = int(found.group(2))
+    return costs
+
+
+class TestImportTime:
+    """
+    Test cases for the import time of AVAPy and its submodules.
+    """
+
+    def test_package_is_light(self, record_property):
+        costs = import_costs("import AVAPy")
+        record_property("AVAPy_us", costs["AVAPy"])
+        assert not set(HEAVY) & set(costs)
+
+    def test_light_names(self):
+        costs = import_costs(
+            "from AVAPy import remove_trailing_commas, is_empty_value, "
+            "is_date\n"
+            "from AVAPy.data_wizard.utils.json import LenientJSONScanner\n"
+            "from AVAPy.data_wizard.utils.dateinfer import parse_date, "
+            "DateDetector")
+        assert not set(HEAVY) & set(costs)
+
+    def test_charts_without_altair(self):
+        costs = import_costs("from AVAPy import get_line_xy\n"
+                             "get_line_xy([1, 2, 3, 4], [1, 3, 2, 4])")
+        assert "altair" not in costs
+
+    @pytest.mark.parametrize("module", SUBMODULES)
+    def test_submodule(self, module, record_property):
+        costs = import_costs(f"import {module}")
+        record_property(f"{module}_us", costs[module])
+        assert "altair" not in costs
+
+
+class TestLazyNames:
+    """
+    Test cases for the names AVAPy loads on first access.
+    """
+
+    @pytest.mark.parametrize("name", AVAPy.__all__)
+    def test_names(self, name):
+        assert getattr(AVAPy, name) is not None
+        assert name in dir(AVAPy)
+
+    def test_missing(self):
+        with pytest.raises(AttributeError):
+            AVAPy.get_pie_xy  # pylint: disable=W0104
+
+    @pytest.mark.parametrize("name", ["DIRECTIVE_PATTERNS", "format_pattern",
+                                      "LenientJSONScanner", "re", "np"])
+    def test_internal(self, name):
+        assert name not in AVAPy.__all__
+        with pytest.raises(AttributeError):
+            getattr(AVAPy, name)